@@ -0,0 +1,150 @@
+"""Compare polling the simulated IMCs over the XML API and over Redfish.
+
+For each backend the benchmark builds one CiscoImcDataService per virtual
+IMC with that backend set, logs in and runs the first refresh, then a
+number of regular polls and of telemetry reads. For each kind of request
+it reports the requests and response bytes per IMC, counted by the
+simulator, and the latency percentiles.
+
+Needs Home Assistant and pytest-homeassistant-custom-component installed:
+
+    python benchmarks/bench_backends.py --count 20 --rounds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from statistics import quantiles
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cisco_imc import CiscoImcDataService
+from custom_components.cisco_imc.const import (
+    BACKEND_REDFISH,
+    BACKEND_XML,
+    CONF_BACKEND,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    DOMAIN,
+)
+from custom_components.cisco_imc.scheduler import CiscoImcPollScheduler
+from custom_components.cisco_imc.sel_store import async_get_sel_store
+from custom_components.cisco_imc.session import async_get_session_cache
+from custom_components.cisco_imc.snapshot_store import async_get_snapshot_store
+from simulator import PASSWORD, USERNAME, ImcSimulator
+
+
+def _percentiles(samples: list[float]) -> str:
+    if len(samples) < 2:
+        return "n/a"
+    cuts = quantiles(samples, n=100, method="inclusive")
+    return " ".join(f"p{p}={cuts[p - 1] * 1000:.1f}ms" for p in (50, 95))
+
+
+async def _async_timed(scheduler: CiscoImcPollScheduler, target) -> float:
+    start = time.perf_counter()
+    async with scheduler.async_slot():
+        await target()
+    return time.perf_counter() - start
+
+
+async def _async_measure(
+    simulator: ImcSimulator,
+    scheduler: CiscoImcPollScheduler,
+    targets: list,
+    rounds: int,
+) -> tuple[float, float, list[float]]:
+    """Run every target rounds times; return requests and bytes per call, and latencies."""
+    before = simulator.totals()
+    latencies: list[float] = []
+    for _ in range(rounds):
+        latencies.extend(
+            await asyncio.gather(*(_async_timed(scheduler, target) for target in targets))
+        )
+    after = simulator.totals()
+    calls = len(targets) * rounds
+    return (
+        (after["requests"] - before["requests"]) / calls,
+        (after["bytes_sent"] - before["bytes_sent"]) / calls,
+        latencies,
+    )
+
+
+async def _async_bench(backend: str, args: argparse.Namespace) -> None:
+    simulator = ImcSimulator(args.count, args.base_port, tuple(args.latency))
+    await simulator.async_start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        scheduler = CiscoImcPollScheduler(hass, args.max_concurrent)
+        sessions = await async_get_session_cache(hass)
+        snapshots = await async_get_snapshot_store(hass)
+        sel_store = await async_get_sel_store(hass)
+        coordinators = [
+            CiscoImcDataService(
+                hass,
+                MockConfigEntry(
+                    domain=DOMAIN,
+                    title=host,
+                    data={
+                        CONF_IP_ADDRESS: [host],
+                        CONF_USERNAME: [USERNAME],
+                        CONF_PASSWORD: PASSWORD,
+                    },
+                    options={CONF_BACKEND: backend},
+                ),
+                scheduler,
+                sessions,
+                snapshots,
+                sel_store,
+            )
+            for host in simulator.hosts
+        ]
+        results = {
+            "first refresh": await _async_measure(
+                simulator, scheduler, [c.async_refresh for c in coordinators], 1
+            ),
+            "poll": await _async_measure(
+                simulator, scheduler, [c.async_refresh for c in coordinators], args.rounds
+            ),
+            "telemetry": await _async_measure(
+                simulator, scheduler, [c.async_refresh_stats for c in coordinators], args.rounds
+            ),
+        }
+        failed = sum(not coordinator.last_update_success for coordinator in coordinators)
+        await asyncio.gather(*(coordinator.async_close() for coordinator in coordinators))
+        await hass.async_stop(force=True)
+    await simulator.async_stop()
+
+    print(f"{backend}: {args.count} IMCs, {failed} failed")
+    for name, (requests, size, latencies) in results.items():
+        print(
+            f"  {name:<14} {requests:4.1f} requests {size / 1024:6.1f} KiB"
+            f"  {_percentiles(latencies)}"
+        )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    for backend in args.backends:
+        await _async_bench(backend, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--backends", nargs="+", default=[BACKEND_XML, BACKEND_REDFISH],
+        choices=[BACKEND_XML, BACKEND_REDFISH],
+    )
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT_POLLS)
+    parser.add_argument("--base-port", type=int, default=18000)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.05, 0.2), metavar=("MIN", "MAX"))
+    asyncio.run(_async_main(parser.parse_args()))
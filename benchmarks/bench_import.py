@@ -0,0 +1,110 @@
+"""Measure how long importing the integration takes.
+
+Each run starts a fresh interpreter with -X importtime, imports the Home
+Assistant modules the integration builds on first so they count as already
+loaded, and then imports the integration, its config flow and its platforms.
+The median over the runs is compared with a budget, and the run fails if
+any module that must stay out of the import path is loaded:
+
+    python benchmarks/bench_import.py --runs 5 --budget 50
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from statistics import median
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PACKAGE = "custom_components.cisco_imc"
+
+# Loaded by Home Assistant before any integration is
+BASELINE = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.service",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.switch",
+    "homeassistant.components.diagnostics",
+)
+MODULES = (
+    PACKAGE,
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.binary_sensor",
+    f"{PACKAGE}.switch",
+    f"{PACKAGE}.diagnostics",
+)
+FORBIDDEN = ("imcsdk_ecoen66", "imcsdk")
+
+
+def _run_once(modules: tuple[str, ...]) -> dict[str, tuple[int, int]]:
+    """Return the self and cumulative import time in us of every module."""
+    code = f"import {', '.join(modules)}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env={key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if own.strip().isdigit():
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=50.0, help="milliseconds")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = _run_once(BASELINE)
+    # The first import writes the bytecode caches, which would skew the runs
+    _run_once(BASELINE + MODULES)
+    runs = [_run_once(BASELINE + MODULES) for _ in range(args.runs)]
+    # Everything imported after the baseline is charged to the integration
+    totals = [
+        sum(
+            cumulative
+            for name, (_, cumulative) in times.items()
+            if name in MODULES or name == "custom_components"
+        )
+        / 1000
+        for times in runs
+    ]
+    last = runs[-1]
+    print(f"integration import: median {median(totals):.1f}ms over {args.runs} runs")
+    added = {name: times for name, times in last.items() if name not in baseline}
+    print(f"slowest of the {len(added)} modules it adds (self time, last run):")
+    for name, (own, _) in sorted(added.items(), key=lambda item: -item[1][0])[: args.top]:
+        print(f"  {own / 1000:8.2f}ms  {name}")
+
+    failed = False
+    if forbidden := sorted(
+        name for name in last if name.split(".")[0] in FORBIDDEN
+    ):
+        print(f"FAIL: imported {', '.join(forbidden[:5])}")
+        failed = True
+    if median(totals) > args.budget:
+        print(f"FAIL: over the {args.budget:g}ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""Compare the ways of turning an XML API response into poll data.
+
+Three realistic payloads are parsed: the rack unit alone, the hierarchical
+rack unit inventory of a fully populated server and a long fault list. For
+each the benchmark reports the time per response and the peak Python
+memory of:
+
+- stream: ObjectExtractor fed in chunks, keeping only the wanted classes
+  and attributes, as the coordinator polls do
+- tree: the whole response parsed with ElementTree and built into
+  ImcObjects, then the wanted attributes picked out
+- sdk: the imcsdk managed object path the integration used to take, only
+  when imcsdk_ecoen66 happens to be installed
+
+Needs Home Assistant installed, as importing the client imports the
+integration:
+
+    python benchmarks/bench_parse.py --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from xml.etree import ElementTree
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from custom_components.cisco_imc.api import (
+    STREAM_CHUNK_SIZE,
+    ObjectExtractor,
+    _out_objects,
+    flatten,
+)
+from custom_components.cisco_imc.const import RACK_UNIT_CLASS, RACK_UNIT_SENSORS
+from simulator import RACK_UNIT_DN, _element, _rack_unit
+
+try:
+    from imcsdk_ecoen66.imcxmlcodec import from_xml_str
+except ImportError:
+    from_xml_str = None
+
+INVENTORY = ("presence", "operability", "model", "serial")
+WANTED = {
+    RACK_UNIT_CLASS: frozenset(RACK_UNIT_SENSORS),
+    "equipmentPsu": frozenset(INVENTORY),
+    "equipmentFan": frozenset(INVENTORY),
+    "memoryUnit": frozenset((*INVENTORY, "capacity")),
+    "storageLocalDisk": frozenset((*INVENTORY, "coerced_size")),
+    "faultInst": frozenset(
+        ("code", "severity", "descr", "affected_dn", "created", "ack")
+    ),
+}
+
+
+def _attrs(prefix: str, index: int, count: int) -> dict[str, str]:
+    """Return count filler attributes like the many an IMC sends per object."""
+    return {f"{prefix}Attr{n}": f"value-{index}-{n}" for n in range(count)}
+
+
+def _inventory_item(tag: str, rn: str, index: int) -> str:
+    return _element(
+        tag,
+        {
+            "rn": rn,
+            "id": str(index),
+            "presence": "equipped",
+            "operability": "operable",
+            "model": f"MODEL-{tag}",
+            "serial": f"SN{index:08d}",
+            "vendor": "Cisco Systems Inc",
+            "capacity": "32768",
+            "coercedSize": "1143455 MB",
+            **_attrs(tag, index, 12),
+        },
+        _element(f"{tag}EnvStats", {"rn": "env-stats", **_attrs("stats", index, 8)}),
+    )
+
+
+def rack_unit_payload() -> bytes:
+    """Return configResolveDn of the rack unit alone."""
+    body = _element("computeRackUnit", _rack_unit(1))
+    return _element(
+        "configResolveDn",
+        {"cookie": "c", "response": "yes", "dn": RACK_UNIT_DN},
+        f"<outConfig>{body}</outConfig>",
+    ).encode()
+
+
+def inventory_payload() -> bytes:
+    """Return hierarchical configResolveDn of a fully populated rack unit."""
+    children = [
+        _element(
+            "processorUnit",
+            {"rn": f"cpu-{n}", **_attrs("cpu", n, 15)},
+            _element("processorEnvStats", {"rn": "env-stats", "temperature": "45"}),
+        )
+        for n in range(1, 3)
+    ]
+    children.append(
+        _element(
+            "memoryArray",
+            {"rn": "memarray-1", **_attrs("array", 1, 10)},
+            "".join(_inventory_item("memoryUnit", f"mem-{n}", n) for n in range(1, 25)),
+        )
+    )
+    children.append(
+        _element(
+            "storageController",
+            {"rn": "board/storage-SAS-MRAID", **_attrs("ctrl", 1, 30)},
+            "".join(
+                _inventory_item("storageLocalDisk", f"pd-{n}", n) for n in range(1, 25)
+            ),
+        )
+    )
+    children.extend(_inventory_item("equipmentPsu", f"psu-{n}", n) for n in range(1, 3))
+    children.extend(
+        _element(
+            "equipmentFanModule",
+            {"rn": f"fan-module-1-{n}", **_attrs("module", n, 8)},
+            "".join(
+                _inventory_item("equipmentFan", f"fan-{fan}", fan) for fan in range(1, 3)
+            ),
+        )
+        for n in range(1, 8)
+    )
+    children.extend(
+        _element(
+            "adaptorUnit",
+            {"rn": f"adaptor-{n}", **_attrs("adaptor", n, 20)},
+            "".join(
+                _element("adaptorExtEthIf", {"rn": f"ext-eth-{port}", **_attrs("port", port, 12)})
+                for port in range(4)
+            ),
+        )
+        for n in range(1, 3)
+    )
+    body = _element("computeRackUnit", _rack_unit(1), "".join(children))
+    return _element(
+        "configResolveDn",
+        {"cookie": "c", "response": "yes", "dn": RACK_UNIT_DN},
+        f"<outConfig>{body}</outConfig>",
+    ).encode()
+
+
+def fault_payload(count: int = 500) -> bytes:
+    """Return configResolveClass of faultInst with count faults."""
+    body = "".join(
+        _element(
+            "faultInst",
+            {
+                "dn": f"sys/rack-unit-1/psu-{n % 2 + 1}/fault-F{n:04d}",
+                "ack": "no",
+                "code": f"F{n:04d}",
+                "created": "2026-10-18T12:00:00",
+                "descr": f"Power supply {n % 2 + 1} is in a degraded state",
+                "affectedDN": f"sys/rack-unit-1/psu-{n % 2 + 1}",
+                "highestSeverity": "major",
+                "lastTransition": "2026-10-18T12:00:00",
+                "lc": "",
+                "occur": "1",
+                "origSeverity": "major",
+                "prevSeverity": "cleared",
+                "rule": "equipment-psu-degraded",
+                "severity": "major",
+                "tags": "server",
+                "type": "equipment",
+            },
+        )
+        for n in range(count)
+    )
+    return _element(
+        "configResolveClass",
+        {"cookie": "c", "response": "yes", "classId": "faultInst"},
+        f"<outConfigs>{body}</outConfigs>",
+    ).encode()
+
+
+def _pick(objects) -> dict[str, dict[str, str]]:
+    """Keep the wanted attributes of every object, the way a poll uses them."""
+    return {
+        mo.dn: {key: mo.attributes.get(key) for key in WANTED[mo.class_id]}
+        for top in objects
+        for mo in flatten(top)
+        if WANTED.get(mo.class_id)
+    }
+
+
+def parse_stream(payload: bytes) -> dict[str, dict[str, str]]:
+    extractor = ObjectExtractor(WANTED)
+    for start in range(0, len(payload), STREAM_CHUNK_SIZE):
+        extractor.feed(payload[start : start + STREAM_CHUNK_SIZE])
+    extractor.close()
+    return _pick(extractor.objects)
+
+
+def parse_tree(payload: bytes) -> dict[str, dict[str, str]]:
+    root = ElementTree.fromstring(payload)
+    container = "outConfig" if root.find("outConfig") is not None else "outConfigs"
+    return _pick(_out_objects(root, container))
+
+
+def parse_sdk(payload: bytes) -> dict[str, dict[str, str]]:
+    response = from_xml_str(payload.decode())
+    out = getattr(response, "out_config", None) or response.out_configs
+    result = {}
+    pending = list(out.child)
+    while pending:
+        mo = pending.pop()
+        pending.extend(mo.child)
+        class_id = mo.get_class_id()
+        if keys := WANTED.get(class_id[:1].lower() + class_id[1:]):
+            result[mo.dn] = {key: getattr(mo, key, None) for key in keys}
+    return result
+
+
+def _measure(parse, payload: bytes, repeat: int) -> tuple[float, int, int]:
+    """Return the mean seconds, peak bytes and objects kept of one parse."""
+    kept = len(parse(payload))
+    tracemalloc.start()
+    parse(payload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(payload)
+    return (time.perf_counter() - start) / repeat, peak, kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--faults", type=int, default=500)
+    args = parser.parse_args()
+
+    parsers = {"stream": parse_stream, "tree": parse_tree}
+    if from_xml_str is not None:
+        parsers["sdk"] = parse_sdk
+    payloads = {
+        "rack unit": rack_unit_payload(),
+        "inventory": inventory_payload(),
+        f"{args.faults} faults": fault_payload(args.faults),
+    }
+    for name, payload in payloads.items():
+        print(f"{name} ({len(payload) / 1024:.1f} KiB)")
+        for label, parse in parsers.items():
+            seconds, peak, kept = _measure(parse, payload, args.repeat)
+            print(
+                f"  {label:7} {seconds * 1000:8.3f}ms  peak {peak / 1024:8.1f} KiB"
+                f"  {kept} objects kept"
+            )
+
+
+if __name__ == "__main__":
+    main()
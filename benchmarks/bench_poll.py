@@ -0,0 +1,172 @@
+"""Poll a simulated IMC fleet with CiscoImcDataService and report the cost.
+
+For every fleet size the benchmark starts that many virtual IMCs, builds one
+coordinator per IMC sharing a CiscoImcPollScheduler, runs the first refresh
+and then a number of steady state polling rounds. It reports poll latency
+percentiles (including the wait for a scheduler slot), the mean time of
+each timed phase, the peak number of threads, the simulator's login and
+refresh counters and the Python memory held per IMC.
+
+Needs Home Assistant and pytest-homeassistant-custom-component installed:
+
+    python benchmarks/bench_poll.py --counts 10 100 500 --rounds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from statistics import quantiles
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cisco_imc import CiscoImcDataService
+from custom_components.cisco_imc.const import DEFAULT_MAX_CONCURRENT_POLLS, DOMAIN
+from custom_components.cisco_imc.scheduler import CiscoImcPollScheduler
+from custom_components.cisco_imc.sel_store import async_get_sel_store
+from custom_components.cisco_imc.session import async_get_session_cache
+from custom_components.cisco_imc.snapshot_store import async_get_snapshot_store
+from simulator import PASSWORD, USERNAME, ImcSimulator
+
+
+def _percentiles(samples: list[float]) -> str:
+    if len(samples) < 2:
+        return "n/a"
+    cuts = quantiles(samples, n=100, method="inclusive")
+    return " ".join(
+        f"p{p}={cuts[p - 1] * 1000:.1f}ms" for p in (50, 95, 99)
+    )
+
+
+async def _async_sample_threads(peak: list[int]) -> None:
+    while True:
+        peak[0] = max(peak[0], threading.active_count())
+        await asyncio.sleep(0.05)
+
+
+async def _async_timed_refresh(
+    scheduler: CiscoImcPollScheduler, coordinator: CiscoImcDataService
+) -> float:
+    start = time.perf_counter()
+    async with scheduler.async_slot() as wait:
+        coordinator.timings.record("queue_wait", wait)
+        await coordinator.async_refresh()
+    return time.perf_counter() - start
+
+
+async def _async_bench(count: int, args: argparse.Namespace) -> None:
+    simulator = ImcSimulator(
+        count, args.base_port, tuple(args.latency), args.error_rate
+    )
+    await simulator.async_start()
+    peak_threads = [threading.active_count()]
+    sampler = asyncio.create_task(_async_sample_threads(peak_threads))
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        scheduler = CiscoImcPollScheduler(hass, args.max_concurrent)
+        sessions = await async_get_session_cache(hass)
+        snapshots = await async_get_snapshot_store(hass)
+        sel_store = await async_get_sel_store(hass)
+
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        coordinators = [
+            CiscoImcDataService(
+                hass,
+                MockConfigEntry(
+                    domain=DOMAIN,
+                    title=host,
+                    data={
+                        CONF_IP_ADDRESS: [host],
+                        CONF_USERNAME: [USERNAME],
+                        CONF_PASSWORD: PASSWORD,
+                    },
+                ),
+                scheduler,
+                sessions,
+                snapshots,
+                sel_store,
+            )
+            for host in simulator.hosts
+        ]
+        start = time.perf_counter()
+        first = await asyncio.gather(
+            *(_async_timed_refresh(scheduler, coordinator) for coordinator in coordinators)
+        )
+        first_wall = time.perf_counter() - start
+        held = tracemalloc.take_snapshot().compare_to(baseline, "filename")
+        tracemalloc.stop()
+        per_imc = sum(stat.size_diff for stat in held) / count
+
+        steady: list[float] = []
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            steady.extend(
+                await asyncio.gather(
+                    *(_async_timed_refresh(scheduler, coordinator) for coordinator in coordinators)
+                )
+            )
+        steady_wall = time.perf_counter() - start
+        failed = sum(not coordinator.last_update_success for coordinator in coordinators)
+        phases = {
+            name: [
+                coordinator.timings.phases[name].total / coordinator.timings.phases[name].count
+                for coordinator in coordinators
+                if coordinator.timings.phases[name].count
+            ]
+            for name in coordinators[0].timings.phases
+        }
+
+        await asyncio.gather(*(coordinator.async_close() for coordinator in coordinators))
+        await hass.async_stop(force=True)
+    sampler.cancel()
+    await simulator.async_stop()
+
+    totals = simulator.totals()
+    print(f"{count} IMCs, {args.max_concurrent} concurrent polls")
+    print(f"  first refresh  {first_wall:.2f}s  {_percentiles(first)}")
+    print(
+        f"  steady polls   {steady_wall / max(args.rounds, 1):.2f}s/round  {_percentiles(steady)}"
+    )
+    print(f"  failed         {failed}")
+    print(f"  peak threads   {peak_threads[0]}")
+    print(
+        f"  simulator      logins={totals['logins']} refreshes={totals['refreshes']}"
+        f" logouts={totals['logouts']} requests={totals['requests']}"
+        f" 503s={totals['errors_injected']}"
+    )
+    print(
+        "  phase means    "
+        + " ".join(
+            f"{name}={sum(means) / len(means) * 1000:.1f}ms"
+            for name, means in phases.items()
+            if means
+        )
+    )
+    print(f"  memory         {per_imc / 1024:.1f} KiB per IMC")
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    for count in args.counts:
+        await _async_bench(count, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT_POLLS)
+    parser.add_argument("--base-port", type=int, default=18000)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.05, 0.2), metavar=("MIN", "MAX"))
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    asyncio.run(_async_main(parser.parse_args()))
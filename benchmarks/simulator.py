@@ -0,0 +1,782 @@
+"""Local stand-in for a fleet of Cisco IMCs.
+
+Speaks the subset of the CIMC XML API the integration uses: aaaLogin,
+aaaRefresh, aaaKeepAlive, aaaLogout, configResolveDn(s) and configResolveClass(es) for the rack
+unit (with PSUs, fans, DIMMs, disks and an adapter below it when asked
+for hierarchically), for the temperature and power stats classes and for
+faultInst, and configConfMo for adminPower. Faults can be raised and
+cleared with VirtualImc.raise_fault and clear_fault. The System Event Log
+is served over Redfish, oldest entry first, and grows with add_sel_entry.
+Redfish also serves the same server as a ComputerSystem and a Chassis,
+honouring $select and $expand, and its ComputerSystem.Reset action.
+Each virtual IMC listens on its own port on 127.0.0.1 over HTTPS with a
+throwaway self-signed certificate.
+
+Run on its own to poke at it by hand:
+
+    python benchmarks/simulator.py --count 3 --latency 0.3 0.8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import json
+import random
+import secrets
+import ssl
+import tempfile
+import zlib
+from xml.etree import ElementTree
+from xml.sax.saxutils import quoteattr
+
+from aiohttp import web
+
+USERNAME = "admin"
+PASSWORD = "password"
+REFRESH_PERIOD = 600
+RACK_UNIT_DN = "sys/rack-unit-1"
+SEL_ENTRIES = "/redfish/v1/Managers/CIMC/LogServices/SEL/Entries"
+SEL_SEED_ENTRIES = 120
+SYSTEMS = "/redfish/v1/Systems"
+CHASSIS = "/redfish/v1/Chassis"
+# Properties that link to resources of their own unless expanded
+REDFISH_LINKS = ("Memory", "Storage", "Power", "Thermal", "NetworkAdapters")
+
+# adminPower values and the operPower they leave the server in
+POWER_RESULT = {
+    "up": "on",
+    "down": "off",
+    "soft-shut-down": "off",
+    "cycle-immediate": "on",
+    "hard-reset-immediate": "on",
+}
+# Redfish ResetType values and the adminPower doing the same
+RESET_ADMIN_POWER = {
+    "On": "up",
+    "ForceOff": "down",
+    "GracefulShutdown": "soft-shut-down",
+    "PowerCycle": "cycle-immediate",
+    "ForceRestart": "hard-reset-immediate",
+}
+
+
+@dataclass
+class VirtualImc:
+    """State and counters of one simulated IMC."""
+
+    index: int
+    port: int
+    rack_unit: dict[str, str] = field(default_factory=dict)
+    faults: dict[str, dict[str, str]] = field(default_factory=dict)
+    sel: list[dict[str, str]] = field(default_factory=list)
+    sel_last_id: int = 0
+    sessions: set[str] = field(default_factory=set)
+    logins: int = 0
+    refreshes: int = 0
+    keepalives: int = 0
+    logouts: int = 0
+    requests: int = 0
+    bytes_sent: int = 0
+    errors_injected: int = 0
+
+    @property
+    def host(self) -> str:
+        """Return the host:port the integration should be pointed at."""
+        return f"127.0.0.1:{self.port}"
+
+    def raise_fault(
+        self, code: str, affected_rn: str, descr: str, severity: str = "major"
+    ) -> str:
+        """Raise a fault on the object at affected_rn below the rack unit."""
+        affected_dn = f"{RACK_UNIT_DN}/{affected_rn}"
+        dn = f"{affected_dn}/fault-{code}"
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        self.faults[dn] = {
+            "dn": dn,
+            "ack": "no",
+            "affectedDN": affected_dn,
+            "cause": "equipment-problem",
+            "code": code,
+            "created": now,
+            "descr": descr,
+            "highestSeverity": severity,
+            "lastTransition": now,
+            "occur": "1",
+            "origSeverity": severity,
+            "prevSeverity": severity,
+            "rule": "sim-rule",
+            "severity": severity,
+            "tags": "server",
+            "type": "equipment",
+        }
+        return dn
+
+    def clear_fault(self, dn: str) -> None:
+        """Clear a fault; the IMC stops listing it."""
+        self.faults.pop(dn, None)
+
+    def add_sel_entry(
+        self, message: str, severity: str = "OK", sensor_type: str = "System Event"
+    ) -> int:
+        """Append an entry to the System Event Log and return its record id."""
+        self.sel_last_id += 1
+        self.sel.append(
+            {
+                "@odata.id": f"{SEL_ENTRIES}/{self.sel_last_id}",
+                "Id": str(self.sel_last_id),
+                "Name": "Log Entry",
+                "EntryType": "SEL",
+                "Created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                "Severity": severity,
+                "Message": message,
+                "SensorType": sensor_type,
+                "EntryCode": "Assert",
+            }
+        )
+        return self.sel_last_id
+
+    def clear_sel(self) -> None:
+        """Clear the System Event Log; record ids start over."""
+        self.sel.clear()
+        self.sel_last_id = 0
+
+
+def _rack_unit(index: int) -> dict[str, str]:
+    return {
+        "dn": RACK_UNIT_DN,
+        "adminPower": "policy",
+        "assetTag": f"ASSET-{index:04d}",
+        "availableMemory": "262144",
+        "cimcResetReason": "ac-cycle",
+        "memorySpeed": "2400",
+        "model": "UCSC-C240-M4SX",
+        "name": f"C240-SIM{index:04d}",
+        "numOfAdaptors": "1",
+        "numOfCores": "24",
+        "numOfCoresEnabled": "24",
+        "numOfCpus": "2",
+        "numOfEthHostIfs": "2",
+        "numOfFcHostIfs": "0",
+        "numOfThreads": "48",
+        "operPower": "on",
+        "originalUuid": f"00000000-0000-0000-0000-{index:012d}",
+        "presence": "equipped",
+        "serverId": "1",
+        "serial": f"FCH{index:08d}",
+        "totalMemory": "262144",
+        "usrLbl": f"sim-{index:04d}",
+        "uuid": f"00000000-0000-0000-0000-{index:012d}",
+        "vendor": "Cisco Systems Inc",
+    }
+
+
+def _stats() -> dict[str, list[tuple[str, dict[str, str]]]]:
+    """Return fresh readings as (rn below the board, attributes) by class."""
+    def reading(base: float, spread: float = 2.0) -> str:
+        return f"{base + random.uniform(-spread, spread):.1f}"
+
+    return {
+        "computeRackUnitMbTempStats": [
+            (
+                "temp-stats",
+                {
+                    "ambientTemp": reading(24),
+                    "frontTemp": reading(22),
+                    "rearTemp": reading(38),
+                    "ioh1Temp": reading(50),
+                    "ioh2Temp": reading(50),
+                    "timeCollected": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+        ],
+        "computeMbPowerStats": [
+            (
+                "power-stats",
+                {
+                    "consumedPower": reading(210, 30),
+                    "inputVoltage": reading(230, 3),
+                    "inputCurrent": reading(0.9, 0.1),
+                    "timeCollected": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+        ],
+        "processorEnvStats": [
+            (f"cpu-{n}/env-stats", {"temperature": reading(45, 5)}) for n in (1, 2)
+        ],
+    }
+
+
+def _serial(tag: str, rn: str) -> str:
+    """Return the serial of a component, the same over both APIs."""
+    return f"SIM{zlib.crc32(f'{tag}/{rn}'.encode()) % 10**8:08d}"
+
+
+def _status(health: str = "OK") -> dict[str, str]:
+    return {"State": "Enabled", "Health": health, "HealthRollup": health}
+
+
+def _redfish_system(imc: VirtualImc) -> dict:
+    """Return the rack unit as a Redfish ComputerSystem, links expanded."""
+    rack_unit = imc.rack_unit
+    path = f"{SYSTEMS}/{rack_unit['serial']}"
+    dimms = [
+        {
+            "@odata.id": f"{path}/Memory/DIMM_{chr(64 + n)}1",
+            "Id": f"DIMM_{chr(64 + n)}1",
+            "Name": f"DIMM_{chr(64 + n)}1",
+            "DeviceLocator": f"DIMM_{chr(64 + n)}1",
+            "CapacityMiB": 32768,
+            "MemoryDeviceType": "DDR4",
+            "OperatingSpeedMhz": 2400,
+            "Manufacturer": "0xCE00",
+            "PartNumber": "SIM-memoryUnit",
+            "SerialNumber": _serial("memoryUnit", f"mem-{n}"),
+            "Status": _status(),
+        }
+        for n in range(1, 9)
+    ]
+    drives = [
+        {
+            "@odata.id": f"{path}/Storage/MRAID/Drives/PD-{n}",
+            "Id": f"PD-{n}",
+            "Name": f"PD-{n}",
+            "Model": "SIM-storageLocalDisk",
+            "SerialNumber": _serial("storageLocalDisk", f"pd-{n}"),
+            "CapacityBytes": 960197124096,
+            "MediaType": "SSD",
+            "Protocol": "SATA",
+            "Status": _status(),
+        }
+        for n in range(1, 5)
+    ]
+    return {
+        "@odata.id": path,
+        "@odata.type": "#ComputerSystem.v1_5_0.ComputerSystem",
+        "Id": rack_unit["serial"],
+        "Name": rack_unit["name"],
+        "SystemType": "Physical",
+        "Manufacturer": rack_unit["vendor"],
+        "Model": rack_unit["model"],
+        "SerialNumber": rack_unit["serial"],
+        "AssetTag": rack_unit["assetTag"],
+        "UUID": rack_unit["uuid"],
+        "BiosVersion": "C240M4.4.1.2c.0.0202211901",
+        "PowerState": rack_unit["operPower"].capitalize(),
+        "IndicatorLED": "Off",
+        "Status": _status(),
+        "ProcessorSummary": {
+            "Count": int(rack_unit["numOfCpus"]),
+            "CoreCount": int(rack_unit["numOfCores"]),
+            "LogicalProcessorCount": int(rack_unit["numOfThreads"]),
+            "Model": "Intel(R) Xeon(R) CPU E5-2680 v4 @ 2.40GHz",
+            "Status": _status(),
+        },
+        "MemorySummary": {
+            "TotalSystemMemoryGiB": int(rack_unit["totalMemory"]) / 1024,
+            "Status": _status(),
+        },
+        "Boot": {
+            "BootSourceOverrideEnabled": "Disabled",
+            "BootSourceOverrideTarget": "None",
+            "BootSourceOverrideTarget@Redfish.AllowableValues": [
+                "None", "Pxe", "Floppy", "Cd", "Hdd", "BiosSetup", "Diags", "UefiTarget",
+            ],
+        },
+        "Memory": {
+            "@odata.id": f"{path}/Memory",
+            "Members@odata.count": len(dimms),
+            "Members": dimms,
+        },
+        "Storage": {
+            "@odata.id": f"{path}/Storage",
+            "Members@odata.count": 1,
+            "Members": [
+                {
+                    "@odata.id": f"{path}/Storage/MRAID",
+                    "Id": "MRAID",
+                    "Name": "MRAID",
+                    "Drives": drives,
+                    "Status": _status(),
+                }
+            ],
+        },
+        "Processors": {"@odata.id": f"{path}/Processors"},
+        "EthernetInterfaces": {"@odata.id": f"{path}/EthernetInterfaces"},
+        "SimpleStorage": {"@odata.id": f"{path}/SimpleStorage"},
+        "Bios": {"@odata.id": f"{path}/Bios"},
+        "Links": {
+            "Chassis": [{"@odata.id": f"{CHASSIS}/1"}],
+            "ManagedBy": [{"@odata.id": "/redfish/v1/Managers/CIMC"}],
+        },
+        "Actions": {
+            "#ComputerSystem.Reset": {
+                "target": f"{path}/Actions/ComputerSystem.Reset",
+                "ResetType@Redfish.AllowableValues": list(RESET_ADMIN_POWER),
+            }
+        },
+    }
+
+
+def _redfish_chassis(imc: VirtualImc) -> dict:
+    """Return the rack unit as a Redfish Chassis with fresh readings, links expanded."""
+    stats = _stats()
+    temps = stats["computeRackUnitMbTempStats"][0][1]
+    power = stats["computeMbPowerStats"][0][1]
+    path = f"{CHASSIS}/1"
+    temperatures = [
+        {"Name": name, "PhysicalContext": context, "ReadingCelsius": float(value),
+         "UpperThresholdCritical": 85, "Status": _status()}
+        for name, context, value in (
+            ("AMBIENT_TEMP", "Room", temps["ambientTemp"]),
+            ("FP_TEMP_SENSOR", "Intake", temps["frontTemp"]),
+            ("RISER1_OUTLET_TMP", "Exhaust", temps["rearTemp"]),
+        )
+    ] + [
+        {"Name": f"P{rn[4]}_TEMP_SENS", "PhysicalContext": "CPU",
+         "ReadingCelsius": float(attrs["temperature"]), "UpperThresholdCritical": 95,
+         "Status": _status()}
+        for rn, attrs in stats["processorEnvStats"]
+    ]
+    return {
+        "@odata.id": path,
+        "@odata.type": "#Chassis.v1_5_0.Chassis",
+        "Id": "1",
+        "Name": "Computer System Chassis",
+        "ChassisType": "RackMount",
+        "Manufacturer": imc.rack_unit["vendor"],
+        "Model": imc.rack_unit["model"],
+        "SerialNumber": imc.rack_unit["serial"],
+        "IndicatorLED": "Off",
+        "Status": _status(),
+        "Power": {
+            "@odata.id": f"{path}/Power",
+            "PowerControl": [
+                {"Name": "Server Power Control", "PowerConsumedWatts": float(power["consumedPower"])}
+            ],
+            "PowerSupplies": [
+                {
+                    "Name": f"PSU{n}",
+                    "MemberId": str(n - 1),
+                    "Model": "SIM-equipmentPsu",
+                    "SerialNumber": _serial("equipmentPsu", f"psu-{n}"),
+                    "PowerCapacityWatts": 1400,
+                    "LineInputVoltage": float(power["inputVoltage"]),
+                    "Status": _status(),
+                }
+                for n in (1, 2)
+            ],
+        },
+        "Thermal": {
+            "@odata.id": f"{path}/Thermal",
+            "Temperatures": temperatures,
+            "Fans": [
+                {
+                    "Name": f"FAN{module}_{n}",
+                    "Model": "SIM-equipmentFan",
+                    "SerialNumber": _serial("equipmentFan", f"fan-{n}"),
+                    "Reading": random.randint(5000, 7000),
+                    "ReadingUnits": "RPM",
+                    "Status": _status(),
+                }
+                for module in range(1, 7)
+                for n in (1, 2)
+            ],
+        },
+        "NetworkAdapters": {
+            "@odata.id": f"{path}/NetworkAdapters",
+            "Members@odata.count": 1,
+            "Members": [
+                {
+                    "@odata.id": f"{path}/NetworkAdapters/MLOM",
+                    "Id": "MLOM",
+                    "Name": "MLOM",
+                    "Model": "SIM-adaptorUnit",
+                    "SerialNumber": _serial("adaptorUnit", "adaptor-1"),
+                    "Status": _status(),
+                }
+            ],
+        },
+        "Links": {"ComputerSystems": [{"@odata.id": f"{SYSTEMS}/{imc.rack_unit['serial']}"}]},
+    }
+
+
+def _redfish_view(resource: dict, query) -> dict:
+    """Apply $select, and leave linked resources as links unless $expand is given."""
+    select = query.get("$select")
+    keep = None if select is None else {"@odata.id", *select.split(",")}
+    expand = "$expand" in query
+    view = {}
+    for key, value in resource.items():
+        if keep is not None and key not in keep:
+            continue
+        if key in REDFISH_LINKS and not expand:
+            value = {"@odata.id": value["@odata.id"]}
+        view[key] = value
+    return view
+
+
+def _components() -> str:
+    """Return the component subtree of a rack unit, as hierarchical queries see it."""
+    def part(tag: str, rn: str, **attrs: str) -> str:
+        return _element(
+            tag,
+            {
+                "rn": rn,
+                "presence": "equipped",
+                "operability": "operable",
+                "model": f"SIM-{tag}",
+                "serial": _serial(tag, rn),
+                **attrs,
+            },
+        )
+
+    psus = "".join(part("equipmentPsu", f"psu-{n}", id=str(n)) for n in (1, 2))
+    fans = "".join(
+        _element(
+            "equipmentFanModule",
+            {"rn": f"fan-module-1-{module}", "tray": "1", "id": str(module)},
+            "".join(
+                part("equipmentFan", f"fan-{n}", id=str(n), module=str(module))
+                for n in (1, 2)
+            ),
+        )
+        for module in range(1, 7)
+    )
+    dimms = "".join(
+        part("memoryUnit", f"mem-{n}", id=str(n), location=f"DIMM_{chr(64 + n)}1", capacity="32768")
+        for n in range(1, 9)
+    )
+    disks = "".join(
+        part("storageLocalDisk", f"pd-{n}", id=str(n), health="Good") for n in range(1, 5)
+    )
+    stats = {class_id: objects for class_id, objects in _stats().items()}
+    cpus = "".join(
+        _element(
+            "processorUnit",
+            {"rn": rn.split("/")[0], "id": rn.split("/")[0][4:]},
+            _element("processorEnvStats", {"rn": "env-stats", **attrs}),
+        )
+        for rn, attrs in stats.pop("processorEnvStats")
+    )
+    board = _element(
+        "computeBoard",
+        {"rn": "board", "id": "1"},
+        cpus
+        + "".join(
+            _element(class_id, {"rn": rn, **attrs})
+            for class_id, objects in stats.items()
+            for rn, attrs in objects
+        )
+        + _element("memoryArray", {"rn": "memarray-1", "id": "1"}, dimms)
+        + _element("storageController", {"rn": "storage-SAS-MRAID", "id": "MRAID"}, disks),
+    )
+    adapter = part("adaptorUnit", "adaptor-1", id="1")
+    return psus + fans + board + adapter
+
+
+def _element(tag: str, attrs: dict[str, str], body: str = "") -> str:
+    attr_str = "".join(f" {key}={quoteattr(value)}" for key, value in attrs.items())
+    return f"<{tag}{attr_str}>{body}</{tag}>" if body else f"<{tag}{attr_str}/>"
+
+
+def _self_signed_context() -> ssl.SSLContext:
+    """Return a server SSL context with a fresh self-signed certificate."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "imc-simulator")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.NamedTemporaryFile() as cert_file, tempfile.NamedTemporaryFile() as key_file:
+        cert_file.write(cert.public_bytes(serialization.Encoding.PEM))
+        key_file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        cert_file.flush()
+        key_file.flush()
+        context.load_cert_chain(cert_file.name, key_file.name)
+    return context
+
+
+class ImcSimulator:
+    """A set of virtual IMCs sharing one aiohttp application.
+
+    latency is the (min, max) seconds added to every response, error_rate
+    the share of requests answered with HTTP 503, and down the indexes of
+    virtual IMCs that do not listen at all. operPower follows an adminPower
+    change after power_delay seconds. With batch off, configResolveDns and
+    configResolveClasses are unknown, as on older firmware.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        base_port: int = 18000,
+        latency: tuple[float, float] = (0.0, 0.0),
+        error_rate: float = 0.0,
+        down: set[int] | None = None,
+        power_delay: float = 5.0,
+        batch: bool = True,
+    ) -> None:
+        """Initialize the simulator."""
+        self.latency = latency
+        self.batch = batch
+        self.power_delay = power_delay
+        self.error_rate = error_rate
+        self.down = down or set()
+        self.imcs = [
+            VirtualImc(index, base_port + index, _rack_unit(index)) for index in range(count)
+        ]
+        for imc in self.imcs:
+            # A long standing fault, as most servers in a rack have one
+            imc.raise_fault("F0181", "board/storage-SAS-MRAID/pd-4", "Disk 4 predictive failure", "warning")
+            for n in range(SEL_SEED_ENTRIES):
+                imc.add_sel_entry(f"Sensor {n % 12} reading back to normal")
+        self._by_port = {imc.port: imc for imc in self.imcs}
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def hosts(self) -> list[str]:
+        """Return the host of every virtual IMC, including down ones."""
+        return [imc.host for imc in self.imcs]
+
+    def totals(self) -> dict[str, int]:
+        """Return the counters summed over every virtual IMC."""
+        return {
+            name: sum(getattr(imc, name) for imc in self.imcs)
+            for name in (
+                "logins",
+                "refreshes",
+                "keepalives",
+                "logouts",
+                "requests",
+                "bytes_sent",
+                "errors_injected",
+            )
+        }
+
+    async def async_start(self) -> None:
+        """Start listening on every virtual IMC that is up."""
+        app = web.Application()
+        app.router.add_post("/nuova", self._handle)
+        app.router.add_route("*", "/redfish/{path:.*}", self._handle_redfish)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        context = _self_signed_context()
+        for imc in self.imcs:
+            if imc.index not in self.down:
+                await web.TCPSite(
+                    self._runner, "127.0.0.1", imc.port, ssl_context=context
+                ).start()
+
+    async def async_stop(self) -> None:
+        """Stop every virtual IMC."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        imc = self._by_port[request.transport.get_extra_info("sockname")[1]]
+        imc.requests += 1
+        if self.latency[1]:
+            await asyncio.sleep(random.uniform(*self.latency))
+        if self.error_rate and random.random() < self.error_rate:
+            imc.errors_injected += 1
+            return web.Response(status=503)
+        try:
+            root = ElementTree.fromstring(await request.read())
+        except ElementTree.ParseError:
+            return web.Response(status=400)
+        body = self._dispatch(imc, root).encode()
+        imc.bytes_sent += len(body)
+        return web.Response(body=body, content_type="text/xml")
+
+    async def _handle_redfish(self, request: web.Request) -> web.StreamResponse:
+        imc = self._by_port[request.transport.get_extra_info("sockname")[1]]
+        imc.requests += 1
+        if self.latency[1]:
+            await asyncio.sleep(random.uniform(*self.latency))
+        if self.error_rate and random.random() < self.error_rate:
+            imc.errors_injected += 1
+            return web.Response(status=503)
+        path = request.path.rstrip("/")
+        credentials = base64.b64encode(f"{USERNAME}:{PASSWORD}".encode()).decode()
+        # The service root is the one resource readable without credentials
+        if path != "/redfish/v1" and request.headers.get("Authorization") != f"Basic {credentials}":
+            return web.Response(status=401)
+        system_path = f"{SYSTEMS}/{imc.rack_unit['serial']}"
+        if request.method == "POST":
+            if path != f"{system_path}/Actions/ComputerSystem.Reset":
+                return web.Response(status=405)
+            return self._reset(imc, await request.json())
+        if path == "/redfish/v1":
+            body = {
+                "@odata.id": "/redfish/v1/",
+                "Id": "RootService",
+                "RedfishVersion": "1.2.0",
+                "ProtocolFeaturesSupported": {
+                    "SelectQuery": True,
+                    "ExpandQuery": {"ExpandAll": True, "Levels": True, "MaxLevels": 6, "NoLinks": True},
+                },
+                "Systems": {"@odata.id": SYSTEMS},
+                "Chassis": {"@odata.id": CHASSIS},
+            }
+        elif path in (SYSTEMS, CHASSIS):
+            member = system_path if path == SYSTEMS else f"{CHASSIS}/1"
+            body = {"@odata.id": path, "Members@odata.count": 1, "Members": [{"@odata.id": member}]}
+        elif path == system_path:
+            body = _redfish_view(_redfish_system(imc), request.query)
+        elif path == f"{CHASSIS}/1":
+            body = _redfish_view(_redfish_chassis(imc), request.query)
+        elif path == SEL_ENTRIES:
+            skip = int(request.query.get("$skip", 0))
+            top = int(request.query.get("$top", len(imc.sel)))
+            body = {
+                "@odata.id": SEL_ENTRIES,
+                "Name": "Log Service Collection",
+                "Members@odata.count": len(imc.sel),
+                "Members": imc.sel[skip : skip + top],
+            }
+        else:
+            return web.Response(status=404)
+        text = json.dumps(body)
+        imc.bytes_sent += len(text)
+        return web.Response(text=text, content_type="application/json")
+
+    def _reset(self, imc: VirtualImc, body: dict) -> web.Response:
+        admin_power = RESET_ADMIN_POWER.get(body.get("ResetType"))
+        if admin_power is None:
+            return web.Response(status=400)
+        imc.rack_unit["adminPower"] = admin_power
+        self._follow_power(imc, admin_power)
+        return web.Response(status=204)
+
+    def _follow_power(self, imc: VirtualImc, admin_power: str | None) -> None:
+        if (oper_power := POWER_RESULT.get(admin_power)) is not None:
+            # The server takes a while to actually change state
+            asyncio.get_running_loop().call_later(
+                self.power_delay, imc.rack_unit.__setitem__, "operPower", oper_power
+            )
+
+    def _dispatch(self, imc: VirtualImc, root: ElementTree.Element) -> str:
+        method, attrs = root.tag, root.attrib
+        response = {"cookie": attrs.get("cookie", ""), "response": "yes"}
+        if method == "aaaLogin":
+            if attrs.get("inName") != USERNAME or attrs.get("inPassword") != PASSWORD:
+                return _element(method, {**response, "errorCode": "551", "errorDescr": "Authentication failed"})
+            imc.logins += 1
+            cookie = secrets.token_hex(16)
+            imc.sessions.add(cookie)
+            return _element(
+                method,
+                {**response, "outCookie": cookie, "outRefreshPeriod": str(REFRESH_PERIOD), "outPriv": "admin"},
+            )
+        if attrs.get("cookie") not in imc.sessions:
+            return _element(method, {**response, "errorCode": "552", "errorDescr": "Authorization required"})
+        if method == "aaaRefresh":
+            imc.refreshes += 1
+            return _element(
+                method,
+                {**response, "outCookie": attrs["cookie"], "outRefreshPeriod": str(REFRESH_PERIOD), "outPriv": "admin"},
+            )
+        if method == "aaaKeepAlive":
+            imc.keepalives += 1
+            return _element(method, response)
+        if method == "aaaLogout":
+            imc.logouts += 1
+            imc.sessions.discard(attrs["cookie"])
+            return _element(method, {**response, "outStatus": "success"})
+        hierarchical = attrs.get("inHierarchical") == "true"
+        if method == "configResolveDn":
+            body = self._resolve_dn(imc, attrs.get("dn", ""), hierarchical)
+            return _element(method, {**response, "dn": attrs.get("dn", "")}, f"<outConfig>{body}</outConfig>")
+        if method == "configResolveClass":
+            body = self._resolve_class(imc, attrs.get("classId", ""))
+            return _element(method, {**response, "classId": attrs.get("classId", "")}, f"<outConfigs>{body}</outConfigs>")
+        if method in ("configResolveDns", "configResolveClasses") and self.batch:
+            if method == "configResolveDns":
+                body = "".join(
+                    self._resolve_dn(imc, elem.get("value", ""), hierarchical)
+                    for elem in root.iterfind("inDns/dn")
+                )
+            else:
+                body = "".join(
+                    self._resolve_class(imc, elem.get("value", ""))
+                    for elem in root.iterfind("inIds/Id")
+                )
+            return _element(method, response, f"<outConfigs>{body}</outConfigs>")
+        if method == "configConfMo":
+            return self._conf_mo(imc, root, response)
+        return _element("error", {**response, "errorCode": "ERR-xml-parse-error", "errorDescr": f"unknown method {method}"})
+
+    @staticmethod
+    def _resolve_dn(imc: VirtualImc, dn: str, hierarchical: bool) -> str:
+        if dn != RACK_UNIT_DN:
+            return ""
+        return _element("computeRackUnit", imc.rack_unit, _components() if hierarchical else "")
+
+    @staticmethod
+    def _resolve_class(imc: VirtualImc, class_id: str) -> str:
+        body = _element("computeRackUnit", imc.rack_unit) if class_id == "computeRackUnit" else ""
+        body += "".join(
+            _element(class_id, {"dn": f"{RACK_UNIT_DN}/board/{rn}", **stats})
+            for rn, stats in _stats().get(class_id, [])
+        )
+        if class_id == "faultInst":
+            body += "".join(_element(class_id, fault) for fault in imc.faults.values())
+        return body
+
+    def _conf_mo(self, imc: VirtualImc, root: ElementTree.Element, response: dict[str, str]) -> str:
+        in_config = root.find("inConfig")
+        if in_config is None or not len(in_config) or in_config[0].get("dn") != RACK_UNIT_DN:
+            return _element(root.tag, {**response, "errorCode": "ERR-unsupported", "errorDescr": "only the rack unit can be changed"})
+        changes = dict(in_config[0].attrib)
+        changes.pop("dn")
+        imc.rack_unit.update(changes)
+        self._follow_power(imc, changes.get("adminPower"))
+        body = _element("computeRackUnit", imc.rack_unit)
+        return _element(root.tag, {**response, "dn": RACK_UNIT_DN}, f"<outConfig>{body}</outConfig>")
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    simulator = ImcSimulator(args.count, args.base_port, tuple(args.latency), args.error_rate)
+    await simulator.async_start()
+    print(f"Serving {args.count} virtual IMCs as {USERNAME}/{PASSWORD}:")
+    for host in simulator.hosts:
+        print(f"  https://{host}/nuova")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.async_stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--base-port", type=int, default=18000)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
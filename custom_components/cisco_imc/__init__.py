@@ -7,26 +7,45 @@ https://github.com/ecoen66/cisco_imc
 from __future__ import annotations
 import asyncio
 import logging
-from datetime import timedelta
+import time
 from collections import defaultdict
+from dataclasses import replace
+from functools import partial
+from typing import NamedTuple
 #from typing import List
 
-from imcsdk_ecoen66.imchandle import ImcHandle
-from imcsdk_ecoen66.imcexception import ImcLoginError, ImcException, ImcConnectionError
-
-from urllib.error import URLError
-
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.util import dt as dt_util
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.config_entries import ConfigEntry, SOURCE_REAUTH, SOURCE_IMPORT
 from homeassistant.core import HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 import homeassistant.helpers.entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
+from .api import (
+    CiscoImcApi,
+    HostRequestLimiter,
+    ImcApiAuthError,
+    ImcApiConnectionError,
+    ImcApiError,
+    ImcObject,
+    flatten,
+)
+from .backend import async_detect_backend
+from .backoff import ImcBackoff, async_probe
+from .events import CiscoImcEventListener
+from .faults import CiscoImcFaultTracker
+from .redfish import CiscoImcRedfishApi, CiscoImcRedfishBackend
+from .scheduler import CiscoImcPollScheduler
+from .sel import CiscoImcSelReader
+from .sel_store import async_get_sel_store
+from .snapshot import ImcSnapshot
+from .snapshot_store import async_get_snapshot_store
+from .session import async_get_session_cache
+from .http import async_close_client_session, async_get_client_session
+from .timing import ImcTimings
 from .services import async_setup_services, async_unload_services
-from .switch import ImcPollingSwitch
-from .binary_sensor import CiscoImcBinarySensor
-from .sensor import CiscoImcRackUnitSensor
 from .imc_device import CiscoImcDevice
 
 from homeassistant.const import (
@@ -34,7 +53,6 @@ from homeassistant.const import (
     CONF_IP_ADDRESS,
     CONF_USERNAME,
     CONF_PASSWORD,
-    EVENT_HOMEASSISTANT_CLOSE,
 )
 from .const import (
     DOMAIN,
@@ -43,16 +61,52 @@ from .const import (
     DATA_API_CLIENT,
     DATA_LISTENER,
     RACK_UNIT_UPDATE_DELAY,
+    RACK_UNIT_DN,
+    RACK_UNIT_CLASS,
     RACK_UNIT_SENSORS,
+    RACK_UNIT_FAST_SENSORS,
+    RACK_UNIT_STATIC_SENSORS,
+    INVENTORY_CLASSES,
+    INVENTORY_ATTRIBUTES,
+    INVENTORY_ABSENT,
+    SIGNAL_INVENTORY_CHANGED,
+    STATIC_REFRESH_INTERVAL,
+    TIER_FAST,
+    TIER_STATIC,
+    TIER_STATS,
+    CONF_STATS_INTERVAL,
+    DEFAULT_STATS_INTERVAL,
+    STATS_SENSOR_TYPES,
+    SIGNAL_STATS_CHANGED,
+    FAULT_CLASS,
+    FAULT_ATTRIBUTES,
+    FAULT_SENSOR_TYPES,
+    SEL_INTERVAL,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_TIMEOUT,
     STATIC_SENSOR,
     SWITCH,
     BINARY_SENSOR,
+    SUPPRESSED_WRITES_SENSOR,
+    SUPPRESSED_WRITES_SENSOR_TYPE,
     SENSOR_TYPES,
     STATIC_SENSOR_TYPE,
     SWITCH_TYPE,
     BINARY_SENSOR_TYPE,
+    TIMING_SENSOR_TYPES,
     DEFAULT_SCAN_INTERVAL,
     MIN_SCAN_INTERVAL,
+    DATA_SCHEDULER,
+    CONF_MAX_CONCURRENT_POLLS,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    CONF_PUSH_UPDATES,
+    DEFAULT_PUSH_UPDATES,
+    PUSH_SWEEP_INTERVAL,
+    POWER_CONFIRM_INTERVAL,
+    CONF_BACKEND,
+    DEFAULT_BACKEND,
+    BACKEND_AUTO,
+    BACKEND_REDFISH,
 )
 
 CONFIG_SCHEMA = cv.removed(DOMAIN, raise_if_present=False)
@@ -93,17 +147,20 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
             config_entry, options={CONF_SCAN_INTERVAL: scan_interval}
         )
         hass.data[DOMAIN].pop(imc)
-    try:
-        _LOGGER.debug(f"{imc} Setting up coordinator")
-        coordinator = CiscoImcDataService(hass, config_entry)
-        _LOGGER.debug(f"{imc} Asking coordinator to login")
-        await coordinator.async_login()
-        _LOGGER.debug("Logged in to imc %s in __init__.py", imc)
-
-    except URLError as ex:
-        raise ConfigEntryAuthFailed(ex) from ex
-    except Exception as ex:
-        raise ConfigEntryNotReady(ex) from ex
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = CiscoImcPollScheduler(
+            hass, DEFAULT_MAX_CONCURRENT_POLLS
+        )
+        scheduler.async_start()
+    _async_update_max_concurrent_polls(hass, config_entry)
+    _LOGGER.debug(f"{imc} Setting up coordinator")
+    sessions = await async_get_session_cache(hass)
+    snapshots = await async_get_snapshot_store(hass)
+    sel_store = await async_get_sel_store(hass)
+    coordinator = CiscoImcDataService(
+        hass, config_entry, scheduler, sessions, snapshots, sel_store
+    )
 
     async def _async_close_client(*_):
         await coordinator.async_close()
@@ -112,9 +169,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     def _async_create_close_task():
         asyncio.create_task(_async_close_client())
 
-    config_entry.async_on_unload(
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_client)
-    )
+    # The session is deliberately left open when Home Assistant stops so the
+    # next start can resume it from the session cache instead of logging in.
     config_entry.async_on_unload(_async_create_close_task)
 
     # Fetch initial data so we have data when entities subscribe
@@ -129,8 +185,57 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         ],
         DATA_LISTENER: [config_entry.add_update_listener(update_listener)],
     }
-    _LOGGER.debug(f"{imc} await coordinator.async_config_entry_first_refresh()")
-    await coordinator.async_config_entry_first_refresh()
+    config_entry.async_on_unload(lambda: coordinator.async_set_push(False))
+
+    async def _async_start_polling(first_refresh):
+        async with scheduler.async_slot() as wait:
+            coordinator.timings.record("queue_wait", wait)
+            await first_refresh()
+        config_entry.async_on_unload(
+            scheduler.async_add_job(
+                coordinator.imc,
+                coordinator.poll_interval,
+                coordinator.async_refresh,
+                partial(coordinator.timings.record, "queue_wait"),
+            )
+        )
+        config_entry.async_on_unload(
+            scheduler.async_add_job(
+                coordinator.stats_job,
+                coordinator.stats_interval,
+                coordinator.async_refresh_stats,
+            )
+        )
+        config_entry.async_on_unload(
+            scheduler.async_add_job(
+                coordinator.sel_job, SEL_INTERVAL, coordinator.async_read_sel
+            )
+        )
+        config_entry.async_on_unload(
+            scheduler.async_add_job(
+                coordinator.keepalive_job,
+                KEEPALIVE_INTERVAL,
+                coordinator.async_keep_alive,
+                capped=False,
+            )
+        )
+        coordinator.async_set_push(
+            config_entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES)
+        )
+
+    # An IMC whose entities are already registered starts in the background,
+    # so slow or dead IMCs do not hold up Home Assistant startup. A new IMC
+    # is read first so its entities are named after its user label.
+    if er.async_entries_for_config_entry(er.async_get(hass), config_entry.entry_id):
+        _LOGGER.debug(f"{imc} Starting in the background")
+        config_entry.async_create_background_task(
+            hass,
+            _async_start_polling(coordinator.async_refresh),
+            f"{DOMAIN} start {imc}",
+        )
+    else:
+        _LOGGER.debug(f"{imc} await coordinator.async_config_entry_first_refresh()")
+        await _async_start_polling(coordinator.async_config_entry_first_refresh)
 
     all_devices: dict[
         str,
@@ -183,6 +288,9 @@ async def get_homeassistant_components(hass, config_entry) -> dict[
                 services["sensor"][key] = sensor_type
     
     services["sensor"][STATIC_SENSOR] = STATIC_SENSOR_TYPE
+    for sensor_type in TIMING_SENSOR_TYPES + FAULT_SENSOR_TYPES:
+        services["sensor"][sensor_type.key] = sensor_type
+    services["sensor"][SUPPRESSED_WRITES_SENSOR] = SUPPRESSED_WRITES_SENSOR_TYPE
     services["switch"][SWITCH] = SWITCH_TYPE
     services["binary_sensor"][BINARY_SENSOR] = BINARY_SENSOR_TYPE
     return services
@@ -203,137 +311,793 @@ async def async_unload_entry(hass, config_entry) -> bool:
         _LOGGER.debug("Unloaded entry for %s", imc)
         if not hass.data[DOMAIN]:
             async_unload_services(hass)
+            hass.data.pop(DATA_SCHEDULER).async_stop()
+            await async_close_client_session(hass)
+        else:
+            _async_update_max_concurrent_polls(hass)
         return True
     return False
 
 
+async def async_remove_entry(hass, config_entry) -> None:
+    """Forget the cached snapshot and SEL watermark of a removed IMC."""
+    imc = config_entry.data.get(CONF_IP_ADDRESS)[0]
+    snapshots = await async_get_snapshot_store(hass)
+    snapshots.async_remove(imc)
+    sel_store = await async_get_sel_store(hass)
+    sel_store.async_remove(imc)
+
+
 async def update_listener(hass, config_entry):
     """Update when config_entry options update."""
     imc = config_entry.title
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    old_update_interval = coordinator.update_interval
-    coordinator.update_interval = config_entry.options.get(CONF_SCAN_INTERVAL)
-    if old_update_interval != coordinator.update_interval:
+    old_update_interval = coordinator.scan_interval
+    coordinator.scan_interval = config_entry.options.get(
+        CONF_SCAN_INTERVAL, MIN_SCAN_INTERVAL
+    )
+    if old_update_interval != coordinator.scan_interval:
         _LOGGER.debug(
             "Changing scan_interval for %s from %s to %s",
             imc,
             old_update_interval,
-            coordinator.update_interval,
+            coordinator.scan_interval,
         )
+    coordinator.stats_interval = config_entry.options.get(
+        CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL
+    )
+    if config_entry.options.get(CONF_BACKEND, DEFAULT_BACKEND) != coordinator.backend_option:
+        _LOGGER.debug(f"{imc} Backend changed, reloading")
+        hass.async_create_task(hass.config_entries.async_reload(config_entry.entry_id))
+        return
+    coordinator.async_set_push(
+        config_entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES)
+    )
+    coordinator.scheduler.async_set_interval(coordinator.imc, coordinator.poll_interval)
+    coordinator.scheduler.async_set_interval(
+        coordinator.stats_job, coordinator.stats_interval
+    )
+    _async_update_max_concurrent_polls(hass)
+
+
+@callback
+def _async_update_max_concurrent_polls(hass, config_entry=None):
+    """Apply the lowest max_concurrent_polls option across all IMCs."""
+    entries = {
+        entry.entry_id: entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in hass.data[DOMAIN]
+    }
+    if config_entry is not None:
+        entries[config_entry.entry_id] = config_entry
+    max_concurrent = min(
+        (
+            entry.options.get(CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS)
+            for entry in entries.values()
+        ),
+        default=DEFAULT_MAX_CONCURRENT_POLLS,
+    )
+    scheduler = hass.data[DATA_SCHEDULER]
+    if scheduler.max_concurrent != max_concurrent:
+        _LOGGER.debug("Allowing %s concurrent IMC polls", max_concurrent)
+        scheduler.async_set_max_concurrent(max_concurrent)
+
+def _to_float(value):
+    """Convert an XML API reading, or None if the IMC gave something else."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _PublishedState(NamedTuple):
+    """What the entities were last updated with."""
+
+    data: ImcSnapshot | None
+    reachable: bool
+    polling: bool
+    failures: int
+    polls: int
+    stale: bool
+    inventory: dict[str, ImcObject]
+    stats: dict[str, float | None]
+    fault_revision: int
+
 
 class CiscoImcDataService(DataUpdateCoordinator):
     """This class handle communication and stores the data."""
 
-    def __init__(self, hass, config_entry):
+    def __init__(self, hass, config_entry, scheduler, sessions, snapshots, sel_store):
         """Initialize the class."""
         self.hass = hass
         self.config_entry = config_entry
+        self.scheduler = scheduler
+        self.sessions = sessions
+        self.snapshots = snapshots
         self.imc = config_entry.data.get(CONF_IP_ADDRESS)[0]
         self.username = self.config_entry.data.get(CONF_USERNAME)[0]
         self.password = self.config_entry.data.get(CONF_PASSWORD)
-        _LOGGER.debug("about to setdefault custom_attributes for %s", self.imc)
-        if not hasattr(self.hass, 'custom_attributes'):
-            self.hass.custom_attributes = {}
-        _LOGGER.debug("about to setdefault custom_attributes.imc for %s", self.imc)
-        self.hass.custom_attributes.setdefault(self.imc, {})
-        _LOGGER.debug("about to set custom_attributes for %s", self.imc)
-        self.hass.custom_attributes[self.imc] = {}
-        _LOGGER.debug("about to set polling_switch for %s", self.imc)
-        self.hass.custom_attributes[self.imc]['polling_switch'] = True
-#        self.hass.data[DOMAIN][config_entry.entry_id]['devices']['switch'][SWITCH]._is_on = True
-        self.hass.custom_attributes[self.imc]['ip_address'] = self.imc
-        self.hass.custom_attributes[self.imc]['reachable'] = False
-        self.hass.custom_attributes[self.imc]['unreachable_counter'] = 0
-        self.update_interval = timedelta(seconds=MIN_SCAN_INTERVAL)
-        self.client = ImcHandle(
+        self.polling = True
+        self.reachable = False
+        # Liveness from the keep-alives: None until checked, False while down
+        self.alive = None
+        self.backoff = ImcBackoff()
+        self._dn_queries: dict[tuple[str, bool, str], int] = defaultdict(int)
+        self._class_queries: dict[tuple[str, str], int] = defaultdict(int)
+        self._attribute_queries: dict[tuple[str, str | None, str], int] = defaultdict(int)
+        self.objects: dict[str, ImcObject] = {}
+        self.classes: dict[str, list[ImcObject]] = {}
+        # Present hardware components by dn; their dns are None until polled
+        self.inventory: dict[str, ImcObject] = {}
+        self.inventory_dns: frozenset[str] | None = None
+        # Telemetry values and the descriptions of their sensors, by key
+        self.stats: dict[str, float | None] = {}
+        self.stats_descriptions = {}
+        self.stats_keys: frozenset[str] | None = None
+        self.faults = CiscoImcFaultTracker(hass, self.imc)
+        self._static_refreshed_at = None
+        self._static_requested = False
+        # One hierarchical query returns the rack unit and its components
+        self.async_register_dn(RACK_UNIT_DN, hierarchical=True)
+        self.async_register_attributes(RACK_UNIT_CLASS, RACK_UNIT_FAST_SENSORS)
+        self.async_register_attributes(
+            RACK_UNIT_CLASS, RACK_UNIT_STATIC_SENSORS, TIER_STATIC
+        )
+        for class_id in INVENTORY_CLASSES:
+            self.async_register_attributes(class_id, INVENTORY_ATTRIBUTES)
+        self.async_register_class(FAULT_CLASS)
+        self.async_register_attributes(FAULT_CLASS, FAULT_ATTRIBUTES)
+        for description in STATS_SENSOR_TYPES:
+            self.async_register_class(description.class_id, TIER_STATS)
+            self.async_register_attributes(
+                description.class_id, [description.property_key], TIER_STATS
+            )
+        self._published: _PublishedState | None = None
+        self._published_success = None
+        self.suppressed_writes = 0
+        self.scan_interval = config_entry.options.get(CONF_SCAN_INTERVAL, MIN_SCAN_INTERVAL)
+        self.stats_interval = config_entry.options.get(
+            CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL
+        )
+        self.events = None
+        self.timings = ImcTimings()
+        # Both APIs count against one limit of requests in flight
+        limiter = HostRequestLimiter()
+        self.xml_client = CiscoImcApi(
+            async_get_client_session(hass),
             self.imc,
             self.username,
             self.password,
             secure=True,
-            auto_refresh=True,
-            force=True,
             timeout=60,
-        )        
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=self.update_interval)   
+            session_listener=self._async_session_changed,
+            timing_listener=self.timings.record,
+            limiter=limiter,
+        )
+        self.redfish = CiscoImcRedfishApi(
+            async_get_client_session(hass),
+            self.imc,
+            self.username,
+            self.password,
+            timing_listener=self.timings.record,
+            limiter=limiter,
+        )
+        # The backend polls go through; auto is settled at the first login
+        # and uses the XML API until then
+        self.backend_option = config_entry.options.get(CONF_BACKEND, DEFAULT_BACKEND)
+        self.backend = self.backend_option
+        self.client = self.xml_client
+        if self.backend == BACKEND_REDFISH:
+            self.client = CiscoImcRedfishBackend(self.redfish)
+        # The System Event Log is not in the XML API, only in Redfish
+        self.sel = CiscoImcSelReader(hass, self.redfish, sel_store, self.imc)
+        # Polls are driven by the shared CiscoImcPollScheduler, not by a timer per IMC
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=None)
+        # The base class takes the entry being set up, which is None outside setup
+        self.config_entry = config_entry
+        self.stale_since = None
+        if (cached := snapshots.get(self.imc)) is not None:
+            # Show the last known values until the first live poll, and keep
+            # the cached static inventory until it is due a refresh anyway
+            self.data, self.stale_since = cached
+            age = (dt_util.utcnow() - self.stale_since).total_seconds()
+            if age < STATIC_REFRESH_INTERVAL:
+                self._static_refreshed_at = time.monotonic() - age
+            _LOGGER.debug(f"{self.imc} Restored snapshot from {self.stale_since}")
                      
+    @callback
+    def async_register_dn(self, dn, hierarchical=False, tier=TIER_FAST):
+        """Fetch the object at dn (and its subtree if hierarchical) in tier."""
+        key = (dn, hierarchical, tier)
+        self._dn_queries[key] += 1
+
+        @callback
+        def _async_unregister():
+            self._dn_queries[key] -= 1
+            if not self._dn_queries[key]:
+                del self._dn_queries[key]
+
+        return _async_unregister
+
+    @callback
+    def async_register_class(self, class_id, tier=TIER_FAST):
+        """Fetch every object of class_id in tier."""
+        key = (class_id, tier)
+        self._class_queries[key] += 1
+
+        @callback
+        def _async_unregister():
+            self._class_queries[key] -= 1
+            if not self._class_queries[key]:
+                del self._class_queries[key]
+
+        return _async_unregister
+
+    @callback
+    def async_register_attributes(self, class_id, attributes=None, tier=TIER_FAST):
+        """Keep attributes of class_id objects when parsing polls, or all if None.
+
+        Polled responses are streamed and only data registered in the tiers
+        being fetched is kept: objects of other classes are skipped inside
+        subtrees, and the objects a query returns are kept with only their dn.
+        """
+        keys = [(class_id, None, tier)] if attributes is None else [
+            (class_id, attribute, tier) for attribute in attributes
+        ]
+        for key in keys:
+            self._attribute_queries[key] += 1
+
+        @callback
+        def _async_unregister():
+            for key in keys:
+                self._attribute_queries[key] -= 1
+                if not self._attribute_queries[key]:
+                    del self._attribute_queries[key]
+
+        return _async_unregister
+
+    def _attribute_filter(self, tiers):
+        """Return the classes and attributes to keep in tiers, for ObjectExtractor."""
+        wanted = defaultdict(set)
+        for class_id, attribute, tier in self._attribute_queries:
+            if tier in tiers:
+                wanted[class_id].add(attribute)
+        return {
+            class_id: None if None in attributes else frozenset(attributes)
+            for class_id, attributes in wanted.items()
+        }
+
+    def _query_plan(self, tiers):
+        """Return the hierarchical dns, plain dns and classes to fetch for tiers.
+
+        Plain dns that fall inside a hierarchical subtree are dropped, the
+        subtree response already carries them.
+        """
+        queries = [(dn, hierarchical) for dn, hierarchical, tier in self._dn_queries if tier in tiers]
+        roots = sorted({dn for dn, hierarchical in queries if hierarchical})
+        dns = sorted(
+            {
+                dn
+                for dn, hierarchical in queries
+                if not hierarchical
+                and not any(dn == root or dn.startswith(f"{root}/") for root in roots)
+            }
+        )
+        class_ids = sorted({class_id for class_id, tier in self._class_queries if tier in tiers})
+        return roots, dns, class_ids
+
+    async def async_fetch(self, tiers=(TIER_FAST,)):
+        """Fetch every dn and class registered in tiers in one batch."""
+        roots, dns, class_ids = self._query_plan(tiers)
+        wanted = self._attribute_filter(tiers)
+        # Classes queried on their own, faults for one, are skipped in subtrees
+        subtree_wanted = {
+            class_id: attributes
+            for class_id, attributes in wanted.items()
+            if class_id not in class_ids
+        }
+        trees, objects, classes = await asyncio.gather(
+            self.client.async_resolve_dns(roots, hierarchical=True, wanted=subtree_wanted),
+            self.client.async_resolve_dns(dns, wanted=wanted),
+            self.client.async_resolve_classes(class_ids, wanted=wanted),
+        )
+        for root, tree in trees.items():
+            subtree = {mo.dn: mo for mo in flatten(tree)}
+            # Components removed since the last poll drop out of the subtree;
+            # objects of classes not fetched this time are left alone
+            for dn in [dn for dn in self.objects if dn.startswith(f"{root}/")]:
+                if dn not in subtree and self.objects[dn].class_id in subtree_wanted:
+                    del self.objects[dn]
+            objects.update(subtree)
+        self.objects.update(objects)
+        self.classes.update(classes)
+
+    @callback
+    def _async_index_inventory(self):
+        """Index the present components and signal when the set of dns changes.
+
+        Platforms only recompute which component entities exist on the
+        signal; attribute changes reach the entities as listener updates.
+        """
+        self.inventory = {
+            dn: mo
+            for dn, mo in self.objects.items()
+            if mo.class_id in INVENTORY_CLASSES
+            and mo.attributes.get("presence") not in INVENTORY_ABSENT
+        }
+        dns = frozenset(self.inventory)
+        if dns == self.inventory_dns:
+            return
+        if self.inventory_dns is not None:
+            _LOGGER.debug(
+                f"{self.imc} components added {sorted(dns - self.inventory_dns)}"
+                f" removed {sorted(self.inventory_dns - dns)}"
+            )
+        self.inventory_dns = dns
+        async_dispatcher_send(
+            self.hass, SIGNAL_INVENTORY_CHANGED.format(self.config_entry.entry_id)
+        )
+
+    @callback
+    def _async_index_stats(self):
+        """Read the telemetry values and signal when the set of sensors changes."""
+        stats = {}
+        descriptions = {}
+        for description in STATS_SENSOR_TYPES:
+            for mo in self.get_class(description.class_id):
+                # sys/rack-unit-1/board/cpu-2/env-stats belongs to CPU 2
+                parent_id = mo.dn.rsplit("/", 2)[-2].rsplit("-", 1)[-1]
+                key = description.key.format(id=parent_id)
+                stats[key] = _to_float(mo.attributes.get(description.property_key))
+                descriptions[key] = replace(
+                    description, key=key, name=description.name.format(id=parent_id)
+                )
+        self.stats = stats
+        keys = frozenset(stats)
+        if keys == self.stats_keys:
+            return
+        self.stats_keys = keys
+        self.stats_descriptions = descriptions
+        async_dispatcher_send(
+            self.hass, SIGNAL_STATS_CHANGED.format(self.config_entry.entry_id)
+        )
+
+    async def async_refresh_stats(self):
+        """Read the telemetry in one batch; run on its own schedule.
+
+        Skipped while polling is off or the IMC is unreachable, which the
+        regular polls take care of.
+        """
+        if not self.polling or not self.reachable or not self.backoff.ready():
+            return
+        try:
+            await self.async_fetch((TIER_STATS,))
+        except ImcApiError as ex:
+            _LOGGER.debug(f"{self.imc} Reading stats failed: {ex}")
+            return
+        self._async_index_stats()
+        self.async_update_listeners()
+
+    async def async_keep_alive(self):
+        """Check that the IMC is up; run on its own short schedule.
+
+        A logged in IMC gets an aaaKeepAlive on its session, which also
+        keeps the session fresh, or a read of the Redfish service root;
+        otherwise only a TCP probe is made. An IMC that stops answering is
+        marked unreachable right away, and one that comes back is polled
+        right away.
+        """
+        if not self.polling:
+            return
+        if self.reachable and self.client.logged_in:
+            try:
+                alive = await self.client.async_keep_alive(KEEPALIVE_TIMEOUT)
+            except ImcApiConnectionError as ex:
+                _LOGGER.debug(f"{self.imc} Keep-alive failed: {ex}")
+                alive = False
+            except ImcApiError as ex:
+                # It answered, so it is up; the next poll deals with the error
+                _LOGGER.debug(f"{self.imc} Keep-alive rejected: {ex}")
+                alive = True
+        else:
+            alive = await async_probe(self.imc)
+        was_alive, self.alive = self.alive, alive
+        if alive:
+            if was_alive is False:
+                _LOGGER.debug(f"{self.imc} Answering again, polling now")
+                self.backoff.record_success()
+                await self.async_request_refresh()
+            return
+        if self.reachable:
+            _LOGGER.debug(f"{self.imc} Stopped answering keep-alives")
+            self.reachable = False
+            self.async_update_listeners()
+
+    async def async_read_sel(self):
+        """Read the new System Event Log entries; run on its own schedule.
+
+        Skipped like the stats, and for good once the IMC turns out to
+        have no Redfish SEL.
+        """
+        if (
+            not self.sel.supported
+            or not self.polling
+            or not self.reachable
+            or not self.backoff.ready()
+        ):
+            return
+        try:
+            count = await self.sel.async_read()
+        except ImcApiError as ex:
+            _LOGGER.debug(f"{self.imc} Reading the SEL failed: {ex}")
+            return
+        _LOGGER.debug(f"{self.imc} Read {count} new SEL entries")
+
+    def _static_refresh_due(self):
+        """Return True when the static tier should be fetched this poll."""
+        return (
+            self._static_requested
+            or self._static_refreshed_at is None
+            or time.monotonic() - self._static_refreshed_at >= STATIC_REFRESH_INTERVAL
+        )
+
+    async def async_request_static_refresh(self):
+        """Refetch the static inventory on the next poll and poll now."""
+        self._static_requested = True
+        await self.async_request_refresh()
+
+    def get_object(self, dn):
+        """Return the last fetched object at dn."""
+        return self.objects.get(dn)
+
+    def get_class(self, class_id):
+        """Return the last fetched objects of class_id."""
+        return self.classes.get(class_id, [])
+
+    @property
+    def stats_job(self):
+        """Return the name of the scheduler job reading the telemetry."""
+        return f"{self.imc} stats"
+
+    @property
+    def keepalive_job(self):
+        """Return the name of the scheduler job checking liveness."""
+        return f"{self.imc} keepalive"
+
+    @property
+    def sel_job(self):
+        """Return the name of the scheduler job reading the SEL."""
+        return f"{self.imc} sel"
+
+    @property
+    def poll_interval(self):
+        """Return the seconds between scheduled polls."""
+        if self.events is not None:
+            return max(self.scan_interval, PUSH_SWEEP_INTERVAL)
+        return self.scan_interval
+
+    @callback
+    def async_set_push(self, enabled):
+        """Start or stop taking updates from the IMC event channel.
+
+        Only the XML API has an event channel; other backends keep polling.
+        The scheduled poll follows the interval of the new mode.
+        """
+        enabled = enabled and self.client.supports_events
+        if enabled and self.events is None:
+            _LOGGER.debug(f"{self.imc} switching to push updates")
+            self.events = CiscoImcEventListener(self.hass, self)
+            self.events.async_start()
+        elif not enabled and self.events is not None:
+            _LOGGER.debug(f"{self.imc} switching to polling")
+            self.events.async_stop()
+            self.events = None
+        self.scheduler.async_set_interval(self.imc, self.poll_interval)
+
+    @callback
+    def async_apply_mo_change(self, mo):
+        """Merge a changed object into the last poll's data.
+
+        The object comes from a configMoChangeEvent or a configConfMo
+        response and may carry only some of the attributes.
+        """
+        if mo.class_id == FAULT_CLASS:
+            self.faults.async_apply_change(mo)
+            self.async_update_listeners()
+            return
+        if mo.attributes.get("status") == "deleted":
+            self.objects.pop(mo.dn, None)
+        elif (current := self.objects.get(mo.dn)) is not None:
+            self.objects[mo.dn] = current._replace(
+                attributes={**current.attributes, **mo.attributes}
+            )
+        elif mo.class_id in INVENTORY_CLASSES:
+            self.objects[mo.dn] = mo
+        if mo.class_id in INVENTORY_CLASSES and self.inventory_dns is not None:
+            self._async_index_inventory()
+            self.async_update_listeners()
+        if mo.dn != RACK_UNIT_DN or self.data is None:
+            return
+        keys = [key for key in RACK_UNIT_SENSORS if key in mo.attributes]
+        if keys:
+            _LOGGER.debug(f"{self.imc} changed {mo.attributes}")
+            self.async_set_updated_data(
+                ImcSnapshot.from_attributes(mo.attributes, keys, self.data)
+            )
+
+    async def async_wait_for_power(self, oper_power, timeout):
+        """Re-read the rack unit every few seconds until it is oper_power.
+
+        Returns True once it is and False after timeout seconds. Scheduled
+        polls carry on at their normal cadence meanwhile.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                rack_unit = await self.client.async_resolve_dn(
+                    RACK_UNIT_DN, wanted=self._attribute_filter((TIER_FAST,))
+                )
+            except ImcApiError as ex:
+                _LOGGER.debug(f"{self.imc} Reading oper_power failed: {ex}")
+                rack_unit = None
+            if rack_unit is not None:
+                self.async_apply_mo_change(rack_unit)
+                if rack_unit.attributes.get("oper_power") == oper_power:
+                    return True
+            if time.monotonic() + POWER_CONFIRM_INTERVAL > deadline:
+                return False
+            await asyncio.sleep(POWER_CONFIRM_INTERVAL)
+
+    @callback
+    def _async_session_changed(self, cookie, refresh_period):
+        """Keep the session cache in step with the client."""
+        self.sessions.async_update(self.imc, self.username, cookie, refresh_period)
+
     async def async_login(self):
         response = False
-        self.hass.custom_attributes[self.imc]['reachable'] = False
+        self.reachable = False
+        if not await async_probe(self.imc):
+            self.backoff.record_failure()
+            raise UpdateFailed("The IMC is not accepting connections, skipping update")
         try:
-            _LOGGER.debug(f"{self.imc} Logging in from CiscoImcDataService")
-            response = await self.hass.async_add_executor_job(self.client.login)
-        except URLError as ex:
-            self.hass.custom_attributes[self.imc]['reachable'] = False
-            self.hass.custom_attributes[self.imc]['unreachable_counter'] += 1
+            if self.backend == BACKEND_AUTO:
+                self._async_use_backend(await async_detect_backend(self.redfish))
+            cookie = self.sessions.get(self.imc, self.username)
+            if cookie is not None:
+                _LOGGER.debug(f"{self.imc} Resuming cached session from CiscoImcDataService")
+                response = await self.client.async_resume(cookie)
+            else:
+                _LOGGER.debug(f"{self.imc} Logging in from CiscoImcDataService")
+                response = await self.client.async_login()
+        except ImcApiConnectionError as ex:
+            self.reachable = False
+            self.backoff.record_failure()
             raise UpdateFailed("Unable to contact the IMC, skipping update") from ex
 #            _LOGGER.debug(f"{self.imc} Unable to contact the IMC, skipping update")
 #            return False
-        except ImcLoginError as ex:
+        except ImcApiAuthError as ex:
             _LOGGER.error("Could not login to the IMC %s", self.imc)
             raise ConfigEntryAuthFailed from ex
-        except ImcException as ex:
+        except ImcApiError as ex:
             _LOGGER.error("Exception logging in to the IMC %s", self.imc)
             _LOGGER.debug(f"Exception was: {ex}")
-            raise ConfigEntryNotReady from ex
+            self.backoff.record_failure()
+            raise UpdateFailed(f"Unable to log in to the IMC: {ex}") from ex
         _LOGGER.debug(f"{self.imc} Login from CiscoImcDataService = {response}")
-        self.hass.custom_attributes[self.imc]['reachable'] = response
-        _LOGGER.debug(f"{self.imc} Reachable set to {self.hass.custom_attributes[self.imc]['reachable']}")
+        self.reachable = response
+        _LOGGER.debug(f"{self.imc} Reachable set to {self.reachable}")
         return response
         
+    @callback
+    def _async_use_backend(self, backend):
+        """Poll through backend from now on, for an IMC set to auto."""
+        _LOGGER.debug(f"{self.imc} Reading the IMC over {backend}")
+        self.backend = backend
+        if backend == BACKEND_REDFISH:
+            self.client = CiscoImcRedfishBackend(self.redfish)
+            self.async_set_push(False)
+
     async def async_close(self):
-        response = await self.hass.async_add_executor_job(self.client.logout)
-        self.hass.custom_attributes[self.imc]['reachable'] = False
+        try:
+            response = await self.client.async_logout()
+        except ImcApiError as ex:
+            _LOGGER.debug(f"{self.imc} Logout failed: {ex}")
+            response = False
+        self.reachable = False
         _LOGGER.debug(f"{self.imc} Logout from CiscoImcDataService = {response}")
         return response
         
     async def _async_update_data(self):
-        """Update data."""
-        _LOGGER.debug(f"{self.imc} polling_switch = {self.hass.custom_attributes[self.imc]['polling_switch']}")
-        if self.hass.custom_attributes[self.imc]['polling_switch']:
-            _LOGGER.debug(f"{self.imc} reachable = {self.hass.custom_attributes[self.imc]['reachable']}")
-            if not self.hass.custom_attributes[self.imc]['reachable']:
-                result = await self.async_login()
-                if not result:
-                    self.hass.custom_attributes[self.imc]['unreachable_counter'] += 1
-                    return False
-            await self.hass.async_add_executor_job(self.update)
-            
-        
-    def update(self):
+        """Update data, timing the poll and keeping its error."""
+        started = time.perf_counter()
+        try:
+            with self.timings.polling():
+                return await self._async_poll()
+        except Exception as ex:
+            self.timings.record_error(ex)
+            raise
+        finally:
+            self.timings.record("poll", time.perf_counter() - started)
+
+    async def _async_poll(self):
+        """Poll the IMC unless polling is off or backing off."""
+        _LOGGER.debug(f"{self.imc} polling_switch = {self.polling}")
+        if not self.polling:
+            return self.data
+        _LOGGER.debug(f"{self.imc} reachable = {self.reachable}")
+        if self.alive is False:
+            raise UpdateFailed("The IMC is not answering keep-alives, skipping update")
+        if not self.backoff.ready():
+            raise UpdateFailed(
+                f"Backing off after {self.backoff.failures} failures, skipping update"
+            )
+        if not self.reachable:
+            result = await self.async_login()
+            if not result:
+                self.backoff.record_failure()
+                raise UpdateFailed("Unable to log in to the IMC, skipping update")
+        return await self.async_update()
+
+
+    async def async_update(self):
         """Update the data from the Cisco IMC API."""
+        static = self._static_refresh_due()
+        tiers = [TIER_FAST]
+        if static:
+            tiers.append(TIER_STATIC)
+        # The stats schedule takes over once the first poll found the sensors
+        if self.stats_keys is None:
+            tiers.append(TIER_STATS)
         try:
-            rack_unit = self.client.query_dn("sys/rack-unit-1")
-        except URLError as ex:
-            self.hass.custom_attributes[self.imc]['reachable'] = False
-            self.hass.custom_attributes[self.imc]['unreachable_counter'] += 1
+            await self.async_fetch(tiers)
+        except ImcApiConnectionError as ex:
+            self.reachable = False
+            self.backoff.record_failure()
             raise UpdateFailed("Unable to contact the IMC, skipping update") from ex
         except Exception as ex:
-            self.hass.custom_attributes[self.imc]['reachable'] = False
-            self.hass.custom_attributes[self.imc]['unreachable_counter'] += 1
+            self.reachable = False
+            self.backoff.record_failure()
             raise UpdateFailed("Unable to contact the IMC, skipping update") from ex
-        self.hass.custom_attributes[self.imc].clear()
-        self.hass.custom_attributes[self.imc]['ip_address'] = self.imc
+        rack_unit = self.get_object(RACK_UNIT_DN)
+        if rack_unit is None:
+            raise UpdateFailed(f"{RACK_UNIT_DN} not found on the IMC, skipping update")
+        self.reachable = True
+        self.alive = True
+        self.backoff.record_success()
+        self.stale_since = None
+        self._async_index_inventory()
+        # Backends without faults leave the class out, and the tracker alone
+        if FAULT_CLASS in self.classes:
+            self.faults.async_update(self.get_class(FAULT_CLASS))
+        if TIER_STATS in tiers:
+            self._async_index_stats()
+
+        # Static attributes keep their last value between static refreshes
+        snapshot = ImcSnapshot.from_attributes(
+            rack_unit.attributes,
+            RACK_UNIT_SENSORS if static else RACK_UNIT_FAST_SENSORS,
+            self.data or ImcSnapshot(ip_address=self.imc),
+        )
+        if static:
+            self._static_refreshed_at = time.monotonic()
+            self._static_requested = False
+        _LOGGER.debug(f"Updated Cisco IMC Rack Unit {self.imc}: {snapshot}")
+        return snapshot
 
-        self.hass.custom_attributes[self.imc]['reachable'] = True
-        self.hass.custom_attributes[self.imc]['polling_switch'] = True
-        self.hass.custom_attributes[self.imc]['unreachable_counter'] = 0
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the entities whose attribute changed since the last update.
 
-        for key, value in rack_unit.__dict__.items():
-            if key in RACK_UNIT_SENSORS:
-                self.hass.custom_attributes[self.imc][key] = value
-        _LOGGER.debug(f"Updated Cisco IMC Rack Unit {self.imc}: {self.hass.custom_attributes[self.imc]}")
+        Entities register with their attribute key as listener context.
+        Listeners without a context, and every listener when availability,
+        the user label or staleness changes, are always updated. Good data
+        is also handed to the snapshot store here.
+        """
+        started = time.perf_counter()
+        if self.last_update_success and self.data is not None and not self.stale:
+            self.snapshots.async_update(self.imc, self.data)
+        current = _PublishedState(
+            data=self.data,
+            reachable=self.reachable,
+            polling=self.polling,
+            failures=self.backoff.failures,
+            polls=self.timings.polls,
+            stale=self.stale,
+            inventory=self.inventory,
+            stats=self.stats,
+            fault_revision=self.faults.revision,
+        )
+        published = self._published
+        if (
+            self.last_update_success != self._published_success
+            or published is None
+            # Every entity is named after the user label and shows staleness
+            or self.label != getattr(published.data, "usr_lbl", None)
+            or self.stale != published.stale
+        ):
+            changed = None
+        else:
+            if self.data is None:
+                changed = set()
+            else:
+                changed = self.data.diff(published.data)
+            if (
+                published.reachable != self.reachable
+                or published.failures != self.backoff.failures
+            ):
+                changed.add(BINARY_SENSOR)
+            if published.polling != self.polling:
+                changed.add(SWITCH)
+            if published.polls != self.timings.polls:
+                changed.update(sensor_type.key for sensor_type in TIMING_SENSOR_TYPES)
+            if published.inventory is not self.inventory:
+                # Component entities use their dn as listener context
+                changed.update(
+                    dn
+                    for dn in published.inventory.keys() | self.inventory.keys()
+                    if getattr(published.inventory.get(dn), "attributes", None)
+                    != getattr(self.inventory.get(dn), "attributes", None)
+                )
+            if published.fault_revision != self.faults.revision:
+                changed.update(sensor_type.key for sensor_type in FAULT_SENSOR_TYPES)
+            if published.stats is not self.stats:
+                changed.update(
+                    key
+                    for key in published.stats.keys() | self.stats.keys()
+                    if published.stats.get(key) != self.stats.get(key)
+                )
+        self._published = current
+        self._published_success = self.last_update_success
+        if changed is None:
+            super().async_update_listeners()
+            self.timings.record("dispatch", time.perf_counter() - started)
+            return
+        suppressed_writes = self.suppressed_writes
+        counters = []
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+            elif context == SUPPRESSED_WRITES_SENSOR:
+                counters.append(update_callback)
+            else:
+                self.suppressed_writes += 1
+        # The counter's own sensor is written whenever the count grows
+        if self.suppressed_writes != suppressed_writes:
+            for update_callback in counters:
+                update_callback()
+        self.timings.record("dispatch", time.perf_counter() - started)
+        _LOGGER.debug(
+            f"{self.imc} changed {sorted(changed)}, {self.suppressed_writes} writes suppressed so far"
+        )
 
     def set_polling_state(self, new_state):
         """Update the polling status the Cisco IMC API."""
-        self.hass.custom_attributes[self.imc]['polling_switch'] = new_state
-        _LOGGER.debug(f"Updated Cisco IMC Polling {self.imc}: %s", self.hass.custom_attributes[self.imc]['polling_switch'])
+        self.polling = new_state
+        _LOGGER.debug(f"Updated Cisco IMC Polling {self.imc}: %s", self.polling)
 
     def is_polling(self):
         """Return the polling status the Cisco IMC API."""
-        is_polling = self.hass.custom_attributes[self.imc]['polling_switch'] == True
+        is_polling = self.polling == True
         _LOGGER.debug(f"Cisco IMC Polling {self.imc}: %s", is_polling)
         return is_polling
 
+    @property
+    def stale(self):
+        """Return True while showing a snapshot restored from the last run."""
+        return self.stale_since is not None
+
+    @property
+    def unreachable_counter(self):
+        """Return the number of failed attempts since the last success."""
+        return self.backoff.failures
+
+    @property
+    def label(self):
+        """Return the user label of the rack unit, if any."""
+        return self.sensor_state("usr_lbl")
+
     def sensor_state(self, key):
         """Return the state of a Cisco IMC sensor."""
-        return self.hass.custom_attributes[self.imc][key]
+        if self.data is None:
+            return None
+        return self.data.get(key)
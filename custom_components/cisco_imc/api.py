@@ -0,0 +1,732 @@
+"""Async client for the Cisco IMC XML API."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import logging
+import re
+import time
+from typing import AsyncIterator, Callable, Mapping, NamedTuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import quoteattr
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+XML_API_PATH = "/nuova"
+DEFAULT_TIMEOUT = 60
+MIN_REFRESH_PERIOD = 60
+STREAM_CHUNK_SIZE = 65536
+# Requests in flight to one IMC at once; the event channel is not counted
+MAX_REQUESTS_PER_HOST = 2
+
+# errorCode values the IMC returns when the cookie is no longer valid
+SESSION_ERROR_CODES = ("552", "555")
+# errorCode of a request for a method the firmware does not know; it fails
+# schema validation like any unknown element. Firmware answering with some
+# other code is caught by the first call of each batch method instead.
+UNKNOWN_METHOD_ERROR_CODE = "ERR-xml-parse-error"
+
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def to_snake_case(name: str) -> str:
+    """Convert an XML API attribute name to the SDK style property name."""
+    return _CAMEL_RE.sub(r"\1_\2", name).lower()
+
+
+class ImcApiError(Exception):
+    """Error returned by the IMC XML API."""
+
+    def __init__(self, message: str, error_code: str | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.error_code = error_code
+
+
+class ImcApiConnectionError(ImcApiError):
+    """The IMC could not be reached."""
+
+
+class ImcApiAuthError(ImcApiError):
+    """The IMC rejected the credentials."""
+
+
+class ImcApiMethodError(ImcApiError):
+    """The IMC answered a method with an errorCode."""
+
+
+def connect_trace_config() -> aiohttp.TraceConfig:
+    """Return a TraceConfig reporting new connection setup time.
+
+    Requests made by a CiscoImcApi with a timing listener pass it as the
+    trace_request_ctx, and it is called with ("connect", seconds) whenever
+    a request has to open a new TCP and TLS connection.
+    """
+
+    async def _on_start(_session, context, _params) -> None:
+        context.connect_started = time.perf_counter()
+
+    async def _on_end(_session, context, _params) -> None:
+        if callable(context.trace_request_ctx):
+            context.trace_request_ctx(
+                "connect", time.perf_counter() - context.connect_started
+            )
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_on_start)
+    trace_config.on_connection_create_end.append(_on_end)
+    return trace_config
+
+
+class ImcObject(NamedTuple):
+    """A managed object returned by the IMC."""
+
+    class_id: str
+    dn: str
+    attributes: dict[str, str]
+    children: list[ImcObject]
+
+
+def _object_from_elem(elem: ElementTree.Element, parent_dn: str = "") -> ImcObject:
+    """Build an ImcObject from an outConfig(s) child element.
+
+    Children of hierarchical responses may only carry an rn, so their dn
+    is derived from the parent.
+    """
+    attributes = {to_snake_case(key): value for key, value in elem.attrib.items()}
+    dn = elem.attrib.get("dn") or f"{parent_dn}/{elem.attrib.get('rn', '')}"
+    attributes["dn"] = dn
+    return ImcObject(
+        elem.tag,
+        dn,
+        attributes,
+        [_object_from_elem(child, dn) for child in elem],
+    )
+
+
+def _event_objects(root: ElementTree.Element) -> list[ImcObject]:
+    """Return the objects carried by a methodVessel or configMoChangeEvent."""
+    return [
+        _object_from_elem(mo_elem)
+        for event in root.iter("configMoChangeEvent")
+        for in_config in event
+        for mo_elem in in_config
+    ]
+
+
+# Attribute names repeat across every object of a class, convert each once
+_snake_name = lru_cache(maxsize=4096)(to_snake_case)
+
+
+class ObjectExtractor:
+    """Incremental parser for XML API responses keeping only wanted data.
+
+    wanted maps class ids to the snake_case attributes to keep, or to None
+    to keep all of them. The objects a query returns are always kept, with
+    only their dn if their class is not wanted. Below them, objects of
+    other classes are skipped and wanted objects become children of their
+    nearest kept ancestor. Elements are dropped as soon as they end, so a
+    large hierarchical response is never held as a whole tree.
+    """
+
+    def __init__(self, wanted: Mapping[str, frozenset[str] | None]) -> None:
+        """Initialize the extractor."""
+        self.attrib: dict[str, str] = {}
+        self.objects: list[ImcObject] = []
+        self.parse_time = 0.0
+        self._wanted = wanted
+        self._parser = ElementTree.XMLPullParser(("start", "end"))
+        self._container: ElementTree.Element | None = None
+        self._depth = 0
+        # (dn, nearest kept object) of every open managed object element
+        self._stack: list[tuple[str, ImcObject | None]] = []
+
+    def feed(self, data: bytes) -> None:
+        """Parse the next chunk of the response."""
+        started = time.perf_counter()
+        self._parser.feed(data)
+        self._process()
+        self.parse_time += time.perf_counter() - started
+
+    def close(self) -> None:
+        """Finish parsing; raises ParseError if the response was incomplete."""
+        started = time.perf_counter()
+        self._parser.close()
+        self._process()
+        self.parse_time += time.perf_counter() - started
+
+    def _process(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "end":
+                self._depth -= 1
+                if self._depth >= 2:
+                    self._stack.pop()
+                    elem.clear()
+                    if self._depth == 2 and self._container is not None:
+                        self._container.clear()
+                continue
+            depth = self._depth
+            self._depth += 1
+            if depth == 0:
+                self.attrib = dict(elem.attrib)
+            elif depth == 1:
+                # outConfig or outConfigs
+                self._container = elem
+            else:
+                self._start_object(elem, depth == 2)
+
+    def _start_object(self, elem: ElementTree.Element, top: bool) -> None:
+        parent_dn, owner = self._stack[-1] if self._stack else ("", None)
+        attrib = elem.attrib
+        dn = attrib.get("dn") or f"{parent_dn}/{attrib.get('rn', '')}"
+        if elem.tag in self._wanted:
+            if (keep := self._wanted[elem.tag]) is None:
+                attributes = {_snake_name(key): value for key, value in attrib.items()}
+            else:
+                attributes = {
+                    name: value
+                    for key, value in attrib.items()
+                    if (name := _snake_name(key)) in keep
+                }
+        elif top:
+            attributes = {}
+        else:
+            self._stack.append((dn, owner))
+            return
+        attributes["dn"] = dn
+        mo = ImcObject(elem.tag, dn, attributes, [])
+        (owner.children if owner is not None else self.objects).append(mo)
+        self._stack.append((dn, mo))
+
+
+def _out_objects(
+    resp: ElementTree.Element | ObjectExtractor, container: str
+) -> list[ImcObject]:
+    """Return the objects in the outConfig or outConfigs of a response."""
+    if isinstance(resp, ObjectExtractor):
+        return resp.objects
+    out = resp.find(container)
+    return [] if out is None else [_object_from_elem(elem) for elem in out]
+
+
+def flatten(mo: ImcObject) -> list[ImcObject]:
+    """Return mo and all of its descendants."""
+    objects = [mo]
+    for child in mo.children:
+        objects.extend(flatten(child))
+    return objects
+
+
+class HostRequestLimiter:
+    """Cap the requests in flight to one IMC, shared by its clients.
+
+    A slow or hung IMC then holds at most limit connections however many
+    requests are queued for it, and the queue can be watched.
+    """
+
+    def __init__(self, limit: int = MAX_REQUESTS_PER_HOST) -> None:
+        """Initialize the limiter."""
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(limit)
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[float]:
+        """Hold one request slot; yields the seconds spent waiting for it."""
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield time.perf_counter() - started
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the slot usage for diagnostics."""
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting}
+
+
+class CiscoImcApi:
+    """Talk to one IMC over a shared aiohttp session."""
+
+    # The event channel (async_events) is only in the XML API
+    supports_events = True
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        username: str,
+        password: str,
+        secure: bool = True,
+        timeout: int = DEFAULT_TIMEOUT,
+        session_listener: Callable[[str | None, int], None] | None = None,
+        timing_listener: Callable[[str, float], None] | None = None,
+        limiter: HostRequestLimiter | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        session_listener is called with the cookie and refresh period
+        whenever a session is opened, refreshed or closed. timing_listener
+        is called with a phase name and its duration in seconds for every
+        request, parse, login and refresh, and for the wait for a request
+        slot (host_wait). limiter is shared with other clients of the IMC.
+        """
+        self.host = host
+        self.username = username
+        self._password = password
+        self._session = session
+        self._url = f"{'https' if secure else 'http'}://{host}{XML_API_PATH}"
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._cookie: str | None = None
+        self._refresh_period = 0
+        self._refresh_at = 0.0
+        self._auth_lock = asyncio.Lock()
+        # Batch methods found missing on this IMC's firmware, and found working
+        self._unsupported_methods: set[str] = set()
+        self._supported_methods: set[str] = set()
+        self._session_listener = session_listener
+        self._timing_listener = timing_listener
+        self.limiter = limiter or HostRequestLimiter()
+
+    @property
+    def cookie(self) -> str | None:
+        """Return the current session cookie."""
+        return self._cookie
+
+    @property
+    def logged_in(self) -> bool:
+        """Return True while there is a session."""
+        return self._cookie is not None
+
+    @property
+    def refresh_period(self) -> int:
+        """Return the session refresh period reported by the IMC."""
+        return self._refresh_period
+
+    def _record(self, phase: str, seconds: float) -> None:
+        if self._timing_listener is not None:
+            self._timing_listener(phase, seconds)
+
+    async def _async_post(
+        self,
+        payload: str,
+        extractor: ObjectExtractor | None = None,
+        timeout: float | None = None,
+    ) -> ElementTree.Element | ObjectExtractor:
+        """Post an XML API request and return the parsed response.
+
+        With an extractor the response is fed to it as it arrives and the
+        extractor is returned instead of the whole parsed tree. timeout
+        overrides the client's for this request.
+        """
+        async with self.limiter.async_slot() as wait:
+            self._record("host_wait", wait)
+            return await self._async_post_now(payload, extractor, timeout)
+
+    async def _async_post_now(
+        self,
+        payload: str,
+        extractor: ObjectExtractor | None,
+        timeout: float | None,
+    ) -> ElementTree.Element | ObjectExtractor:
+        """Post a request holding a request slot."""
+        started = time.perf_counter()
+        try:
+            async with self._session.post(
+                self._url,
+                data=payload.encode(),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=self._timeout
+                if timeout is None
+                else aiohttp.ClientTimeout(total=timeout),
+                ssl=False,
+                trace_request_ctx=self._timing_listener,
+            ) as resp:
+                if resp.status != 200:
+                    raise ImcApiError(
+                        f"{self.host} returned HTTP {resp.status}", str(resp.status)
+                    )
+                if extractor is None:
+                    body = await resp.read()
+                else:
+                    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        extractor.feed(chunk)
+                    extractor.close()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            raise ImcApiConnectionError(f"Unable to contact {self.host}: {ex}") from ex
+        except ElementTree.ParseError as ex:
+            raise ImcApiError(f"Malformed response from {self.host}: {ex}") from ex
+        received = time.perf_counter()
+        if extractor is not None:
+            self._record("request", received - started - extractor.parse_time)
+            self._record("parse", extractor.parse_time)
+            return extractor
+        self._record("request", received - started)
+        try:
+            return ElementTree.fromstring(body)
+        except ElementTree.ParseError as ex:
+            raise ImcApiError(f"Malformed response from {self.host}: {ex}") from ex
+        finally:
+            self._record("parse", time.perf_counter() - received)
+
+    @staticmethod
+    def _build(method: str, attrs: dict[str, str], body: str = "") -> str:
+        """Build an XML API method element."""
+        attr_str = "".join(f" {key}={quoteattr(str(value))}" for key, value in attrs.items())
+        if body:
+            return f"<{method}{attr_str}>{body}</{method}>"
+        return f"<{method}{attr_str}/>"
+
+    def _update_session(self, resp: ElementTree.Element) -> None:
+        """Store the cookie and refresh period from an aaa response."""
+        self._cookie = resp.attrib.get("outCookie")
+        self._refresh_period = int(resp.attrib.get("outRefreshPeriod") or 0)
+        self._refresh_at = time.monotonic() + max(
+            self._refresh_period - MIN_REFRESH_PERIOD, MIN_REFRESH_PERIOD
+        )
+        self._notify_session()
+
+    def _notify_session(self) -> None:
+        if self._session_listener is not None:
+            self._session_listener(self._cookie, self._refresh_period)
+
+    async def _async_login(self) -> None:
+        """Send aaaLogin; the caller holds the auth lock."""
+        started = time.perf_counter()
+        resp = await self._async_post(
+            self._build(
+                "aaaLogin",
+                {"inName": self.username, "inPassword": self._password},
+            )
+        )
+        if "errorCode" in resp.attrib:
+            self._cookie = None
+            self._notify_session()
+            raise ImcApiAuthError(
+                resp.attrib.get("errorDescr", "Login failed"),
+                resp.attrib["errorCode"],
+            )
+        self._update_session(resp)
+        self._record("login", time.perf_counter() - started)
+        _LOGGER.debug(f"{self.host} logged in, refresh period {self._refresh_period}")
+
+    async def _async_refresh(self) -> None:
+        """Send aaaRefresh, logging in again if the session has expired."""
+        if self._cookie is not None:
+            started = time.perf_counter()
+            resp = await self._async_post(
+                self._build(
+                    "aaaRefresh",
+                    {
+                        "cookie": self._cookie,
+                        "inCookie": self._cookie,
+                        "inName": self.username,
+                        "inPassword": self._password,
+                    },
+                )
+            )
+            if "errorCode" not in resp.attrib:
+                self._update_session(resp)
+                self._record("refresh", time.perf_counter() - started)
+                return
+            _LOGGER.debug(f"{self.host} session refresh failed, logging in again")
+            self._cookie = None
+        await self._async_login()
+
+    async def async_login(self) -> bool:
+        """Log in and start a new session."""
+        async with self._auth_lock:
+            await self._async_login()
+        return True
+
+    async def async_refresh(self) -> bool:
+        """Refresh the current session, logging in again if it has expired."""
+        async with self._auth_lock:
+            await self._async_refresh()
+        return True
+
+    async def async_resume(self, cookie: str) -> bool:
+        """Take over an existing session, logging in if it is no longer valid."""
+        async with self._auth_lock:
+            self._cookie = cookie
+            await self._async_refresh()
+        return True
+
+    async def _async_ensure_session(self, expired: str | None = None) -> None:
+        """Make sure there is a usable session.
+
+        Concurrent callers wait on the same lock, so only the first one
+        logs in or refreshes. expired is the cookie a caller saw rejected.
+        """
+        async with self._auth_lock:
+            if self._cookie is None or self._cookie == expired:
+                self._cookie = None
+                await self._async_login()
+            elif time.monotonic() >= self._refresh_at:
+                await self._async_refresh()
+
+    async def async_keep_alive(self, timeout: float | None = None) -> bool:
+        """Keep the current session alive, refreshing it when it is due.
+
+        A session the IMC no longer knows is replaced by a new login.
+        Raises ImcApiConnectionError when the IMC does not answer.
+        """
+        cookie = self._cookie
+        if cookie is None or time.monotonic() >= self._refresh_at:
+            await self._async_ensure_session()
+            return True
+        resp = await self._async_post(
+            self._build("aaaKeepAlive", {"cookie": cookie}), timeout=timeout
+        )
+        error_code = resp.attrib.get("errorCode")
+        if error_code in SESSION_ERROR_CODES:
+            _LOGGER.debug(f"{self.host} session expired, logging in again")
+            await self._async_ensure_session(expired=cookie)
+        elif error_code is not None:
+            raise ImcApiError(
+                resp.attrib.get("errorDescr", "aaaKeepAlive failed"), error_code
+            )
+        return True
+
+    async def async_logout(self) -> bool:
+        """End the current session."""
+        if self._cookie is None:
+            return True
+        cookie, self._cookie = self._cookie, None
+        self._notify_session()
+        resp = await self._async_post(
+            self._build("aaaLogout", {"cookie": cookie, "inCookie": cookie})
+        )
+        error_code = resp.attrib.get("errorCode")
+        if error_code and error_code not in SESSION_ERROR_CODES:
+            raise ImcApiError(resp.attrib.get("errorDescr", "Logout failed"), error_code)
+        return True
+
+    async def _async_method(
+        self,
+        method: str,
+        attrs: dict[str, str],
+        body: str = "",
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> ElementTree.Element | ObjectExtractor:
+        """Run an XML API method that requires a session.
+
+        With wanted the response is streamed through an ObjectExtractor,
+        which is returned instead of the parsed tree.
+        """
+        if self._cookie is None or time.monotonic() >= self._refresh_at:
+            await self._async_ensure_session()
+        for attempt in range(2):
+            cookie = self._cookie
+            resp = await self._async_post(
+                self._build(method, {"cookie": cookie, **attrs}, body),
+                None if wanted is None else ObjectExtractor(wanted),
+            )
+            error_code = resp.attrib.get("errorCode")
+            if error_code is None:
+                return resp
+            if error_code in SESSION_ERROR_CODES and attempt == 0:
+                _LOGGER.debug(f"{self.host} session expired, logging in again")
+                await self._async_ensure_session(expired=cookie)
+                continue
+            raise ImcApiMethodError(
+                resp.attrib.get("errorDescr", f"{method} failed"), error_code
+            )
+        raise ImcApiError(f"{method} failed")
+
+    async def async_resolve_dn(
+        self,
+        dn: str,
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> ImcObject | None:
+        """Return the managed object at dn, or None if it does not exist.
+
+        wanted limits the classes and attributes kept, see ObjectExtractor.
+        """
+        resp = await self._async_method(
+            "configResolveDn",
+            {"dn": dn, "inHierarchical": str(hierarchical).lower()},
+            wanted=wanted,
+        )
+        objects = _out_objects(resp, "outConfig")
+        return objects[0] if objects else None
+
+    async def async_resolve_class(
+        self,
+        class_id: str,
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> list[ImcObject]:
+        """Return every managed object of class_id."""
+        resp = await self._async_method(
+            "configResolveClass",
+            {"classId": class_id, "inHierarchical": str(hierarchical).lower()},
+            wanted=wanted,
+        )
+        return _out_objects(resp, "outConfigs")
+
+    async def _async_batch_method(
+        self,
+        method: str,
+        attrs: dict[str, str],
+        body: str,
+        wanted: Mapping[str, frozenset[str] | None] | None,
+    ) -> ElementTree.Element | ObjectExtractor | None:
+        """Run a batch method, or return None if the firmware does not know it.
+
+        The method is marked unsupported, for the life of the client, when
+        the IMC answers its first call with any errorCode or a later call
+        with the unknown method error. Every other error is raised, as are
+        connection and HTTP errors.
+        """
+        try:
+            resp = await self._async_method(method, attrs, body, wanted)
+        except ImcApiMethodError as ex:
+            if (
+                method in self._supported_methods
+                and ex.error_code != UNKNOWN_METHOD_ERROR_CODE
+            ):
+                raise
+            _LOGGER.debug(f"{self.host} does not support {method}: {ex}")
+            self._unsupported_methods.add(method)
+            return None
+        self._supported_methods.add(method)
+        return resp
+
+    async def async_resolve_dns(
+        self,
+        dns: list[str],
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> dict[str, ImcObject]:
+        """Return the managed objects at each of dns, keyed by dn.
+
+        A single configResolveDns is tried first. Firmware that does not
+        implement it gets the equivalent configResolveDn calls issued
+        concurrently over the same keep-alive session instead.
+        """
+        if not dns:
+            return {}
+        if "configResolveDns" not in self._unsupported_methods:
+            body = "".join(self._build("dn", {"value": dn}) for dn in dns)
+            resp = await self._async_batch_method(
+                "configResolveDns",
+                {"inHierarchical": str(hierarchical).lower()},
+                f"<inDns>{body}</inDns>",
+                wanted,
+            )
+            if resp is not None:
+                return {mo.dn: mo for mo in _out_objects(resp, "outConfigs")}
+        results = await asyncio.gather(
+            *(self.async_resolve_dn(dn, hierarchical, wanted) for dn in dns)
+        )
+        return {dn: mo for dn, mo in zip(dns, results) if mo is not None}
+
+    async def async_resolve_classes(
+        self,
+        class_ids: list[str],
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> dict[str, list[ImcObject]]:
+        """Return every managed object of each of class_ids, keyed by class."""
+        if not class_ids:
+            return {}
+        if "configResolveClasses" not in self._unsupported_methods:
+            body = "".join(self._build("Id", {"value": class_id}) for class_id in class_ids)
+            resp = await self._async_batch_method(
+                "configResolveClasses",
+                {"inHierarchical": str(hierarchical).lower()},
+                f"<inIds>{body}</inIds>",
+                wanted,
+            )
+            if resp is not None:
+                results: dict[str, list[ImcObject]] = {
+                    class_id: [] for class_id in class_ids
+                }
+                for mo in _out_objects(resp, "outConfigs"):
+                    results.setdefault(mo.class_id, []).append(mo)
+                return results
+        results = await asyncio.gather(
+            *(
+                self.async_resolve_class(class_id, hierarchical, wanted)
+                for class_id in class_ids
+            )
+        )
+        return dict(zip(class_ids, results))
+
+    async def async_conf_mo(
+        self, dn: str, class_id: str, attributes: dict[str, str]
+    ) -> ImcObject | None:
+        """Change the given attributes of the managed object at dn."""
+        mo = self._build(class_id, {"dn": dn, **attributes})
+        resp = await self._async_method(
+            "configConfMo",
+            {"dn": dn, "inHierarchical": "false"},
+            f"<inConfig>{mo}</inConfig>",
+        )
+        objects = _out_objects(resp, "outConfig")
+        return objects[0] if objects else None
+
+    async def async_keep_session(self) -> None:
+        """Refresh the session if it is due, without sending any other request."""
+        if self._cookie is None or time.monotonic() >= self._refresh_at:
+            await self._async_ensure_session()
+
+    async def async_events(self) -> AsyncIterator[ImcObject]:
+        """Subscribe to the event channel and yield each changed object.
+
+        The IMC streams each event as a line holding its length followed
+        by that many bytes of XML. The generator only ends by raising,
+        when the channel closes or fails.
+        """
+        await self.async_keep_session()
+        payload = self._build("eventSubscribe", {"cookie": self._cookie})
+        try:
+            async with self._session.post(
+                self._url,
+                data=payload.encode(),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=aiohttp.ClientTimeout(total=None, connect=self._timeout.total),
+                ssl=False,
+            ) as resp:
+                if resp.status != 200:
+                    raise ImcApiError(
+                        f"{self.host} returned HTTP {resp.status}", str(resp.status)
+                    )
+                while True:
+                    line = await resp.content.readline()
+                    if not line:
+                        raise ImcApiConnectionError(f"{self.host} closed the event channel")
+                    if not line.strip():
+                        continue
+                    root = ElementTree.fromstring(
+                        await resp.content.readexactly(int(line))
+                    )
+                    if "errorCode" in root.attrib:
+                        raise ImcApiError(
+                            root.attrib.get("errorDescr", "eventSubscribe failed"),
+                            root.attrib["errorCode"],
+                        )
+                    for mo in _event_objects(root):
+                        yield mo
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+        ) as ex:
+            raise ImcApiConnectionError(
+                f"Event channel to {self.host} failed: {ex}"
+            ) from ex
+        except (ValueError, ElementTree.ParseError) as ex:
+            raise ImcApiError(f"Malformed event from {self.host}: {ex}") from ex
@@ -0,0 +1,95 @@
+"""The transports CiscoImcDataService can read an IMC through."""
+from __future__ import annotations
+
+import logging
+from typing import Mapping, Protocol
+
+from .api import HostRequestLimiter, ImcApiConnectionError, ImcApiError, ImcObject
+from .const import BACKEND_REDFISH, BACKEND_XML
+from .redfish import REDFISH_SERVICE_ROOT, CiscoImcRedfishApi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ImcBackend(Protocol):
+    """What the coordinator reads and changes an IMC through.
+
+    Every backend answers in XML API terms: managed objects with XML API
+    dns, class ids and snake_case attributes, filtered by the same wanted
+    mapping ObjectExtractor takes. The coordinator, its indexes and the
+    entities therefore do not depend on the transport. Classes a backend
+    cannot read are left out of async_resolve_classes results.
+    """
+
+    host: str
+    limiter: HostRequestLimiter
+    # Whether async_events and async_keep_session are available for push
+    supports_events: bool
+
+    @property
+    def logged_in(self) -> bool:
+        """Return True while the backend holds usable credentials or a session."""
+
+    async def async_login(self) -> bool:
+        """Log in, raising ImcApiAuthError on rejected credentials."""
+
+    async def async_resume(self, cookie: str) -> bool:
+        """Take over a cached XML API session, or log in."""
+
+    async def async_logout(self) -> bool:
+        """Log out."""
+
+    async def async_keep_alive(self, timeout: float | None = None) -> bool:
+        """Make one cheap request that shows the IMC is up."""
+
+    async def async_resolve_dn(
+        self,
+        dn: str,
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> ImcObject | None:
+        """Return the managed object at dn."""
+
+    async def async_resolve_dns(
+        self,
+        dns: list[str],
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> dict[str, ImcObject]:
+        """Return the managed objects at each of dns, keyed by dn."""
+
+    async def async_resolve_classes(
+        self,
+        class_ids: list[str],
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> dict[str, list[ImcObject]]:
+        """Return every managed object of each of class_ids, keyed by class."""
+
+    async def async_conf_mo(
+        self, dn: str, class_id: str, attributes: dict[str, str]
+    ) -> ImcObject | None:
+        """Change attributes of the object at dn; return it if the IMC sends it back."""
+
+
+async def async_detect_backend(redfish: CiscoImcRedfishApi) -> str:
+    """Return the backend to use for an IMC set to auto.
+
+    Redfish is picked when its service root says it supports $select and
+    $expand, so a poll stays a couple of compact requests; anything else,
+    including no Redfish at all, keeps the XML API. ImcApiConnectionError
+    is raised when the IMC cannot be reached to tell.
+    """
+    try:
+        root = await redfish.async_get(REDFISH_SERVICE_ROOT)
+    except ImcApiConnectionError:
+        raise
+    except ImcApiError as ex:
+        _LOGGER.debug(f"{redfish.host} has no usable Redfish service: {ex}")
+        return BACKEND_XML
+    features = root.get("ProtocolFeaturesSupported") or {}
+    expand = features.get("ExpandQuery") or {}
+    if features.get("SelectQuery") and expand.get("Levels"):
+        _LOGGER.debug(f"{redfish.host} Redfish {root.get('RedfishVersion')} supports $select and $expand")
+        return BACKEND_REDFISH
+    return BACKEND_XML
@@ -0,0 +1,84 @@
+"""Retry backoff for IMCs that stop answering."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import BACKOFF_BASE, BACKOFF_JITTER, BACKOFF_MAX, PROBE_PORT, PROBE_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_probe(host: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    """Return True if host accepts a TCP connection on its HTTPS port.
+
+    host may carry an explicit port, as in 192.0.2.10:8443.
+    """
+    address, _, port = host.rpartition(":") if host.count(":") == 1 else (host, "", "")
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(address, int(port or PROBE_PORT)), timeout
+        )
+    except (OSError, asyncio.TimeoutError) as ex:
+        _LOGGER.debug(f"{host} probe failed: {ex}")
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+class ImcBackoff:
+    """Exponential retry delay for one IMC.
+
+    Each failure doubles the delay before the next attempt, up to
+    BACKOFF_MAX. The first success resets it.
+    """
+
+    __slots__ = ("failures", "delay", "_retry_at", "_next_retry")
+
+    def __init__(self) -> None:
+        """Initialize the backoff."""
+        self.failures = 0
+        self.delay = 0.0
+        self._retry_at = 0.0
+        self._next_retry = None
+
+    def ready(self) -> bool:
+        """Return True if an attempt may be made now."""
+        return time.monotonic() >= self._retry_at
+
+    def record_failure(self) -> None:
+        """Push the next attempt further out."""
+        self.failures += 1
+        self.delay = min(
+            BACKOFF_BASE
+            * 2 ** min(self.failures - 1, 16)
+            * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER),
+            BACKOFF_MAX,
+        )
+        self._retry_at = time.monotonic() + self.delay
+        self._next_retry = dt_util.utcnow() + timedelta(seconds=self.delay)
+
+    def record_success(self) -> None:
+        """Return to the normal cadence."""
+        self.failures = 0
+        self.delay = 0.0
+        self._retry_at = 0.0
+        self._next_retry = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the backoff state for entity attributes."""
+        return {
+            "unreachable_counter": self.failures,
+            "retry_delay": round(self.delay),
+            "next_retry": self._next_retry.isoformat() if self._next_retry else None,
+        }
@@ -1,10 +1,24 @@
 """Binary sensor platform for CiscoImc."""
 import logging
-from homeassistant.components.binary_sensor import DEVICE_CLASSES, BinarySensorEntity
+from homeassistant.components.binary_sensor import (
+    DEVICE_CLASSES,
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
 from homeassistant.core import callback
 from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, NAME
+from .const import (
+    DOMAIN,
+    RACK_UNIT_DN,
+    INVENTORY_CLASSES,
+    INVENTORY_ATTRIBUTES,
+    INVENTORY_OK,
+    INVENTORY_UNKNOWN,
+    SIGNAL_INVENTORY_CHANGED,
+)
 from .imc_device import CiscoImcDevice
 from .models import CiscoImcBinarySensorEntityDescription
 
@@ -19,7 +33,65 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     for device_key in entry_data["devices"]["binary_sensor"].keys():
         device_class = entry_data["devices"]["binary_sensor"][device_key]
         entities.append(CiscoImcBinarySensor(hass, config_entry, device_class, coordinator))
-    async_add_entities(entities, True)
+    async_add_entities(entities)
+
+    imc = config_entry.data.get(CONF_IP_ADDRESS)[0]
+    unique_id_prefix = f"{DOMAIN}_{imc.lower().replace('.', '_')}_"
+    added = set()
+
+    @callback
+    def _async_inventory_changed():
+        """Add entities for new components and remove those of gone ones."""
+        if coordinator.inventory_dns is None:
+            return
+        async_add_entities(
+            [
+                CiscoImcComponentSensor(
+                    hass, config_entry, _component_description(mo), coordinator
+                )
+                for dn, mo in coordinator.inventory.items()
+                if dn not in added
+            ]
+        )
+        added.clear()
+        added.update(coordinator.inventory_dns)
+        # Also drops the entities of components gone while Home Assistant was down
+        registry = er.async_get(hass)
+        for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+            if (
+                entry.domain == "binary_sensor"
+                and entry.unique_id.startswith(f"{unique_id_prefix}{RACK_UNIT_DN}/")
+                and entry.unique_id[len(unique_id_prefix) :] not in coordinator.inventory_dns
+            ):
+                _LOGGER.debug(f"{imc} removing {entry.entity_id}, the component is gone")
+                registry.async_remove(entry.entity_id)
+
+    _async_inventory_changed()
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_INVENTORY_CHANGED.format(config_entry.entry_id),
+            _async_inventory_changed,
+        )
+    )
+
+
+def _component_description(mo):
+    """Return the description of the problem sensor of a component."""
+    template, icon = INVENTORY_CLASSES[mo.class_id]
+    try:
+        name = template.format(**mo.attributes)
+    except KeyError:
+        name = None
+    if not name or name.endswith((" ", "-")):
+        name = mo.dn.rsplit("/", 1)[-1]
+    return CiscoImcBinarySensorEntityDescription(
+        key=mo.dn,
+        name=name,
+        icon=icon,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        property_key=mo.class_id,
+    )
 
 
 class CiscoImcBinarySensor(CiscoImcDevice, BinarySensorEntity):
@@ -32,9 +104,6 @@ class CiscoImcBinarySensor(CiscoImcDevice, BinarySensorEntity):
         self.entity_description = entity_description
         self.imc = config_entry.data.get(CONF_IP_ADDRESS)[0]
         self.coordinator = coordinator
-        self._attr_name = f"{NAME} {self.imc} {self.entity_description.name}"
-        if self.hass.custom_attributes[self.imc]['usr_lbl']:
-            self._attr_name = f"{self.hass.custom_attributes[self.imc]['usr_lbl']} {self.entity_description.name}"        
         self._attributes = {}
         
         super().__init__(self, hass, self.imc, entity_description, coordinator)
@@ -58,7 +127,12 @@ class CiscoImcBinarySensor(CiscoImcDevice, BinarySensorEntity):
     @property
     def is_on(self):
         """Return the state of the binary sensor."""
-        return self.coordinator.sensor_state(self.entity_description.key)
+        return self.coordinator.reachable
+
+    @property
+    def extra_state_attributes(self):
+        """Return the retry backoff of the IMC."""
+        return {**super().extra_state_attributes, **self.coordinator.backoff.as_dict()}
         
     @property
     def available(self):
@@ -69,3 +143,47 @@ class CiscoImcBinarySensor(CiscoImcDevice, BinarySensorEntity):
         super().async_update_available()
         self._attr_extra_state_attributes["available"] = self._attr_available
 
+
+class CiscoImcComponentSensor(CiscoImcBinarySensor):
+    """Problem sensor of one PSU, fan, DIMM, disk or adapter of the rack unit.
+
+    The description key is the component dn, which is also its listener
+    context, so only the entity of a changed component is written.
+    """
+
+    @property
+    def _component(self):
+        return self.coordinator.inventory.get(self.entity_description.key)
+
+    @property
+    def is_on(self):
+        """Return True when the component reports a problem."""
+        if (component := self._component) is None:
+            return None
+        attributes = component.attributes
+        status = (attributes.get("operability") or attributes.get("health") or "").lower()
+        if status in INVENTORY_UNKNOWN:
+            return None
+        return status not in INVENTORY_OK
+
+    @property
+    def extra_state_attributes(self):
+        """Return the presence, operability and identity of the component."""
+        # Skip the backoff of the connectivity sensor
+        attributes = super(CiscoImcBinarySensor, self).extra_state_attributes
+        if (component := self._component) is None:
+            return attributes
+        return {
+            **attributes,
+            "dn": component.dn,
+            **{
+                key: component.attributes[key]
+                for key in INVENTORY_ATTRIBUTES
+                if key in component.attributes
+            },
+        }
+
+    @property
+    def available(self):
+        """Return True while the component is present and the IMC answers."""
+        return self.coordinator.last_update_success and self._component is not None
@@ -5,8 +5,6 @@ from typing import Any
 from collections import OrderedDict
 
 import voluptuous as vol
-from imcsdk_ecoen66.imchandle import ImcHandle
-from imcsdk_ecoen66.imcexception import ImcLoginError, ImcException
 
 from homeassistant import config_entries, core, exceptions
 from homeassistant.const import (
@@ -27,7 +25,21 @@ from .const import (
     MIN_SCAN_INTERVAL,
     DATA_LISTENER,
     RACK_UNIT_SENSORS,
+    CONF_MAX_CONCURRENT_POLLS,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    CONF_PUSH_UPDATES,
+    DEFAULT_PUSH_UPDATES,
+    CONF_BACKEND,
+    DEFAULT_BACKEND,
+    BACKENDS,
+    CONF_STATS_INTERVAL,
+    DEFAULT_STATS_INTERVAL,
+    MIN_STATS_INTERVAL,
+    RACK_UNIT_DN,
 )
+from .api import CiscoImcApi, ImcApiAuthError, ImcApiError
+from .session import async_get_session_cache
+from .http import async_get_client_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -66,7 +78,7 @@ class CiscoImcConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_abort(reason="already_configured")
 
             try:
-                info = await validate_input(self.hass, user_input)
+                info, client = await validate_input(self.hass, user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -74,12 +86,22 @@ class CiscoImcConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if not errors:
                 if existing_entry:
+                    # The reloaded entry opens its own session
+                    await _async_logout(client)
                     self.hass.config_entries.async_update_entry(
                         existing_entry, data=info
                     )
                     await self.hass.config_entries.async_reload(existing_entry.entry_id)
                     return self.async_abort(reason="reauth_successful")
 
+                # Hand the open session to the new entry instead of logging out
+                sessions = await async_get_session_cache(self.hass)
+                sessions.async_update(
+                    user_input[CONF_IP_ADDRESS],
+                    user_input[CONF_USERNAME],
+                    client.cookie,
+                    client.refresh_period,
+                )
                 self.imc = user_input[CONF_IP_ADDRESS]
                 return self.async_create_entry(title=self.imc, data=info)
 
@@ -144,6 +166,30 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                vol.Optional(
+                    CONF_STATS_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL
+                    ),
+                ): vol.All(cv.positive_int, vol.Clamp(min=MIN_STATS_INTERVAL)),
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_POLLS,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS
+                    ),
+                ): vol.All(cv.positive_int, vol.Clamp(min=1)),
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=self.config_entry.options.get(
+                        CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_BACKEND,
+                    default=self.config_entry.options.get(
+                        CONF_BACKEND, DEFAULT_BACKEND
+                    ),
+                ): vol.In(BACKENDS),
             }
         )
         return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -153,51 +199,54 @@ async def validate_input(hass: core.HomeAssistant, data):
     """Validate the user input allows us to connect.
 
     Data has the keys from DATA_SCHEMA with values provided by the user.
+    Returns the entry data and the client, still logged in; the caller
+    hands its session on or logs it out.
     """
 
     config = {}
 
-    client = ImcHandle(
+    client = CiscoImcApi(
+        async_get_client_session(hass),
         data[CONF_IP_ADDRESS],
         data[CONF_USERNAME],
         data[CONF_PASSWORD],
         secure=True,
-        auto_refresh=True,
-        force=True,
-        timeout=60
+        timeout=60,
     )
-    _LOGGER.debug("Parms passed to client in config flow: %s %s %s",data[CONF_IP_ADDRESS],data[CONF_USERNAME],data[CONF_PASSWORD])
-
-    def system_info():
-        response = client.login()
-        _LOGGER.debug(f"Login in system_info = {response}")
-        """Get system information from CiscoImc."""
-        rack_unit = client.query_dn("sys/rack-unit-1")
-        for key, value in rack_unit.__dict__.items():
-            if key in RACK_UNIT_SENSORS:
-                _LOGGER.debug(f"{key}: {value}")
-    
-    def system_logout():
-        response = client.logout()    
-        _LOGGER.debug(f"Logout in system_logout = {response}")
+    _LOGGER.debug("Parms passed to client in config flow: %s %s",data[CONF_IP_ADDRESS],data[CONF_USERNAME])
 
     try:
-        await hass.async_add_executor_job(system_info)
+        response = await client.async_login()
+        _LOGGER.debug(f"Login in validate_input = {response}")
+        rack_unit = await client.async_resolve_dn(RACK_UNIT_DN)
+        if rack_unit is None:
+            raise ImcApiError(f"{RACK_UNIT_DN} not found")
+        for key, value in rack_unit.attributes.items():
+            if key in RACK_UNIT_SENSORS:
+                _LOGGER.debug(f"{key}: {value}")
         config[CONF_IP_ADDRESS] = data[CONF_IP_ADDRESS],
         config[CONF_USERNAME] = data[CONF_USERNAME],
         config[CONF_PASSWORD] = data[CONF_PASSWORD]
 
-    except ImcLoginError as ex:
-        _LOGGER.error("Authentication error: %s %s", ex.description, ex)
+    except ImcApiAuthError as ex:
+        _LOGGER.error("Authentication error: %s", ex)
         raise InvalidAuth() from ex
-    except ImcException as ex:
+    except ImcApiError as ex:
         _LOGGER.error("Unable to communicate with Cisco IMC API: %s", ex)
+        await _async_logout(client)
         raise CannotConnect() from ex
-    finally:
-        await hass.async_add_executor_job(system_logout)
     _LOGGER.debug("Credentials successfully connected to the Cisco IMC API")
+    return config, client
 
-    return config
+
+async def _async_logout(client: CiscoImcApi) -> None:
+    """Log out a session the flow opened, as IMCs only allow a few."""
+    if client.cookie is None:
+        return
+    try:
+        await client.async_logout()
+    except ImcApiError as ex:
+        _LOGGER.debug(f"Logout failed: {ex}")
 
 
 class CannotConnect(exceptions.HomeAssistantError):
@@ -3,9 +3,17 @@ from enum import Enum
 from datetime import timedelta
 import logging
 
-from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.switch import SwitchDeviceClass
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 
 from .models import (
     CiscoImcBinarySensorEntityDescription,
@@ -46,6 +54,74 @@ ICONS = {
 DEFAULT_SCAN_INTERVAL = 660
 MIN_SCAN_INTERVAL = 60
 
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+CONF_MAX_CONCURRENT_POLLS = "max_concurrent_polls"
+DEFAULT_MAX_CONCURRENT_POLLS = 8
+# Share of the scan interval a poll may randomly be pushed back by
+POLL_JITTER = 0.05
+
+# Push mode: changes arrive over the event channel and polling drops to a
+# slow consistency sweep.
+CONF_PUSH_UPDATES = "push_updates"
+DEFAULT_PUSH_UPDATES = False
+PUSH_SWEEP_INTERVAL = 1800
+EVENT_RECONNECT_MIN = 5
+EVENT_RECONNECT_MAX = 300
+
+# Transport the rack unit, components and telemetry are read through. auto
+# picks Redfish when the IMC's Redfish service supports $select and $expand.
+# Faults and push updates are only available over the XML API.
+CONF_BACKEND = "backend"
+BACKEND_XML = "xml"
+BACKEND_REDFISH = "redfish"
+BACKEND_AUTO = "auto"
+BACKENDS = [BACKEND_XML, BACKEND_REDFISH, BACKEND_AUTO]
+DEFAULT_BACKEND = BACKEND_XML
+
+# Unreachable IMCs are retried after BACKOFF_BASE seconds, doubling per
+# failure up to BACKOFF_MAX, and only after a TCP probe of PROBE_PORT.
+BACKOFF_BASE = 60
+BACKOFF_MAX = 3600
+BACKOFF_JITTER = 0.1
+PROBE_PORT = 443
+PROBE_TIMEOUT = 5
+
+# Liveness is checked every KEEPALIVE_INTERVAL seconds with an aaaKeepAlive
+# on the current session, or a TCP probe without one, independently of the
+# polls. Polls are skipped while the IMC is known to be down.
+KEEPALIVE_INTERVAL = 30
+KEEPALIVE_TIMEOUT = 10
+
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+SESSION_STORE_KEY = f"{DOMAIN}.sessions"
+SESSION_STORE_VERSION = 1
+SESSION_SAVE_DELAY = 10
+
+# Poll timing: phases timed per IMC, histogram bucket upper bounds in
+# seconds and how many recent samples percentiles are taken over.
+DATA_CLIENT_SESSION = f"{DOMAIN}_client_session"
+TIMING_PHASES = (
+    "poll",
+    "queue_wait",
+    "host_wait",
+    "connect",
+    "request",
+    "parse",
+    "dispatch",
+    "login",
+    "refresh",
+)
+# Phases of each request, recorded only for the requests of a poll
+TIMING_REQUEST_PHASES = frozenset({"host_wait", "connect", "request", "parse"})
+TIMING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TIMING_SAMPLES = 100
+
+# Last good rack unit snapshot of each IMC, restored at startup
+DATA_SNAPSHOTS = f"{DOMAIN}_snapshots"
+SNAPSHOT_STORE_KEY = f"{DOMAIN}.snapshots"
+SNAPSHOT_STORE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+
 SIGNAL_STATE_UPDATED = f"{DOMAIN}.updated"
 
 # Platforms
@@ -54,6 +130,9 @@ PLATFORMS = ["binary_sensor", "sensor", "switch"]
 # Configuration and options
 CONF_NAME = "name"
 
+RACK_UNIT_DN = "sys/rack-unit-1"
+RACK_UNIT_CLASS = "computeRackUnit"
+
 RACK_UNIT_SENSORS = [
     "model",
     "serial",
@@ -68,9 +147,86 @@ RACK_UNIT_SENSORS = [
     "oper_power"
 ]
 
+# Refresh tiers: fast attributes are read every poll, static inventory at
+# startup, every STATIC_REFRESH_INTERVAL seconds and on demand.
+TIER_FAST = "fast"
+TIER_STATIC = "static"
+STATIC_REFRESH_INTERVAL = 86400
+# Telemetry is its own tier, read on a separate schedule every
+# stats_interval seconds with one batched class query.
+TIER_STATS = "stats"
+CONF_STATS_INTERVAL = "stats_interval"
+DEFAULT_STATS_INTERVAL = 60
+MIN_STATS_INTERVAL = 30
+
+# Rack unit attributes read every poll; the rest only in the static tier
+RACK_UNIT_FAST_SENSORS = [
+    "asset_tag",
+    "usr_lbl",
+    "cimc_reset_reason",
+    "oper_power",
+]
+RACK_UNIT_STATIC_SENSORS = [
+    key for key in RACK_UNIT_SENSORS if key not in RACK_UNIT_FAST_SENSORS
+]
+
+# Hardware components indexed from the hierarchical rack unit query. Each
+# present one gets a problem binary sensor named from its template; when a
+# template attribute is missing the relative name (rn) is used instead.
+INVENTORY_CLASSES = {
+    "equipmentPsu": ("PSU {id}", "mdi:power-plug-outline"),
+    "equipmentFan": ("Fan {module}-{id}", "mdi:fan"),
+    "memoryUnit": ("{location}", "mdi:memory"),
+    "storageLocalDisk": ("Disk {id}", "mdi:harddisk"),
+    "adaptorUnit": ("Adapter {id}", "mdi:expansion-card-variant"),
+}
+INVENTORY_ATTRIBUTES = [
+    "id",
+    "module",
+    "location",
+    "presence",
+    "operability",
+    "health",
+    "model",
+    "serial",
+]
+# presence values of empty slots, and operability (or health, for disks)
+# values that are fine or that say nothing
+INVENTORY_ABSENT = ("missing", "not-present", "absent", "empty")
+INVENTORY_OK = ("operable", "good")
+INVENTORY_UNKNOWN = ("", "n/a", "unknown")
+SIGNAL_INVENTORY_CHANGED = f"{DOMAIN}_inventory_changed_{{}}"
+SIGNAL_STATS_CHANGED = f"{DOMAIN}_stats_changed_{{}}"
+
+# Active faults are tracked by dn from the faultInst class. Faults raised
+# or cleared while tracking fire these events; sensors count the active
+# faults of each severity and list up to FAULT_ATTRIBUTE_LIMIT of them.
+FAULT_CLASS = "faultInst"
+FAULT_ATTRIBUTES = ["code", "severity", "descr", "affected_dn", "created", "ack"]
+FAULT_CLEARED = "cleared"
+FAULT_ATTRIBUTE_LIMIT = 20
+EVENT_FAULT_RAISED = f"{DOMAIN}_fault_raised"
+EVENT_FAULT_CLEARED = f"{DOMAIN}_fault_cleared"
+
+# The System Event Log is only available over Redfish. It is read every
+# SEL_INTERVAL seconds, SEL_PAGE_SIZE entries per request and at most
+# SEL_MAX_PAGES requests per read; every new entry fires EVENT_SEL_ENTRY.
+# The highest record id read from each IMC is saved across restarts.
+REDFISH_SEL_ENTRIES = "/redfish/v1/Managers/CIMC/LogServices/SEL/Entries"
+SEL_INTERVAL = 300
+SEL_PAGE_SIZE = 50
+SEL_MAX_PAGES = 20
+SEL_RECENT_ENTRIES = 200
+EVENT_SEL_ENTRY = f"{DOMAIN}_sel_entry"
+DATA_SEL = f"{DOMAIN}_sel"
+SEL_STORE_KEY = f"{DOMAIN}.sel"
+SEL_STORE_VERSION = 1
+SEL_SAVE_DELAY = 10
+
 STATIC_SENSOR = "ip_address"
 SWITCH = "polling_switch"
 BINARY_SENSOR = "reachable"
+SUPPRESSED_WRITES_SENSOR = "suppressed_writes"
 
 POLLING_ICON = "mdi:sync"
 
@@ -84,6 +240,27 @@ SERVICE_ENTITY_ID = "entity_id"
 SERVICE_ENTRY_ID = "config_entry_id"
 SERVICE_DATA = "data"
 SERVICE_SET_ADMIN_POWER = "set_admin_power"
+SERVICE_REFRESH_INVENTORY = "refresh_inventory"
+SERVICE_MAX_PARALLEL = "max_parallel"
+SERVICE_BATCH_SIZE = "batch_size"
+SERVICE_BATCH_DELAY = "batch_delay"
+
+# Bulk admin power: IMCs changed at once, and the states that are staggered
+# in batches when a batch size is given, to spread out the inrush current.
+DEFAULT_POWER_PARALLEL = 8
+DEFAULT_BATCH_DELAY = 30
+POWER_ON_STATES = ("up",)
+
+# After an admin power change the IMC is re-read every POWER_CONFIRM_INTERVAL
+# seconds until oper_power reaches the state the change leads to.
+SERVICE_CONFIRM_TIMEOUT = "confirm_timeout"
+POWER_CONFIRM_INTERVAL = 5
+DEFAULT_POWER_CONFIRM_TIMEOUT = 300
+POWER_STATE_TARGETS = {
+    "up": "on",
+    "down": "off",
+    "soft-shut-down": "off",
+}
 
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
@@ -172,3 +349,131 @@ SWITCH_TYPE = CiscoImcSwitchEntityDescription(
     icon="mdi:sync",
     device_class=SwitchDeviceClass.SWITCH
 )
+
+# Performance sensors, disabled by default; property_key is the timed phase
+TIMING_SENSOR_TYPES = [
+    CiscoImcSensorEntityDescription(
+        key=f"{phase}_time",
+        name=name,
+        icon="mdi:timer-outline",
+        property_key=phase,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+    for phase, name in (
+        ("poll", "Poll Time"),
+        ("queue_wait", "Poll Queue Wait"),
+        ("request", "Request Time"),
+    )
+]
+
+# Entity writes skipped because nothing the entity shows changed
+SUPPRESSED_WRITES_SENSOR_TYPE = CiscoImcSensorEntityDescription(
+    key=SUPPRESSED_WRITES_SENSOR,
+    name="Suppressed Writes",
+    icon="mdi:pencil-off-outline",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+)
+
+# Telemetry sensors, one per object of class_id found; property_key is the
+# attribute read. {id} in the key and name is the number of the parent
+# object, for stats kept per CPU.
+STATS_SENSOR_TYPES = [
+    CiscoImcSensorEntityDescription(
+        key=key,
+        name=name,
+        icon=icon,
+        class_id=class_id,
+        property_key=property_key,
+        device_class=device_class,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=unit,
+    )
+    for key, name, icon, class_id, property_key, device_class, unit in (
+        (
+            "ambient_temp",
+            "Ambient Temperature",
+            "mdi:thermometer",
+            "computeRackUnitMbTempStats",
+            "ambient_temp",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+        ),
+        (
+            "front_temp",
+            "Inlet Temperature",
+            "mdi:thermometer",
+            "computeRackUnitMbTempStats",
+            "front_temp",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+        ),
+        (
+            "rear_temp",
+            "Exhaust Temperature",
+            "mdi:thermometer",
+            "computeRackUnitMbTempStats",
+            "rear_temp",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+        ),
+        (
+            "cpu{id}_temperature",
+            "CPU {id} Temperature",
+            "mdi:thermometer",
+            "processorEnvStats",
+            "temperature",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+        ),
+        (
+            "consumed_power",
+            "Power Consumption",
+            "mdi:flash",
+            "computeMbPowerStats",
+            "consumed_power",
+            SensorDeviceClass.POWER,
+            UnitOfPower.WATT,
+        ),
+        (
+            "input_voltage",
+            "Input Voltage",
+            "mdi:sine-wave",
+            "computeMbPowerStats",
+            "input_voltage",
+            SensorDeviceClass.VOLTAGE,
+            UnitOfElectricPotential.VOLT,
+        ),
+        (
+            "input_current",
+            "Input Current",
+            "mdi:current-ac",
+            "computeMbPowerStats",
+            "input_current",
+            SensorDeviceClass.CURRENT,
+            UnitOfElectricCurrent.AMPERE,
+        ),
+    )
+]
+
+FAULT_SENSOR_TYPES = [
+    CiscoImcSensorEntityDescription(
+        key=f"{severity}_faults",
+        name=f"{severity.capitalize()} Faults",
+        icon=icon,
+        property_key=severity,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+    for severity, icon in (
+        ("critical", "mdi:alert-octagon"),
+        ("major", "mdi:alert"),
+        ("minor", "mdi:alert-outline"),
+        ("warning", "mdi:alert-circle-outline"),
+        ("info", "mdi:information-outline"),
+    )
+]
@@ -0,0 +1,58 @@
+"""Diagnostics support for CiscoImc."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {
+    CONF_IP_ADDRESS,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    "title",
+    "serial",
+    "uuid",
+    "asset_tag",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    events = coordinator.events
+    return {
+        "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "data": async_redact_data(
+            coordinator.data.as_dict() if coordinator.data else {}, TO_REDACT
+        ),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "reachable": coordinator.reachable,
+            "alive": coordinator.alive,
+            "backend": coordinator.backend,
+            "polling": coordinator.polling,
+            "poll_interval": coordinator.poll_interval,
+            "suppressed_writes": coordinator.suppressed_writes,
+            "backoff": coordinator.backoff.as_dict(),
+            "requests": coordinator.client.limiter.as_dict(),
+            "push": None
+            if events is None
+            else {"connected": events.connected, "events_received": events.events_received},
+        },
+        "inventory": {
+            dn: async_redact_data(mo.attributes, TO_REDACT)
+            for dn, mo in coordinator.inventory.items()
+        },
+        "stats": coordinator.stats,
+        "faults": coordinator.faults.as_dict(),
+        "sel": coordinator.sel.as_dict(),
+        "timings": coordinator.timings.as_dict(),
+        "scheduler": coordinator.scheduler.stats,
+    }
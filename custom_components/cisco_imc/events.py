@@ -0,0 +1,85 @@
+"""Push updates from the IMC event channel."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import ImcApiError
+from .const import DOMAIN, EVENT_RECONNECT_MAX, EVENT_RECONNECT_MIN
+
+if TYPE_CHECKING:
+    from . import CiscoImcDataService
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CiscoImcEventListener:
+    """Hold an eventSubscribe channel open and feed it to the coordinator."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: CiscoImcDataService) -> None:
+        """Initialize the listener."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.connected = False
+        self.events_received = 0
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Open the event channel in the background."""
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} events {self.coordinator.imc}"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Close the event channel."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    async def _async_run(self) -> None:
+        """Reconnect with a growing delay whenever the channel drops."""
+        client = self.coordinator.client
+        delay = EVENT_RECONNECT_MIN
+        while True:
+            keep_session = self.hass.async_create_background_task(
+                self._async_keep_session(), f"{DOMAIN} event session {self.coordinator.imc}"
+            )
+            try:
+                async for mo in client.async_events():
+                    if not self.connected:
+                        _LOGGER.debug(f"{self.coordinator.imc} event channel open")
+                        self.connected = True
+                        delay = EVENT_RECONNECT_MIN
+                    self.events_received += 1
+                    self.coordinator.async_apply_mo_change(mo)
+            except ImcApiError as ex:
+                _LOGGER.debug(
+                    f"{self.coordinator.imc} event channel lost, retrying in {delay}s: {ex}"
+                )
+            except Exception:  # pylint: disable=broad-except
+                # Anything else, a bad event included, must not end push updates
+                _LOGGER.exception(
+                    f"{self.coordinator.imc} event channel failed, retrying in {delay}s"
+                )
+            finally:
+                keep_session.cancel()
+                self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, EVENT_RECONNECT_MAX)
+
+    async def _async_keep_session(self) -> None:
+        """Refresh the session the channel rides on between slow sweeps."""
+        client = self.coordinator.client
+        while True:
+            await asyncio.sleep(max(client.refresh_period // 2, EVENT_RECONNECT_MIN))
+            try:
+                await client.async_keep_session()
+            except ImcApiError as ex:
+                _LOGGER.debug(f"{self.coordinator.imc} event session refresh failed: {ex}")
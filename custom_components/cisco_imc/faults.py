@@ -0,0 +1,127 @@
+"""Active fault tracking for one IMC."""
+from __future__ import annotations
+
+from collections import Counter
+import logging
+from typing import Any, Iterable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import ImcObject
+from .const import (
+    EVENT_FAULT_CLEARED,
+    EVENT_FAULT_RAISED,
+    FAULT_ATTRIBUTES,
+    FAULT_CLEARED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CiscoImcFaultTracker:
+    """The active faultInst objects of one IMC, keyed by dn.
+
+    Each poll's fault list and each fault event is compared with the index
+    and only additions, clears and severity changes are applied. New and
+    cleared faults fire EVENT_FAULT_RAISED and EVENT_FAULT_CLEARED. The
+    faults already active when tracking starts are taken as they are,
+    without events, so restarts do not raise them again.
+    """
+
+    def __init__(self, hass: HomeAssistant, imc: str) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.imc = imc
+        self.faults: dict[str, dict[str, str | None]] = {}
+        self.counts: Counter[str] = Counter()
+        # Bumped on every change, so listeners can tell when to update
+        self.revision = 0
+        self.synced = False
+
+    @callback
+    def async_update(self, objects: Iterable[ImcObject]) -> None:
+        """Apply the difference between the index and a full fault list."""
+        current = {}
+        for mo in objects:
+            if mo.attributes.get("severity") != FAULT_CLEARED:
+                current[mo.dn] = mo
+        for dn in [dn for dn in self.faults if dn not in current]:
+            self._async_clear(dn)
+        for dn, mo in current.items():
+            self._async_set(mo)
+        if not self.synced:
+            self.synced = True
+            self.revision += 1
+            _LOGGER.debug(f"{self.imc} tracking {len(self.faults)} active faults")
+
+    @callback
+    def async_apply_change(self, mo: ImcObject) -> None:
+        """Apply a faultInst from the event channel, which may be partial."""
+        if not self.synced:
+            return
+        if (
+            mo.attributes.get("status") == "deleted"
+            or mo.attributes.get("severity") == FAULT_CLEARED
+        ):
+            self._async_clear(mo.dn)
+        elif mo.dn in self.faults:
+            self._async_set(mo, self.faults[mo.dn])
+        else:
+            self._async_set(mo)
+
+    def _async_set(
+        self, mo: ImcObject, previous: dict[str, str | None] | None = None
+    ) -> None:
+        """Add a fault or update its severity and acknowledgement."""
+        fault = {
+            key: mo.attributes.get(key, previous.get(key) if previous else None)
+            for key in FAULT_ATTRIBUTES
+        }
+        known = self.faults.get(mo.dn)
+        if known == fault:
+            return
+        self.faults[mo.dn] = fault
+        self.revision += 1
+        if known is not None:
+            if known["severity"] != fault["severity"]:
+                _LOGGER.debug(
+                    f"{self.imc} fault {mo.dn} went from {known['severity']} to {fault['severity']}"
+                )
+                self.counts[known["severity"]] -= 1
+                self.counts[fault["severity"]] += 1
+            return
+        self.counts[fault["severity"]] += 1
+        if self.synced:
+            _LOGGER.debug(f"{self.imc} fault raised {mo.dn}: {fault['descr']}")
+            self._fire(EVENT_FAULT_RAISED, mo.dn, fault)
+
+    def _async_clear(self, dn: str) -> None:
+        """Drop a fault that was cleared or deleted."""
+        if (fault := self.faults.pop(dn, None)) is None:
+            return
+        self.revision += 1
+        self.counts[fault["severity"]] -= 1
+        _LOGGER.debug(f"{self.imc} fault cleared {dn}")
+        self._fire(EVENT_FAULT_CLEARED, dn, fault)
+
+    def _fire(self, event_type: str, dn: str, fault: dict[str, str | None]) -> None:
+        self.hass.bus.async_fire(event_type, {"imc": self.imc, "dn": dn, **fault})
+
+    def by_severity(self, severity: str) -> list[dict[str, Any]]:
+        """Return the active faults of a severity, oldest first."""
+        return sorted(
+            (
+                {"dn": dn, **fault}
+                for dn, fault in self.faults.items()
+                if fault["severity"] == severity
+            ),
+            key=lambda fault: fault["created"] or "",
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the index for diagnostics."""
+        return {
+            "synced": self.synced,
+            "counts": {severity: count for severity, count in self.counts.items() if count},
+            "faults": self.faults,
+        }
@@ -0,0 +1,45 @@
+"""HTTP session shared by the IMC clients."""
+from __future__ import annotations
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+
+from .api import MAX_REQUESTS_PER_HOST, connect_trace_config
+from .const import DATA_CLIENT_SESSION
+
+
+@callback
+def async_get_client_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the HTTP session shared by every IMC client.
+
+    It has its own connection pool rather than Home Assistant's shared one,
+    so IMCs that hang do not hold connections other integrations need, and
+    so new connections can be traced. Each IMC gets at most its request
+    limit plus the event channel in connections. The session outlives the
+    config entry that created it and is closed with
+    async_close_client_session or when Home Assistant closes.
+    """
+    if (session := hass.data.get(DATA_CLIENT_SESSION)) is None:
+        session = hass.data[DATA_CLIENT_SESSION] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=False,
+                limit=0,
+                limit_per_host=MAX_REQUESTS_PER_HOST + 1,
+                enable_cleanup_closed=True,
+            ),
+            trace_configs=[connect_trace_config()],
+        )
+
+        async def _async_close(_event):
+            await async_close_client_session(hass)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return session
+
+
+async def async_close_client_session(hass: HomeAssistant) -> None:
+    """Close the HTTP session shared by every IMC client and its connections."""
+    if (session := hass.data.pop(DATA_CLIENT_SESSION, None)) is not None:
+        await session.close()
@@ -7,7 +7,6 @@ from homeassistant.const import ATTR_BATTERY_CHARGING, ATTR_BATTERY_LEVEL
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
-from imcsdk_ecoen66.imchandle import ImcHandle
 from urllib.error import URLError
 
 from .const import DOMAIN, NAME
@@ -50,7 +49,9 @@ class CiscoImcDevice(CoordinatorEntity):
 
     def __init__(self, upstream_entity, hass, imc, entity_description, coordinator):
         """Initialise the Cisco IMC device."""
-        super().__init__(coordinator)
+        # The key is the listener context, so the coordinator only writes
+        # this entity when its attribute changes.
+        super().__init__(coordinator, context=entity_description.key)
         self.upstream_entity = upstream_entity
         self.hass = hass
         self.imc = imc
@@ -58,6 +59,11 @@ class CiscoImcDevice(CoordinatorEntity):
         self.coordinator = coordinator
         self.config_entry_id: Optional[str] = None
 
+    @property
+    def name(self):
+        """Return the name, following the user label once it is known."""
+        return f"{self.coordinator.label or f'{NAME} {self.imc}'} {self.entity_description.name}"
+
     @property
     def icon(self):
         """Return the icon of the sensor."""
@@ -66,17 +72,23 @@ class CiscoImcDevice(CoordinatorEntity):
     @property
     def extra_state_attributes(self):
         """Return the state attributes of the device."""
+        if self.coordinator.stale:
+            return {
+                **self._attributes,
+                "stale": True,
+                "last_seen": self.coordinator.stale_since.isoformat(),
+            }
         return self._attributes
 
     @property
     def device_info(self):
         """Return the device_info of the device."""
         my_name = f"{NAME} {self.imc}"
-        if self.hass.custom_attributes[self.imc]['usr_lbl']:
-            my_name = self.hass.custom_attributes[self.imc]['usr_lbl']
+        if self.coordinator.label:
+            my_name = self.coordinator.label
         return {
             "identifiers": {(DOMAIN, self.imc)},
             "name": my_name,
             "manufacturer": "Cisco",
-            "model": self.hass.custom_attributes[self.imc]['model'],
+            "model": self.coordinator.sensor_state("model"),
         }
@@ -0,0 +1,27 @@
+"""Describe Cisco IMC logbook events."""
+from __future__ import annotations
+
+from typing import Callable
+
+from homeassistant.components.logbook import LOGBOOK_ENTRY_MESSAGE, LOGBOOK_ENTRY_NAME
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, EVENT_SEL_ENTRY
+
+
+@callback
+def async_describe_events(
+    hass: HomeAssistant,
+    async_describe_event: Callable[[str, str, Callable[[Event], dict[str, str]]], None],
+) -> None:
+    """Describe the System Event Log entries read from each IMC."""
+
+    @callback
+    def async_describe_sel_entry(event: Event) -> dict[str, str]:
+        data = event.data
+        return {
+            LOGBOOK_ENTRY_NAME: f"Cisco IMC {data['imc']}",
+            LOGBOOK_ENTRY_MESSAGE: f"SEL {data.get('severity')}: {data.get('message')}",
+        }
+
+    async_describe_event(DOMAIN, EVENT_SEL_ENTRY, async_describe_sel_entry)
@@ -13,6 +13,7 @@ class CiscoImcSensorEntityDescription(SensorEntityDescription):
     """Sensor entity description for CiscoImc."""
 
     property_key: str | None = None
+    class_id: str | None = None
 
 @dataclass
 class CiscoImcBinarySensorEntityDescription(BinarySensorEntityDescription):
@@ -0,0 +1,508 @@
+"""Async client and backend for the Redfish API of a Cisco IMC.
+
+CiscoImcRedfishApi is a minimal JSON client, used on its own for what the
+XML API does not offer, such as the System Event Log. CiscoImcRedfishBackend
+reads the rack unit, its components and telemetry through it and answers in
+XML API terms, see backend.ImcBackend. Errors are raised as the XML API
+client's exceptions.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Callable, Iterable, Mapping
+
+import aiohttp
+
+from .api import (
+    DEFAULT_TIMEOUT,
+    HostRequestLimiter,
+    ImcApiAuthError,
+    ImcApiConnectionError,
+    ImcApiError,
+    ImcObject,
+)
+from .const import RACK_UNIT_CLASS, RACK_UNIT_DN
+
+_LOGGER = logging.getLogger(__name__)
+
+REDFISH_SYSTEMS = "/redfish/v1/Systems"
+REDFISH_CHASSIS = "/redfish/v1/Chassis"
+REDFISH_SERVICE_ROOT = "/redfish/v1/"
+
+# ComputerSystem properties the rack unit is built from
+SYSTEM_SELECT = "Model,SerialNumber,AssetTag,UUID,PowerState,ProcessorSummary,MemorySummary"
+
+# Classes read from the chassis Power and Thermal resources
+TEMP_STATS_CLASS = "computeRackUnitMbTempStats"
+POWER_STATS_CLASS = "computeMbPowerStats"
+CPU_STATS_CLASS = "processorEnvStats"
+CHASSIS_CLASSES = (
+    "equipmentPsu",
+    "equipmentFan",
+    "adaptorUnit",
+    TEMP_STATS_CLASS,
+    POWER_STATS_CLASS,
+    CPU_STATS_CLASS,
+)
+# ... and from the system's Memory and Storage collections
+SYSTEM_CLASSES = ("memoryUnit", "storageLocalDisk")
+
+# adminPower values and the ComputerSystem.Reset type doing the same
+RESET_TYPES = {
+    "up": "On",
+    "down": "ForceOff",
+    "soft-shut-down": "GracefulShutdown",
+    "cycle-immediate": "PowerCycle",
+    "hard-reset-immediate": "ForceRestart",
+}
+
+# Temperature PhysicalContext values and the board temperature they are
+TEMP_CONTEXTS = {"Room": "ambient_temp", "Intake": "front_temp", "Exhaust": "rear_temp"}
+
+_HEALTH_OPERABILITY = {"OK": "operable", "Warning": "degraded", "Critical": "inoperable"}
+_NUMBER_RE = re.compile(r"\d+")
+
+
+class CiscoImcRedfishApi:
+    """Talk to the Redfish service of one IMC over a shared aiohttp session."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        username: str,
+        password: str,
+        timeout: int = DEFAULT_TIMEOUT,
+        timing_listener: Callable[[str, float], None] | None = None,
+        limiter: HostRequestLimiter | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        timing_listener is called like the XML API client's, and limiter
+        is usually the XML API client's, so both count against one limit.
+        """
+        self.host = host
+        self._session = session
+        self._base_url = f"https://{host}"
+        self._auth = aiohttp.BasicAuth(username, password)
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._timing_listener = timing_listener
+        self.limiter = limiter or HostRequestLimiter()
+
+    async def async_get(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Return the resource at path."""
+        return await self._async_request("GET", path, params, None, timeout)
+
+    async def async_post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        """Post body to path, usually an action, and return any response body."""
+        return await self._async_request("POST", path, None, body, None)
+
+    async def _async_request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None,
+        body: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> dict[str, Any]:
+        async with self.limiter.async_slot() as wait:
+            if self._timing_listener is not None:
+                self._timing_listener("host_wait", wait)
+            return await self._async_request_now(method, path, params, body, timeout)
+
+    async def _async_request_now(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None,
+        body: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> dict[str, Any]:
+        """Make a request holding a request slot."""
+        started = time.perf_counter()
+        try:
+            async with self._session.request(
+                method,
+                f"{self._base_url}{path}",
+                params=params,
+                json=body,
+                auth=self._auth,
+                headers={"Accept": "application/json"},
+                timeout=self._timeout
+                if timeout is None
+                else aiohttp.ClientTimeout(total=timeout),
+                ssl=False,
+                trace_request_ctx=self._timing_listener,
+            ) as resp:
+                if resp.status == 401:
+                    raise ImcApiAuthError(f"{self.host} rejected the credentials", "401")
+                if resp.status not in (200, 202, 204):
+                    raise ImcApiError(
+                        f"{self.host} returned HTTP {resp.status} for {path}",
+                        str(resp.status),
+                    )
+                if resp.status == 204:
+                    return {}
+                return await resp.json(content_type=None) or {}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            raise ImcApiConnectionError(f"Unable to contact {self.host}: {ex}") from ex
+        except ValueError as ex:
+            raise ImcApiError(f"Malformed response from {self.host}: {ex}") from ex
+        finally:
+            if self._timing_listener is not None:
+                self._timing_listener("request", time.perf_counter() - started)
+
+    async def async_collection_page(
+        self, path: str, skip: int, top: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Return one page of a collection and the collection's size."""
+        collection = await self.async_get(path, {"$skip": skip, "$top": top})
+        members = collection.get("Members", [])
+        return members, collection.get("Members@odata.count", skip + len(members))
+
+
+def _number(text: Any, default: int) -> str:
+    """Return the first number in text, as a string, or default."""
+    match = _NUMBER_RE.search(str(text or ""))
+    return match.group() if match else str(default)
+
+
+def _numbers(text: Any) -> list[str]:
+    return _NUMBER_RE.findall(str(text or ""))
+
+
+def _strings(attributes: dict[str, Any]) -> dict[str, str]:
+    """Drop missing values and make the rest strings, like XML API attributes."""
+    return {key: str(value) for key, value in attributes.items() if value is not None}
+
+
+def _status(member: dict[str, Any]) -> dict[str, str]:
+    """Return presence and operability from a Redfish Status."""
+    status = member.get("Status") or {}
+    return {
+        "presence": "missing" if status.get("State") == "Absent" else "equipped",
+        "operability": _HEALTH_OPERABILITY.get(status.get("Health"), "unknown"),
+    }
+
+
+def _members(collection: Any) -> list[dict[str, Any]]:
+    """Return the expanded members of a collection, or none if it was not expanded."""
+    if not isinstance(collection, dict):
+        return []
+    return [member for member in collection.get("Members", []) if "Id" in member or "Name" in member]
+
+
+def rack_unit_attributes(system: dict[str, Any]) -> dict[str, str]:
+    """Return the computeRackUnit attributes a ComputerSystem holds."""
+    processors = system.get("ProcessorSummary") or {}
+    memory = system.get("MemorySummary") or {}
+    total_gib = memory.get("TotalSystemMemoryGiB")
+    return _strings(
+        {
+            "model": system.get("Model"),
+            "serial": system.get("SerialNumber"),
+            "asset_tag": system.get("AssetTag"),
+            "uuid": system.get("UUID"),
+            "num_of_cpus": processors.get("Count"),
+            "num_of_cores": processors.get("CoreCount"),
+            "num_of_threads": processors.get("LogicalProcessorCount"),
+            "total_memory": None if total_gib is None else round(total_gib * 1024),
+            "oper_power": (system.get("PowerState") or "").lower() or None,
+        }
+    )
+
+
+def system_objects(system: dict[str, Any]) -> Iterable[tuple[str, str, dict[str, str]]]:
+    """Yield (class, dn, attributes) of the DIMMs and disks of an expanded system."""
+    for index, dimm in enumerate(_members(system.get("Memory")), 1):
+        yield "memoryUnit", f"{RACK_UNIT_DN}/board/memarray-1/mem-{index}", _strings(
+            {
+                "id": index,
+                "location": dimm.get("DeviceLocator") or dimm.get("Id"),
+                "capacity": dimm.get("CapacityMiB"),
+                "model": dimm.get("PartNumber"),
+                "serial": dimm.get("SerialNumber"),
+                **_status(dimm),
+            }
+        )
+    for controller in _members(system.get("Storage")):
+        controller_rn = f"board/storage-SAS-{controller.get('Id')}"
+        for index, drive in enumerate(controller.get("Drives") or [], 1):
+            if "Id" not in drive:
+                continue
+            disk_id = _number(drive["Id"], index)
+            health = (drive.get("Status") or {}).get("Health")
+            yield "storageLocalDisk", f"{RACK_UNIT_DN}/{controller_rn}/pd-{disk_id}", _strings(
+                {
+                    "id": disk_id,
+                    "model": drive.get("Model"),
+                    "serial": drive.get("SerialNumber"),
+                    "health": "Good" if health == "OK" else health,
+                    **_status(drive),
+                }
+            )
+
+
+def chassis_objects(chassis: dict[str, Any]) -> Iterable[tuple[str, str, dict[str, str]]]:
+    """Yield (class, dn, attributes) of the PSUs, fans, adapters and stats of an expanded chassis."""
+    power = chassis.get("Power") or {}
+    thermal = chassis.get("Thermal") or {}
+    supplies = power.get("PowerSupplies") or []
+    for index, psu in enumerate(supplies, 1):
+        psu_id = _number(psu.get("Name") or psu.get("MemberId"), index)
+        yield "equipmentPsu", f"{RACK_UNIT_DN}/psu-{psu_id}", _strings(
+            {
+                "id": psu_id,
+                "model": psu.get("Model"),
+                "serial": psu.get("SerialNumber"),
+                **_status(psu),
+            }
+        )
+    for index, fan in enumerate(thermal.get("Fans") or [], 1):
+        # Named like FAN3_2: fan 2 of fan module 3
+        module, fan_id = (_numbers(fan.get("Name") or fan.get("MemberId")) + [str(index), "1"])[:2]
+        yield "equipmentFan", f"{RACK_UNIT_DN}/fan-module-1-{module}/fan-{fan_id}", _strings(
+            {
+                "id": fan_id,
+                "module": module,
+                "model": fan.get("Model"),
+                "serial": fan.get("SerialNumber"),
+                **_status(fan),
+            }
+        )
+    for index, adapter in enumerate(_members(chassis.get("NetworkAdapters")), 1):
+        yield "adaptorUnit", f"{RACK_UNIT_DN}/adaptor-{index}", _strings(
+            {
+                "id": index,
+                "model": adapter.get("Model"),
+                "serial": adapter.get("SerialNumber"),
+                **_status(adapter),
+            }
+        )
+    board = {}
+    for sensor in thermal.get("Temperatures") or []:
+        context = sensor.get("PhysicalContext")
+        if context == "CPU":
+            cpu = _number(sensor.get("Name"), 1)
+            yield CPU_STATS_CLASS, f"{RACK_UNIT_DN}/board/cpu-{cpu}/env-stats", _strings(
+                {"temperature": sensor.get("ReadingCelsius")}
+            )
+        elif context in TEMP_CONTEXTS:
+            board[TEMP_CONTEXTS[context]] = sensor.get("ReadingCelsius")
+    if board:
+        yield TEMP_STATS_CLASS, f"{RACK_UNIT_DN}/board/temp-stats", _strings(board)
+    control = (power.get("PowerControl") or [{}])[0]
+    if control or supplies:
+        yield POWER_STATS_CLASS, f"{RACK_UNIT_DN}/board/power-stats", _strings(
+            {
+                "consumed_power": control.get("PowerConsumedWatts"),
+                "input_voltage": next(
+                    (psu["LineInputVoltage"] for psu in supplies if psu.get("LineInputVoltage")),
+                    None,
+                ),
+            }
+        )
+
+
+def _keep(
+    class_id: str,
+    attributes: dict[str, str],
+    wanted: Mapping[str, frozenset[str] | None] | None,
+) -> dict[str, str] | None:
+    """Return the wanted attributes of an object, or None if its class is not wanted."""
+    if wanted is None:
+        return attributes
+    if class_id not in wanted:
+        return None
+    keys = wanted[class_id]
+    if keys is None:
+        return attributes
+    return {key: value for key, value in attributes.items() if key in keys}
+
+
+class CiscoImcRedfishBackend:
+    """Read an IMC over Redfish in XML API terms, see backend.ImcBackend.
+
+    The rack unit is one ComputerSystem request with $select. Its subtree
+    is the same request with Memory and Storage expanded, plus one Chassis
+    request with Power, Thermal and NetworkAdapters expanded; the stats
+    classes come from a Chassis request alone. There are no faults and
+    no event channel over Redfish, and no user label or reset reason.
+    """
+
+    supports_events = False
+
+    def __init__(self, api: CiscoImcRedfishApi) -> None:
+        """Initialize the backend."""
+        self._api = api
+        self.host = api.host
+        self.limiter = api.limiter
+        self._system: str | None = None
+        self._chassis: str | None = None
+
+    @property
+    def logged_in(self) -> bool:
+        """Return True once the system and chassis have been found."""
+        return self._system is not None
+
+    async def async_login(self) -> bool:
+        """Check the credentials and find the system and chassis resources."""
+        systems, chassis = await asyncio.gather(
+            self._api.async_get(REDFISH_SYSTEMS), self._api.async_get(REDFISH_CHASSIS)
+        )
+        try:
+            self._system = systems["Members"][0]["@odata.id"]
+            self._chassis = chassis["Members"][0]["@odata.id"]
+        except (KeyError, IndexError, TypeError) as ex:
+            raise ImcApiError(f"{self.host} lists no Redfish system or chassis") from ex
+        _LOGGER.debug(f"{self.host} Redfish system {self._system}, chassis {self._chassis}")
+        return True
+
+    async def async_resume(self, cookie: str) -> bool:
+        """Log in; XML API sessions mean nothing to Redfish."""
+        return await self.async_login()
+
+    async def async_logout(self) -> bool:
+        """Forget the resources; every request carries its own credentials."""
+        self._system = self._chassis = None
+        return True
+
+    async def async_keep_alive(self, timeout: float | None = None) -> bool:
+        """Read the service root."""
+        await self._api.async_get(REDFISH_SERVICE_ROOT, timeout=timeout)
+        return True
+
+    async def _async_ensure_login(self) -> None:
+        if self._system is None:
+            await self.async_login()
+
+    async def _async_system(self, expand: bool) -> dict[str, Any]:
+        params = {"$select": SYSTEM_SELECT}
+        if expand:
+            params = {"$select": f"{SYSTEM_SELECT},Memory,Storage", "$expand": ".($levels=3)"}
+        return await self._api.async_get(self._system, params)
+
+    async def _async_chassis(self, adapters: bool) -> dict[str, Any]:
+        select = "Power,Thermal,NetworkAdapters" if adapters else "Power,Thermal"
+        return await self._api.async_get(
+            self._chassis, {"$select": select, "$expand": ".($levels=2)"}
+        )
+
+    async def async_resolve_dn(
+        self,
+        dn: str,
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> ImcObject | None:
+        """Return the rack unit, with its components and stats if hierarchical.
+
+        Only the rack unit can be read over Redfish.
+        """
+        if dn != RACK_UNIT_DN:
+            return None
+        await self._async_ensure_login()
+        subtree = hierarchical and (
+            wanted is None or any(class_id != RACK_UNIT_CLASS for class_id in wanted)
+        )
+        if not subtree:
+            system = await self._async_system(False)
+            return ImcObject(
+                RACK_UNIT_CLASS,
+                dn,
+                _keep(RACK_UNIT_CLASS, rack_unit_attributes(system), wanted) or {},
+                [],
+            )
+        system, chassis = await asyncio.gather(
+            self._async_system(True), self._async_chassis(True)
+        )
+        children = [
+            ImcObject(class_id, child_dn, kept, [])
+            for class_id, child_dn, attributes in (
+                *system_objects(system),
+                *chassis_objects(chassis),
+            )
+            if (kept := _keep(class_id, attributes, wanted)) is not None
+        ]
+        return ImcObject(
+            RACK_UNIT_CLASS,
+            dn,
+            _keep(RACK_UNIT_CLASS, rack_unit_attributes(system), wanted) or {},
+            children,
+        )
+
+    async def async_resolve_dns(
+        self,
+        dns: list[str],
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> dict[str, ImcObject]:
+        """Return the managed objects at each of dns, keyed by dn."""
+        results = await asyncio.gather(
+            *(self.async_resolve_dn(dn, hierarchical, wanted) for dn in dns)
+        )
+        return {dn: mo for dn, mo in zip(dns, results) if mo is not None}
+
+    async def async_resolve_classes(
+        self,
+        class_ids: list[str],
+        hierarchical: bool = False,
+        wanted: Mapping[str, frozenset[str] | None] | None = None,
+    ) -> dict[str, list[ImcObject]]:
+        """Return the objects of each class Redfish has, in at most two requests.
+
+        Classes Redfish does not have, faultInst for one, are left out.
+        """
+        readable = [
+            class_id
+            for class_id in class_ids
+            if class_id == RACK_UNIT_CLASS
+            or class_id in CHASSIS_CLASSES
+            or class_id in SYSTEM_CLASSES
+        ]
+        if not readable:
+            return {}
+        await self._async_ensure_login()
+        requests = {}
+        if any(class_id in CHASSIS_CLASSES for class_id in readable):
+            requests["chassis"] = self._async_chassis("adaptorUnit" in readable)
+        if any(class_id not in CHASSIS_CLASSES for class_id in readable):
+            requests["system"] = self._async_system(
+                any(class_id in SYSTEM_CLASSES for class_id in readable)
+            )
+        responses = dict(zip(requests, await asyncio.gather(*requests.values())))
+        found = []
+        if (system := responses.get("system")) is not None:
+            found.append((RACK_UNIT_CLASS, RACK_UNIT_DN, rack_unit_attributes(system)))
+            found.extend(system_objects(system))
+        if (chassis := responses.get("chassis")) is not None:
+            found.extend(chassis_objects(chassis))
+        results: dict[str, list[ImcObject]] = {class_id: [] for class_id in readable}
+        for class_id, dn, attributes in found:
+            if class_id in results:
+                kept = _keep(class_id, attributes, wanted)
+                results[class_id].append(ImcObject(class_id, dn, kept or {}, []))
+        return results
+
+    async def async_conf_mo(
+        self, dn: str, class_id: str, attributes: dict[str, str]
+    ) -> ImcObject | None:
+        """Change the admin power of the rack unit with a ComputerSystem.Reset.
+
+        Redfish does not send the system back, so None is returned.
+        """
+        reset_type = RESET_TYPES.get(attributes.get("adminPower"))
+        if dn != RACK_UNIT_DN or reset_type is None or len(attributes) != 1:
+            raise ImcApiError(f"Only admin power changes are supported over Redfish, not {attributes}")
+        await self._async_ensure_login()
+        await self._api.async_post(
+            f"{self._system}/Actions/ComputerSystem.Reset", {"ResetType": reset_type}
+        )
+        return None
@@ -0,0 +1,225 @@
+"""Shared poll scheduler for every configured Cisco IMC."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+import heapq
+import logging
+import random
+from typing import Any, Awaitable, Callable
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, POLL_JITTER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PollJob:
+    """A periodic poll owned by the scheduler."""
+
+    __slots__ = (
+        "name",
+        "interval",
+        "target",
+        "wait_listener",
+        "capped",
+        "generation",
+        "running",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        target: Callable[[], Awaitable[Any]],
+        wait_listener: Callable[[float], None] | None,
+        capped: bool,
+    ) -> None:
+        """Initialize the job."""
+        self.name = name
+        self.interval = interval
+        self.target = target
+        self.wait_listener = wait_listener
+        self.capped = capped
+        self.generation = 0
+        self.running = False
+
+
+class CiscoImcPollScheduler:
+    """Run every IMC poll from one timer with a fleet-wide concurrency cap.
+
+    Each job gets a stable phase inside its interval derived from its name,
+    plus a little random jitter, so a restart does not line every IMC up on
+    the same second.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self._jobs: dict[str, _PollJob] = {}
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._seq = 0
+        self._in_flight = 0
+        self._waiting = 0
+        self._slots = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the scheduler load figures."""
+        return {
+            "scheduled_polls": len(self._jobs),
+            "max_concurrent_polls": self.max_concurrent,
+            "polls_in_flight": self._in_flight,
+            "poll_queue_depth": self._waiting,
+            "poll_lag": round(self.last_lag, 3),
+            "poll_lag_max": round(self.max_lag, 3),
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Start the scheduler loop."""
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} poll scheduler"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the scheduler loop."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_set_max_concurrent(self, max_concurrent: int) -> None:
+        """Change the number of polls allowed in flight at once."""
+        self.max_concurrent = max_concurrent
+        self.hass.async_create_task(self._async_notify_slots())
+
+    async def _async_notify_slots(self) -> None:
+        async with self._slots:
+            self._slots.notify_all()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """Wait for and hold one of the in-flight request slots.
+
+        Yields the seconds spent waiting for the slot.
+        """
+        started = self.hass.loop.time()
+        self._waiting += 1
+        try:
+            async with self._slots:
+                await self._slots.wait_for(
+                    lambda: self._in_flight < self.max_concurrent
+                )
+                self._in_flight += 1
+        finally:
+            self._waiting -= 1
+        try:
+            yield self.hass.loop.time() - started
+        finally:
+            async with self._slots:
+                self._in_flight -= 1
+                self._slots.notify()
+
+    @callback
+    def async_add_job(
+        self,
+        name: str,
+        interval: float,
+        target: Callable[[], Awaitable[Any]],
+        wait_listener: Callable[[float], None] | None = None,
+        capped: bool = True,
+    ) -> CALLBACK_TYPE:
+        """Poll target every interval seconds until the returned callback runs.
+
+        wait_listener is called with the seconds each poll waited for a slot.
+        Jobs that are not capped, such as keep-alives, start on time without
+        taking one of the in-flight slots, so they never queue behind slow
+        polls; they should only send a request or two.
+        """
+        job = self._jobs[name] = _PollJob(name, interval, target, wait_listener, capped)
+        phase = zlib.crc32(name.encode()) / 0xFFFFFFFF
+        self._push(job, self.hass.loop.time() + interval * phase + self._jitter(interval))
+
+        @callback
+        def _async_remove_job():
+            if self._jobs.get(name) is job:
+                del self._jobs[name]
+
+        return _async_remove_job
+
+    @callback
+    def async_set_interval(self, name: str, interval: float) -> None:
+        """Change the interval of a job, keeping its place in the cycle."""
+        if (job := self._jobs.get(name)) is None or job.interval == interval:
+            return
+        job.interval = interval
+        job.generation += 1
+        self._push(job, self.hass.loop.time() + interval + self._jitter(interval))
+
+    @staticmethod
+    def _jitter(interval: float) -> float:
+        return random.uniform(0, interval * POLL_JITTER)
+
+    def _push(self, job: _PollJob, due: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, job.name, job.generation))
+        self._wakeup.set()
+
+    async def _async_run(self) -> None:
+        """Start each job when it falls due."""
+        loop = self.hass.loop
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            due, _, name, generation = self._heap[0]
+            delay = due - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._heap)
+            job = self._jobs.get(name)
+            if job is None or job.generation != generation:
+                continue
+            next_due = due + job.interval
+            if next_due <= loop.time():
+                next_due = loop.time() + job.interval
+            self._push(job, next_due)
+            if job.running:
+                _LOGGER.debug(f"{name} previous poll still running, skipping")
+                continue
+            self.hass.async_create_background_task(
+                self._async_run_job(job, due), f"{DOMAIN} poll {name}"
+            )
+
+    async def _async_run_job(self, job: _PollJob, due: float) -> None:
+        """Run one poll once a slot is free."""
+        job.running = True
+        try:
+            if not job.capped:
+                await job.target()
+                return
+            async with self.async_slot() as wait:
+                self.last_lag = self.hass.loop.time() - due
+                self.max_lag = max(self.max_lag, self.last_lag)
+                if job.wait_listener is not None:
+                    job.wait_listener(wait)
+                await job.target()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(f"Unexpected error polling {job.name}")
+        finally:
+            job.running = False
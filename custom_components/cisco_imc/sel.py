@@ -0,0 +1,199 @@
+"""Incremental System Event Log reading for one IMC."""
+from __future__ import annotations
+
+from collections import deque
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .api import ImcApiError
+from .const import (
+    EVENT_SEL_ENTRY,
+    REDFISH_SEL_ENTRIES,
+    SEL_MAX_PAGES,
+    SEL_PAGE_SIZE,
+    SEL_RECENT_ENTRIES,
+)
+from .redfish import CiscoImcRedfishApi
+from .sel_store import CiscoImcSelStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _entry(member: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the parts of a Redfish LogEntry that are kept, or None without an id."""
+    try:
+        record_id = int(member["Id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {
+        "record_id": record_id,
+        "created": member.get("Created"),
+        "severity": member.get("Severity"),
+        "message": member.get("Message"),
+        "sensor_type": member.get("SensorType"),
+        "entry_code": member.get("EntryCode"),
+    }
+
+
+class CiscoImcSelReader:
+    """Read the SEL entries of one IMC added since the last read.
+
+    The SEL store keeps the highest record id read (the watermark), the log
+    size at the last read and the order the IMC lists its entries in, so a
+    read only requests the pages past the watermark. Every new entry fires
+    EVENT_SEL_ENTRY; the entries already in the log when an IMC is first
+    read are taken without events. The last SEL_RECENT_ENTRIES entries are
+    kept for diagnostics.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: CiscoImcRedfishApi,
+        store: CiscoImcSelStore,
+        imc: str,
+    ) -> None:
+        """Initialize the reader."""
+        self.hass = hass
+        self.imc = imc
+        self._client = client
+        self._store = store
+        self.recent: deque[dict[str, Any]] = deque(maxlen=SEL_RECENT_ENTRIES)
+        # Cleared when the IMC has no Redfish SEL, so it is not asked again
+        self.supported = True
+        self.entries_read = 0
+
+    async def async_read(self) -> int:
+        """Fire the entries added since the last read and return how many."""
+        watermark = self._store.get(self.imc)
+        if watermark is None:
+            await self._async_seed()
+            return 0
+        if watermark["descending"] is False:
+            return await self._async_read_ascending(
+                watermark["last_id"], watermark["offset"]
+            )
+        return await self._async_read_from_start(
+            watermark["last_id"], watermark["descending"]
+        )
+
+    async def _async_page(self, skip: int) -> tuple[list[dict[str, Any]], int]:
+        """Return the entries of one page and the size of the log."""
+        try:
+            members, total = await self._client.async_collection_page(
+                REDFISH_SEL_ENTRIES, skip, SEL_PAGE_SIZE
+            )
+        except ImcApiError as ex:
+            if ex.error_code == "404":
+                _LOGGER.debug(f"{self.imc} has no Redfish SEL, not reading it again")
+                self.supported = False
+            raise
+        return [entry for member in members if (entry := _entry(member))], total
+
+    async def _async_seed(self) -> None:
+        """Take the watermark from the log as it is, without firing events."""
+        entries, total = await self._async_page(0)
+        descending = _order(entries)
+        if not descending and total > len(entries):
+            entries, total = await self._async_page(max(total - SEL_PAGE_SIZE, 0))
+        entries.sort(key=lambda entry: entry["record_id"])
+        self.recent.extend(entries)
+        last_id = entries[-1]["record_id"] if entries else 0
+        _LOGGER.debug(f"{self.imc} SEL has {total} entries, starting after {last_id}")
+        self._store.async_update(self.imc, last_id, total, descending)
+
+    async def _async_read_ascending(self, last_id: int, offset: int) -> int:
+        """Read the pages after the known end of a log listed oldest first.
+
+        The page starts at the last entry already read, so a log that was
+        cleared or has wrapped around shows up as that entry having moved.
+        """
+        skip = max(offset - 1, 0)
+        entries, total = await self._async_page(skip)
+        if offset and (not entries or entries[0]["record_id"] != last_id):
+            tail, total = await self._async_page(max(total - SEL_PAGE_SIZE, 0))
+            if not tail or tail[-1]["record_id"] < last_id:
+                return await self._async_reset()
+            # Wrapped around: the entries past the watermark are at the end
+            if tail[0]["record_id"] > last_id:
+                _LOGGER.debug(f"{self.imc} SEL wrapped around, entries may be missed")
+            skip, entries = max(total - len(tail), 0), tail
+        fired = 0
+        for _ in range(SEL_MAX_PAGES):
+            new = [entry for entry in entries if entry["record_id"] > last_id]
+            self._fire(new)
+            fired += len(new)
+            if new:
+                last_id = new[-1]["record_id"]
+            skip += len(entries)
+            # Saved per page, so a failed read resumes where it stopped
+            self._store.async_update(self.imc, last_id, min(skip, total), False)
+            if len(entries) < SEL_PAGE_SIZE or skip >= total:
+                break
+            entries, total = await self._async_page(skip)
+        return fired
+
+    async def _async_read_from_start(self, last_id: int, descending: bool | None) -> int:
+        """Read a log listed newest first, or one too short to tell, from page 1.
+
+        A newest first log is read until the watermark; one with fewer than
+        two entries at the last read is read whole, as it is still short.
+        """
+        new: list[dict[str, Any]] = []
+        newest = None
+        skip = total = 0
+        for _ in range(SEL_MAX_PAGES):
+            entries, total = await self._async_page(skip)
+            if descending is None:
+                descending = _order(entries)
+            if entries:
+                newest = max(newest or 0, entries[0]["record_id"], entries[-1]["record_id"])
+            fresh = [entry for entry in entries if entry["record_id"] > last_id]
+            new.extend(fresh)
+            skip += len(entries)
+            if len(entries) < SEL_PAGE_SIZE or skip >= total:
+                break
+            if descending and len(fresh) < len(entries):
+                break
+        if newest is not None and newest < last_id:
+            return await self._async_reset()
+        new.sort(key=lambda entry: entry["record_id"])
+        self._fire(new)
+        if new:
+            last_id = new[-1]["record_id"]
+        # An oldest first log continues after the entries read so far
+        self._store.async_update(
+            self.imc, last_id, total if descending else skip, descending
+        )
+        return len(new)
+
+    async def _async_reset(self) -> int:
+        """Start over from the first entry of a log that was cleared."""
+        _LOGGER.debug(f"{self.imc} SEL was cleared, reading it from the start")
+        self._store.async_update(self.imc, 0, 0, None)
+        return await self._async_read_from_start(0, None)
+
+    def _fire(self, entries: list[dict[str, Any]]) -> None:
+        """Fire an event for each new entry, oldest first."""
+        for entry in entries:
+            self.recent.append(entry)
+            self.hass.bus.async_fire(EVENT_SEL_ENTRY, {"imc": self.imc, **entry})
+        self.entries_read += len(entries)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the reader state for diagnostics."""
+        return {
+            "supported": self.supported,
+            "watermark": self._store.get(self.imc),
+            "entries_read": self.entries_read,
+            "recent": list(self.recent),
+        }
+
+
+def _order(entries: list[dict[str, Any]]) -> bool | None:
+    """Return whether a page lists the newest entry first, or None if it cannot tell."""
+    if len(entries) < 2:
+        return None
+    return entries[0]["record_id"] > entries[-1]["record_id"]
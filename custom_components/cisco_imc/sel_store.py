@@ -0,0 +1,60 @@
+"""Persistent System Event Log watermarks of each IMC."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_SEL, SEL_SAVE_DELAY, SEL_STORE_KEY, SEL_STORE_VERSION
+from .store import async_get_loaded_store
+
+
+class CiscoImcSelStore:
+    """Remember how far the SEL of each IMC has been read across restarts.
+
+    Each IMC has the highest record id ingested (last_id), the number of
+    entries read from the start of the log (offset) and whether the IMC
+    lists its newest entries first (descending, None until known).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store = Store(hass, SEL_STORE_VERSION, SEL_STORE_KEY)
+        self._watermarks: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved watermarks."""
+        data = await self._store.async_load() or {}
+        self._watermarks = data.get("watermarks", {})
+
+    def get(self, host: str) -> dict[str, Any] | None:
+        """Return the watermark of host, or None if its SEL was never read."""
+        return self._watermarks.get(host)
+
+    @callback
+    def async_update(
+        self, host: str, last_id: int, offset: int, descending: bool | None
+    ) -> None:
+        """Record how far the SEL of host has been read."""
+        self._watermarks[host] = {
+            "last_id": last_id,
+            "offset": offset,
+            "descending": descending,
+        }
+        self._store.async_delay_save(self._data_to_save, SEL_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, host: str) -> None:
+        """Forget host."""
+        if self._watermarks.pop(host, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SEL_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"watermarks": self._watermarks}
+
+
+async def async_get_sel_store(hass: HomeAssistant) -> CiscoImcSelStore:
+    """Return the shared SEL store, loading it on first use."""
+    return await async_get_loaded_store(hass, DATA_SEL, CiscoImcSelStore)
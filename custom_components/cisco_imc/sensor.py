@@ -6,17 +6,26 @@ import logging
 
 from typing import Any
 
-from imcsdk_ecoen66.imchandle import ImcHandle
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.const import CONF_IP_ADDRESS
 
 
-from .const import DOMAIN, NAME, SENSOR_TYPES, RACK_UNIT_SENSORS
+from .const import (
+    DOMAIN,
+    SENSOR_TYPES,
+    RACK_UNIT_SENSORS,
+    TIMING_SENSOR_TYPES,
+    FAULT_SENSOR_TYPES,
+    FAULT_ATTRIBUTE_LIMIT,
+    SIGNAL_STATS_CHANGED,
+    SUPPRESSED_WRITES_SENSOR,
+)
 from .imc_device import CiscoImcDevice
 from .models import CiscoImcSensorEntityDescription
 
@@ -36,11 +45,38 @@ async def async_setup_entry(
     platform_name = entry.title
     coordinator = entry_data["coordinator"]
 
+    sensor_classes = {
+        **{sensor_type.key: CiscoImcTimingSensor for sensor_type in TIMING_SENSOR_TYPES},
+        **{sensor_type.key: CiscoImcFaultSensor for sensor_type in FAULT_SENSOR_TYPES},
+        SUPPRESSED_WRITES_SENSOR: CiscoImcSuppressedWritesSensor,
+    }
     entities = []
     for device_key in entry_data["devices"]["sensor"].keys():
         device_class = entry_data["devices"]["sensor"][device_key]
-        entities.append(CiscoImcRackUnitSensor(hass, entry, platform_name, device_class, coordinator))
-    async_add_entities(entities, True)
+        sensor_class = sensor_classes.get(device_key, CiscoImcRackUnitSensor)
+        entities.append(sensor_class(hass, entry, platform_name, device_class, coordinator))
+    async_add_entities(entities)
+
+    added = set()
+
+    @callback
+    def _async_stats_changed() -> None:
+        """Add a telemetry sensor for every stats value seen for the first time."""
+        async_add_entities(
+            [
+                CiscoImcStatsSensor(hass, entry, platform_name, description, coordinator)
+                for key, description in coordinator.stats_descriptions.items()
+                if key not in added
+            ]
+        )
+        added.update(coordinator.stats_descriptions)
+
+    _async_stats_changed()
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_STATS_CHANGED.format(entry.entry_id), _async_stats_changed
+        )
+    )
 
 
 class CiscoImcSensorEntity(CiscoImcDevice, SensorEntity):
@@ -62,10 +98,6 @@ class CiscoImcSensorEntity(CiscoImcDevice, SensorEntity):
         self.entity_description = description
         self.imc = config_entry.data.get(CONF_IP_ADDRESS)[0]
         self.coordinator = coordinator
-        self._attr_name = f"{NAME} {self.imc} {self.entity_description.name}"
-        if 'usr_lbl' in self.hass.custom_attributes[self.imc]:
-            if self.hass.custom_attributes[self.imc]['usr_lbl']:
-                self._attr_name = f"{self.hass.custom_attributes[self.imc]['usr_lbl']} {self.entity_description.name}"        
         self._attributes = {}
         super().__init__(self, hass, self.imc, description, coordinator)
         
@@ -82,11 +114,76 @@ class CiscoImcRackUnitSensor(CiscoImcSensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-#        if self.coordinator.sensor_state(self.entity_description.key) is None:
-#            return None
-        return self.hass.custom_attributes[self.imc][self.entity_description.key]
+        return self.coordinator.sensor_state(self.entity_description.key)
         
     @property
     def device_state_attributes(self):
         """Return the state attributes of the sensor."""
-        return self.hass.custom_attributes[self.imc][self.entity_description.key]
+        return self.coordinator.sensor_state(self.entity_description.key)
+
+
+class CiscoImcTimingSensor(CiscoImcSensorEntity):
+    """Representation of how long one phase of the IMC polls takes."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last duration of the phase in milliseconds."""
+        return self._phase.summary()["last_ms"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the percentiles of the recent durations."""
+        return {**super().extra_state_attributes, **self._phase.summary()}
+
+    @property
+    def _phase(self):
+        return self.coordinator.timings.phases[self.entity_description.property_key]
+
+
+class CiscoImcSuppressedWritesSensor(CiscoImcSensorEntity):
+    """Representation of how many entity writes polls have skipped."""
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of writes skipped so far."""
+        return self.coordinator.suppressed_writes
+
+
+class CiscoImcStatsSensor(CiscoImcSensorEntity):
+    """Representation of a temperature, power, voltage or current reading."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last reading."""
+        return self.coordinator.stats.get(self.entity_description.key)
+
+    @property
+    def available(self) -> bool:
+        """Return True while the IMC still reports this reading."""
+        return (
+            self.coordinator.last_update_success
+            and self.entity_description.key in self.coordinator.stats
+        )
+
+
+class CiscoImcFaultSensor(CiscoImcSensorEntity):
+    """Representation of the number of active faults of one severity."""
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the number of active faults."""
+        if not self.coordinator.faults.synced:
+            return None
+        return self.coordinator.faults.counts[self.entity_description.property_key]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the oldest active faults of the severity."""
+        faults = self.coordinator.faults.by_severity(self.entity_description.property_key)
+        return {
+            **super().extra_state_attributes,
+            "faults": [
+                {key: fault[key] for key in ("code", "descr", "affected_dn", "created")}
+                for fault in faults[:FAULT_ATTRIBUTE_LIMIT]
+            ],
+        }
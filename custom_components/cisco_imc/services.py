@@ -1,27 +1,35 @@
 """CiscoImc services."""
 import asyncio
 import voluptuous as vol
-import iso8601
 import logging
 
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers import entity_component
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers import device_registry as dr
 
-from datetime import datetime
-from imcsdk_ecoen66.imchandle import ImcHandle
+from .api import ImcApiError
 
 # pylint: disable=relative-beyond-top-level
 from .const import (
     DOMAIN,
-    CISCO_IMC_SERVICES,
     SERVICE_DESIRED_STATE,
-    SERVICE_ENTITY_TYPE,
     SERVICE_ENTITY_ID,
-    SERVICE_ENTRY_ID,
-    SERVICE_DATA,
-    SERVICE_SET_ADMIN_POWER
+    SERVICE_SET_ADMIN_POWER,
+    SERVICE_REFRESH_INVENTORY,
+    SERVICE_MAX_PARALLEL,
+    SERVICE_BATCH_SIZE,
+    SERVICE_BATCH_DELAY,
+    DEFAULT_POWER_PARALLEL,
+    DEFAULT_BATCH_DELAY,
+    POWER_ON_STATES,
+    POWER_STATE_TARGETS,
+    SERVICE_CONFIRM_TIMEOUT,
+    DEFAULT_POWER_CONFIRM_TIMEOUT,
+    RACK_UNIT_DN,
+    RACK_UNIT_CLASS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,11 +39,31 @@ SERVICE_SET_ADMIN_POWER_SCHEMA = vol.All(
     vol.Schema(
         {
             vol.Required(SERVICE_DESIRED_STATE): str,
+            vol.Optional(SERVICE_MAX_PARALLEL, default=DEFAULT_POWER_PARALLEL): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+            vol.Optional(SERVICE_BATCH_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(SERVICE_BATCH_DELAY, default=DEFAULT_BATCH_DELAY): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            vol.Optional(
+                SERVICE_CONFIRM_TIMEOUT, default=DEFAULT_POWER_CONFIRM_TIMEOUT
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            **cv.ENTITY_SERVICE_FIELDS,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_DEVICE_ID, ATTR_AREA_ID),
+)
+
+SERVICE_REFRESH_INVENTORY_SCHEMA = vol.All(
+    vol.Schema(
+        {
             vol.Required(SERVICE_ENTITY_ID): str,
         }
     )
 )
 
+
 async def async_setup_services(hass):
     """Set up services for CiscoImc integration."""
 
@@ -45,13 +73,23 @@ async def async_setup_services(hass):
         service_data = service_call.data
 
         if service == SERVICE_SET_ADMIN_POWER:
-            await async_set_admin_power_service(hass, service_data)
+            return await async_set_admin_power_service(hass, service_call)
+        if service == SERVICE_REFRESH_INVENTORY:
+            await async_refresh_inventory_service(hass, service_data)
+        return None
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_ADMIN_POWER,
         async_call_cisco_imc_service,
         schema=SERVICE_SET_ADMIN_POWER_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_INVENTORY,
+        async_call_cisco_imc_service,
+        schema=SERVICE_REFRESH_INVENTORY_SCHEMA,
     )
     _LOGGER.debug("Set up service")
 
@@ -62,22 +100,130 @@ async def async_unload_services(hass):
         return
 
     hass.services.async_remove(DOMAIN, SERVICE_SET_ADMIN_POWER)
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH_INVENTORY)
+
+
+def _coordinator_for_entity(hass, service_entity_id):
+    """Return the coordinator of the IMC an entity belongs to."""
+    entity_reg = er.async_get(hass)
+    entry = entity_reg.async_get(service_entity_id)
+    _LOGGER.debug("Entity Registry Items for {}: {}".format(service_entity_id, entity_reg))
+    if entry is None or entry.config_entry_id not in hass.data[DOMAIN]:
+        raise HomeAssistantError(f"{service_entity_id} is not a Cisco IMC entity")
+    return hass.data[DOMAIN][entry.config_entry_id]["coordinator"]
 
 
-async def async_set_admin_power_service(hass, data):
-    """Set the Admin_Power state in CiscoImc."""
+async def async_refresh_inventory_service(hass, data):
+    """Refetch the static inventory of an IMC now."""
     service_entity_id = data[SERVICE_ENTITY_ID]
-    desired_state = data[SERVICE_DESIRED_STATE]
     _LOGGER.debug("EntityID: {}".format(service_entity_id))
+    await _coordinator_for_entity(hass, service_entity_id).async_request_static_refresh()
+
+
+def _coordinators_for_call(hass, service_call):
+    """Return the coordinators of every IMC the call targets, once each."""
+    selected = async_extract_referenced_entity_ids(hass, service_call)
+    entity_reg = er.async_get(hass)
+    coordinators = {}
+    for entity_id in sorted(selected.referenced | selected.indirectly_referenced):
+        entry = entity_reg.async_get(entity_id)
+        if entry is None or entry.config_entry_id not in hass.data[DOMAIN]:
+            if entity_id in selected.referenced:
+                raise HomeAssistantError(f"{entity_id} is not a Cisco IMC entity")
+            continue
+        coordinator = hass.data[DOMAIN][entry.config_entry_id]["coordinator"]
+        coordinators.setdefault(coordinator.imc, coordinator)
+    return list(coordinators.values())
+
+
+async def _async_set_admin_power(coordinator, desired_state):
+    """Set the admin power of one IMC and return its result.
+
+    The change is sent without reading the rack unit first; the rack unit
+    the IMC answers with goes straight into the coordinator data.
+    """
+    try:
+        rack_unit = await coordinator.client.async_conf_mo(
+            RACK_UNIT_DN, RACK_UNIT_CLASS, {"adminPower": desired_state}
+        )
+    except ImcApiError as ex:
+        _LOGGER.debug(f"{coordinator.imc} Unable to set admin power: {ex}")
+        return {"name": coordinator.label, "success": False, "error": str(ex)}
+    if rack_unit is not None:
+        coordinator.async_apply_mo_change(rack_unit)
+    return {"name": coordinator.label, "success": True, "error": None}
+
+
+async def _async_confirm_power(coordinator, desired_state, timeout, result):
+    """Wait for oper_power to follow a successful admin power change."""
+    oper_power = POWER_STATE_TARGETS.get(desired_state)
+    if not result["success"] or oper_power is None or not timeout:
+        return result
+    converged = await coordinator.async_wait_for_power(oper_power, timeout)
+    result = {**result, "oper_power": coordinator.sensor_state("oper_power")}
+    if not converged:
+        result["success"] = False
+        result["error"] = f"oper_power did not become {oper_power} within {timeout:g}s"
+    return result
+
+
+async def async_set_admin_power_service(hass, service_call):
+    """Set the Admin_Power state of every targeted IMC.
+
+    Up to max_parallel IMCs are changed at once. Powering on with a
+    batch_size changes batch_size IMCs at a time, batch_delay seconds
+    apart, without waiting for earlier batches to power on. Each IMC is
+    re-read every few seconds from its change until its oper_power
+    follows, for up to confirm_timeout seconds. Returns the result of each
+    IMC keyed by address; if the caller does not ask for the response, any
+    failure raises instead.
+    """
+    data = service_call.data
+    desired_state = data[SERVICE_DESIRED_STATE]
+    coordinators = _coordinators_for_call(hass, service_call)
+    if not coordinators:
+        raise HomeAssistantError("No Cisco IMC matches the service target")
+    _LOGGER.debug(f"Setting admin power {desired_state} on {[c.imc for c in coordinators]}")
+
+    semaphore = asyncio.Semaphore(data[SERVICE_MAX_PARALLEL])
+
+    async def _async_limited(coordinator):
+        async with semaphore:
+            return await _async_set_admin_power(coordinator, desired_state)
+
+    batch_size = data.get(SERVICE_BATCH_SIZE)
+    if desired_state not in POWER_ON_STATES or batch_size is None:
+        batch_size = len(coordinators)
+    # Confirmations run in the background, so batches keep to batch_delay
+    confirmations = []
+    for start in range(0, len(coordinators), batch_size):
+        if start:
+            await asyncio.sleep(data[SERVICE_BATCH_DELAY])
+        batch = coordinators[start : start + batch_size]
+        changed = await asyncio.gather(*map(_async_limited, batch))
+        confirmations.extend(
+            hass.async_create_task(
+                _async_confirm_power(
+                    coordinator, desired_state, data[SERVICE_CONFIRM_TIMEOUT], result
+                )
+            )
+            for coordinator, result in zip(batch, changed)
+        )
+    results = dict(
+        zip(
+            (coordinator.imc for coordinator in coordinators),
+            await asyncio.gather(*confirmations),
+        )
+    )
 
-    def wrapper():
-        entity_reg = er.async_get(hass)
-        entry = entity_reg.async_get(service_entity_id)
-        _LOGGER.debug("Entity Registry Items for {}: {}".format(service_entity_id, entity_reg))
-        local_id = entry.config_entry_id
-        local_coordinator = hass.data[DOMAIN][local_id]["coordinator"]
-        imc_rack_unit_mo = local_coordinator.client.query_dn("sys/rack-unit-1")
-        imc_rack_unit_mo.admin_power = desired_state
-        local_coordinator.client.set_mo(imc_rack_unit_mo)
-
-    await hass.async_add_executor_job(wrapper)
+    failed = sorted(imc for imc, result in results.items() if not result["success"])
+    if failed and not service_call.return_response:
+        raise HomeAssistantError(
+            f"Unable to set admin power on {', '.join(failed)}: "
+            + "; ".join(results[imc]["error"] for imc in failed)
+        )
+    return {
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "results": results,
+    }
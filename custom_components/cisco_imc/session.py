@@ -0,0 +1,72 @@
+"""Persistent cache of IMC session cookies."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_SESSIONS, SESSION_SAVE_DELAY, SESSION_STORE_KEY, SESSION_STORE_VERSION
+from .store import async_get_loaded_store
+
+
+class CiscoImcSessionCache:
+    """Remember the IMC session of each host and username.
+
+    CIMC logins are slow and the controller only allows a few concurrent
+    web sessions, so a cookie that is still inside its refresh deadline is
+    resumed with aaaRefresh instead of opening a new session.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store = Store(hass, SESSION_STORE_VERSION, SESSION_STORE_KEY)
+        self._sessions: dict[str, dict[str, Any]] = {}
+
+    @staticmethod
+    def _key(host: str, username: str) -> str:
+        return f"{host}|{username}"
+
+    async def async_load(self) -> None:
+        """Load the cached sessions, dropping any past their deadline."""
+        data = await self._store.async_load() or {}
+        now = time.time()
+        self._sessions = {
+            key: session
+            for key, session in data.get("sessions", {}).items()
+            if session.get("refresh_deadline", 0) > now
+        }
+
+    def get(self, host: str, username: str) -> str | None:
+        """Return a cookie for host that can still be refreshed."""
+        session = self._sessions.get(self._key(host, username))
+        if session is None or session["refresh_deadline"] <= time.time():
+            return None
+        return session["cookie"]
+
+    @callback
+    def async_update(
+        self, host: str, username: str, cookie: str | None, refresh_period: int
+    ) -> None:
+        """Record the session a client now holds, or forget it."""
+        key = self._key(host, username)
+        if cookie is None:
+            if self._sessions.pop(key, None) is None:
+                return
+        else:
+            self._sessions[key] = {
+                "cookie": cookie,
+                "refresh_period": refresh_period,
+                "refresh_deadline": time.time() + refresh_period,
+            }
+        self._store.async_delay_save(self._data_to_save, SESSION_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"sessions": self._sessions}
+
+
+async def async_get_session_cache(hass: HomeAssistant) -> CiscoImcSessionCache:
+    """Return the shared session cache, loading it on first use."""
+    return await async_get_loaded_store(hass, DATA_SESSIONS, CiscoImcSessionCache)
@@ -0,0 +1,117 @@
+"""Immutable snapshot of the rack unit state of one IMC."""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+
+def _to_int(value: Any) -> int | None:
+    """Convert an XML API number, or None if the IMC gave something else."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Fields stored as something other than the string the IMC sends
+_CONVERTERS = {
+    "num_of_cpus": _to_int,
+    "num_of_cores": _to_int,
+    "num_of_threads": _to_int,
+    "total_memory": _to_int,
+}
+
+
+class ImcSnapshot:
+    """The rack unit attributes of one poll.
+
+    Snapshots never change once built; a poll that reads only some of the
+    attributes builds a new snapshot from the previous one.
+    """
+
+    __slots__ = (
+        "ip_address",
+        "model",
+        "serial",
+        "asset_tag",
+        "usr_lbl",
+        "uuid",
+        "num_of_cpus",
+        "num_of_cores",
+        "num_of_threads",
+        "total_memory",
+        "cimc_reset_reason",
+        "oper_power",
+    )
+
+    ip_address: str | None
+    model: str | None
+    serial: str | None
+    asset_tag: str | None
+    usr_lbl: str | None
+    uuid: str | None
+    num_of_cpus: int | None
+    num_of_cores: int | None
+    num_of_threads: int | None
+    total_memory: int | None
+    cimc_reset_reason: str | None
+    oper_power: str | None
+
+    def __init__(self, **values: Any) -> None:
+        """Initialize the snapshot from already converted values."""
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImcSnapshot):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()})"
+
+    @classmethod
+    def from_attributes(
+        cls,
+        attributes: dict[str, str],
+        keys: Iterable[str],
+        previous: ImcSnapshot | None = None,
+    ) -> ImcSnapshot:
+        """Build a snapshot reading keys from XML API attributes.
+
+        Fields not in keys are carried over from previous.
+        """
+        values = previous.as_dict() if previous is not None else {}
+        for key in keys:
+            value = attributes.get(key)
+            converter = _CONVERTERS.get(key)
+            values[key] = converter(value) if converter else value
+        return cls(**values)
+
+    def replace(self, **changes: Any) -> ImcSnapshot:
+        """Return a copy with the given fields changed."""
+        return type(self)(**{**self.as_dict(), **changes})
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by name."""
+        return getattr(self, key, default)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields as a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def diff(self, other: ImcSnapshot | None) -> set[str]:
+        """Return the names of the fields that differ from other."""
+        if other is None:
+            return set(self.__slots__)
+        return {
+            name
+            for name in self.__slots__
+            if getattr(self, name) != getattr(other, name)
+        }
@@ -0,0 +1,62 @@
+"""Persistent cache of the last good snapshot of each IMC."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SNAPSHOTS, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORE_KEY, SNAPSHOT_STORE_VERSION
+from .snapshot import ImcSnapshot
+from .store import async_get_loaded_store
+
+
+class CiscoImcSnapshotStore:
+    """Remember the last good snapshot of each IMC across restarts.
+
+    Entities render the restored values straight away instead of staying
+    empty until the IMC has been logged in to and polled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store = Store(hass, SNAPSHOT_STORE_VERSION, SNAPSHOT_STORE_KEY)
+        self._snapshots: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved snapshots."""
+        data = await self._store.async_load() or {}
+        self._snapshots = data.get("snapshots", {})
+
+    def get(self, host: str) -> tuple[ImcSnapshot, datetime] | None:
+        """Return the saved snapshot of host and when it was taken."""
+        saved = self._snapshots.get(host)
+        if saved is None or (saved_at := dt_util.parse_datetime(saved["saved_at"])) is None:
+            return None
+        return ImcSnapshot(**saved["data"]), saved_at
+
+    @callback
+    def async_update(self, host: str, snapshot: ImcSnapshot) -> None:
+        """Record a snapshot just read from host."""
+        self._snapshots[host] = {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "data": snapshot.as_dict(),
+        }
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, host: str) -> None:
+        """Forget host."""
+        if self._snapshots.pop(host, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"snapshots": self._snapshots}
+
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> CiscoImcSnapshotStore:
+    """Return the shared snapshot store, loading it on first use."""
+    return await async_get_loaded_store(hass, DATA_SNAPSHOTS, CiscoImcSnapshotStore)
@@ -0,0 +1,39 @@
+"""Lazy loading of the integration's persistent stores."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Protocol, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _LoadableStore(Protocol):
+    async def async_load(self) -> None:
+        """Load the saved data."""
+
+
+_StoreT = TypeVar("_StoreT", bound=_LoadableStore)
+
+
+async def async_get_loaded_store(
+    hass: HomeAssistant, key: str, factory: Callable[[HomeAssistant], _StoreT]
+) -> _StoreT:
+    """Return the store kept in hass.data under key, loading it on first use.
+
+    Callers racing on the first use wait on one lock, so the store is only
+    created and loaded once.
+    """
+    if (store := hass.data.get(key)) is not None:
+        return store
+    lock = hass.data.setdefault(f"{key}_lock", asyncio.Lock())
+    async with lock:
+        if (store := hass.data.get(key)) is None:
+            store = factory(hass)
+            await store.async_load()
+            hass.data[key] = store
+            _LOGGER.debug(f"Loaded {key}")
+    return store
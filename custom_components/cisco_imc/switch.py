@@ -7,7 +7,7 @@ from typing import Any
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.core import callback
 from homeassistant.const import CONF_IP_ADDRESS
-from .const import DOMAIN, NAME
+from .const import DOMAIN
 from .imc_device import CiscoImcDevice
 from .models import CiscoImcSwitchEntityDescription
 
@@ -24,7 +24,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     for device_key in entry_data["devices"]["switch"].keys():
         device_class = entry_data["devices"]["switch"][device_key]
         entities.append(ImcPollingSwitch(hass, config_entry, device_class, coordinator))
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
 
@@ -40,12 +40,9 @@ class ImcPollingSwitch(CiscoImcDevice, SwitchEntity):
         self.entity_description = entity_description
         self.imc = config_entry.data.get(CONF_IP_ADDRESS)[0]
         self.coordinator = coordinator
-        self._attr_name = f"{NAME} {self.imc} {self.entity_description.name}"
         self._attr_available = True
         self._is_on = True
-        self.hass.custom_attributes[self.imc]['polling_switch'] = True
-        if self.hass.custom_attributes[self.imc]['usr_lbl']:
-            self._attr_name = f"{self.hass.custom_attributes[self.imc]['usr_lbl']} {self.entity_description.name}"
+        self.coordinator.set_polling_state(True)
         self._attributes = {}
         
         super().__init__(self, hass, self.imc, entity_description, coordinator)
@@ -63,16 +60,14 @@ class ImcPollingSwitch(CiscoImcDevice, SwitchEntity):
         """Send the on command."""
         _LOGGER.debug("Enable polling for: %s", self.name)
         self._is_on = True
-#        self.coordinator.set_polling_state(True)
-        self.hass.custom_attributes[self.imc]['polling_switch'] = True
+        self.coordinator.set_polling_state(True)
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs):
         """Send the off command."""
         _LOGGER.debug("Disable polling for: %s", self.name)
         self._is_on = False
-#        self.coordinator.set_polling_state(False)
-        self.hass.custom_attributes[self.imc]['polling_switch'] = False
+        self.coordinator.set_polling_state(False)
         _LOGGER.debug(f"After disabling polling, is_polling = {self.coordinator.is_polling()}")
         self.async_write_ha_state()
 
@@ -81,6 +76,14 @@ class ImcPollingSwitch(CiscoImcDevice, SwitchEntity):
         """Get whether the switch is in on state."""
         return self._is_on
 
+    @property
+    def extra_state_attributes(self):
+        """Return the scan interval."""
+        return {
+            **super().extra_state_attributes,
+            "scan_interval": self.coordinator.scan_interval,
+        }
+
     @property
     def available(self):
         return True
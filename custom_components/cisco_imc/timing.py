@@ -0,0 +1,120 @@
+"""Per-phase timing of the requests made to one IMC."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import TIMING_BUCKETS, TIMING_PHASES, TIMING_REQUEST_PHASES, TIMING_SAMPLES
+
+# Set while a poll runs; tasks it starts inherit it
+_POLLING: ContextVar[bool] = ContextVar("cisco_imc_polling", default=False)
+
+
+class PhaseHistogram:
+    """Durations of one phase: cumulative buckets plus recent samples."""
+
+    __slots__ = ("count", "total", "max", "last", "buckets", "_recent")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+        self.buckets = [0] * (len(TIMING_BUCKETS) + 1)
+        self._recent: deque[float] = deque(maxlen=TIMING_SAMPLES)
+
+    def record(self, seconds: float) -> None:
+        """Add one duration."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.buckets[bisect_left(TIMING_BUCKETS, seconds)] += 1
+        self._recent.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the recent samples."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+    def summary(self) -> dict[str, Any]:
+        """Return the count and the headline figures in milliseconds."""
+        return {
+            "count": self.count,
+            "last_ms": _ms(self.last),
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "p50_ms": _ms(self.percentile(50)),
+            "p95_ms": _ms(self.percentile(95)),
+            "p99_ms": _ms(self.percentile(99)),
+            "max_ms": _ms(self.max) if self.count else None,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary along with the bucket counts."""
+        bounds = [f"le_{bound}" for bound in TIMING_BUCKETS] + ["le_inf"]
+        return {**self.summary(), "buckets": dict(zip(bounds, self.buckets))}
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class ImcTimings:
+    """Phase histograms, session counters and the last error of one IMC."""
+
+    def __init__(self) -> None:
+        """Initialize the timings."""
+        self.phases = {phase: PhaseHistogram() for phase in TIMING_PHASES}
+        self.last_error: str | None = None
+        self.last_error_at = None
+
+    @callback
+    def record(self, phase: str, seconds: float) -> None:
+        """Add a duration to a phase; also the CiscoImcApi timing listener.
+
+        The request phases are only recorded for requests made by a poll,
+        so keep-alives, SEL reads and telemetry do not mix into them.
+        """
+        if phase in TIMING_REQUEST_PHASES and not _POLLING.get():
+            return
+        self.phases[phase].record(seconds)
+
+    @staticmethod
+    @contextmanager
+    def polling() -> Iterator[None]:
+        """Mark the requests made inside the block as made by a poll."""
+        token = _POLLING.set(True)
+        try:
+            yield
+        finally:
+            _POLLING.reset(token)
+
+    def record_error(self, error: Exception) -> None:
+        """Remember why the last poll failed."""
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_at = dt_util.utcnow()
+
+    @property
+    def polls(self) -> int:
+        """Return the number of polls timed so far."""
+        return self.phases["poll"].count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return everything for diagnostics."""
+        return {
+            "logins": self.phases["login"].count,
+            "refreshes": self.phases["refresh"].count,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at.isoformat() if self.last_error_at else None,
+            "phases": {name: phase.as_dict() for name, phase in self.phases.items()},
+        }
@@ -0,0 +1 @@
+"""Tests for the Cisco IMC integration."""
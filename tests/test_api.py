@@ -0,0 +1,246 @@
+"""Tests for the Cisco IMC XML API client."""
+import time
+from xml.etree import ElementTree
+
+import pytest
+
+from custom_components.cisco_imc.api import (
+    UNKNOWN_METHOD_ERROR_CODE,
+    CiscoImcApi,
+    ImcApiError,
+    ObjectExtractor,
+    _out_objects,
+    flatten,
+)
+
+RACK_UNIT_TREE = b"""<configResolveDn dn="sys/rack-unit-1" cookie="cookie" response="yes">
+<outConfig>
+<computeRackUnit dn="sys/rack-unit-1" model="UCSC-C240-M4SX" serial="FCH0001" operPower="on" usrLbl="lab-1">
+<equipmentPsu rn="psu-1" operability="operable" presence="equipped" model="UCSC-PSU2-1400W"/>
+<equipmentFanModule rn="fan-module-1-1" operState="operable">
+<equipmentFan rn="fan-1" operability="operable" presence="equipped"/>
+<equipmentFan rn="fan-2" operability="inoperable" presence="equipped"/>
+</equipmentFanModule>
+<biosUnit rn="bios" model="UCSC-C240-M4SX" initSeq="1"/>
+</computeRackUnit>
+</outConfig>
+</configResolveDn>"""
+
+FAULT_CLASS = b"""<configResolveClass cookie="cookie" response="yes" classId="faultInst">
+<outConfigs>
+<faultInst dn="sys/rack-unit-1/fault-F0181" code="F0181" severity="major" descr="Disk missing"/>
+<faultInst dn="sys/rack-unit-1/fault-F0374" code="F0374" severity="minor" descr="PSU redundancy lost"/>
+</outConfigs>
+</configResolveClass>"""
+
+
+def _extract(response, wanted, chunk_size=37):
+    """Feed a response to an ObjectExtractor in small chunks."""
+    extractor = ObjectExtractor(wanted)
+    for start in range(0, len(response), chunk_size):
+        extractor.feed(response[start : start + chunk_size])
+    extractor.close()
+    return extractor
+
+
+def test_out_objects_keeps_the_whole_tree():
+    """Without wanted every object and attribute is kept, in snake_case."""
+    (rack_unit,) = _out_objects(ElementTree.fromstring(RACK_UNIT_TREE), "outConfig")
+    assert rack_unit.class_id == "computeRackUnit"
+    assert rack_unit.attributes["oper_power"] == "on"
+    assert rack_unit.attributes["usr_lbl"] == "lab-1"
+    assert [(mo.class_id, mo.dn) for mo in flatten(rack_unit)] == [
+        ("computeRackUnit", "sys/rack-unit-1"),
+        ("equipmentPsu", "sys/rack-unit-1/psu-1"),
+        ("equipmentFanModule", "sys/rack-unit-1/fan-module-1-1"),
+        ("equipmentFan", "sys/rack-unit-1/fan-module-1-1/fan-1"),
+        ("equipmentFan", "sys/rack-unit-1/fan-module-1-1/fan-2"),
+        ("biosUnit", "sys/rack-unit-1/bios"),
+    ]
+
+
+def test_out_objects_without_container():
+    """A response without its container has no objects."""
+    assert _out_objects(ElementTree.fromstring(b"<configResolveDn/>"), "outConfig") == []
+
+
+def test_extractor_keeps_only_wanted_classes_and_attributes():
+    """Unwanted classes are skipped and wanted ones move to their kept ancestor."""
+    extractor = _extract(
+        RACK_UNIT_TREE,
+        {
+            "computeRackUnit": frozenset({"oper_power", "usr_lbl"}),
+            "equipmentPsu": None,
+            "equipmentFan": frozenset({"operability"}),
+        },
+    )
+    assert extractor.attrib == {
+        "dn": "sys/rack-unit-1",
+        "cookie": "cookie",
+        "response": "yes",
+    }
+    (rack_unit,) = _out_objects(extractor, "outConfig")
+    assert rack_unit.attributes == {
+        "dn": "sys/rack-unit-1",
+        "oper_power": "on",
+        "usr_lbl": "lab-1",
+    }
+    psu, fan_1, fan_2 = rack_unit.children
+    assert psu.attributes == {
+        "dn": "sys/rack-unit-1/psu-1",
+        "rn": "psu-1",
+        "operability": "operable",
+        "presence": "equipped",
+        "model": "UCSC-PSU2-1400W",
+    }
+    assert fan_1 == (
+        "equipmentFan",
+        "sys/rack-unit-1/fan-module-1-1/fan-1",
+        {"dn": "sys/rack-unit-1/fan-module-1-1/fan-1", "operability": "operable"},
+        [],
+    )
+    assert fan_2.attributes["operability"] == "inoperable"
+    assert {mo.class_id for mo in flatten(rack_unit)} == {
+        "computeRackUnit",
+        "equipmentPsu",
+        "equipmentFan",
+    }
+
+
+def test_extractor_keeps_unwanted_top_objects_with_their_dn():
+    """The objects a query returns are kept with only their dn if unwanted."""
+    extractor = _extract(RACK_UNIT_TREE, {"equipmentFan": frozenset({"presence"})})
+    (rack_unit,) = _out_objects(extractor, "outConfig")
+    assert rack_unit.attributes == {"dn": "sys/rack-unit-1"}
+    assert [fan.dn for fan in rack_unit.children] == [
+        "sys/rack-unit-1/fan-module-1-1/fan-1",
+        "sys/rack-unit-1/fan-module-1-1/fan-2",
+    ]
+
+
+def test_extractor_flat_class_response():
+    """A class query keeps each object, filtered or with only its dn."""
+    wanted = {"faultInst": frozenset({"code", "severity"})}
+    faults = _out_objects(_extract(FAULT_CLASS, wanted), "outConfigs")
+    assert [mo.attributes for mo in faults] == [
+        {"dn": "sys/rack-unit-1/fault-F0181", "code": "F0181", "severity": "major"},
+        {"dn": "sys/rack-unit-1/fault-F0374", "code": "F0374", "severity": "minor"},
+    ]
+
+    faults = _out_objects(_extract(FAULT_CLASS, {}), "outConfigs")
+    assert [(mo.class_id, mo.attributes, mo.children) for mo in faults] == [
+        ("faultInst", {"dn": "sys/rack-unit-1/fault-F0181"}, []),
+        ("faultInst", {"dn": "sys/rack-unit-1/fault-F0374"}, []),
+    ]
+
+
+def test_extractor_reads_error_responses():
+    """An error response has its errorCode and no objects."""
+    extractor = _extract(
+        b'<configResolveDn cookie="" response="yes" errorCode="552" errorDescr="Authorization required"/>',
+        {},
+    )
+    assert extractor.attrib["errorCode"] == "552"
+    assert _out_objects(extractor, "outConfig") == []
+
+
+class FakeImc:
+    """Answer the XML API requests of a client without a network.
+
+    batch_error is the errorCode configResolveDns is answered with, or None
+    to answer it; http_error makes the next request fail with that status.
+    """
+
+    def __init__(self, batch_error=None):
+        """Initialize the IMC."""
+        self.batch_error = batch_error
+        self.http_error = None
+        self.methods = []
+
+    async def async_post(self, payload, extractor=None, timeout=None):
+        """Answer one request."""
+        request = ElementTree.fromstring(payload)
+        self.methods.append(request.tag)
+        if self.http_error is not None:
+            status, self.http_error = self.http_error, None
+            raise ImcApiError(f"returned HTTP {status}", status)
+        if request.tag == "configResolveDns":
+            if self.batch_error is not None:
+                body = f'<configResolveDns errorCode="{self.batch_error}" errorDescr="failed"/>'
+            else:
+                dns = [dn.get("value") for dn in request.iter("dn")]
+                body = "<configResolveDns><outConfigs>{}</outConfigs></configResolveDns>".format(
+                    "".join(f'<computeRackUnit dn="{dn}"/>' for dn in dns)
+                )
+        else:
+            body = (
+                "<configResolveDn><outConfig>"
+                f'<computeRackUnit dn="{request.get("dn")}"/>'
+                "</outConfig></configResolveDn>"
+            )
+        if extractor is None:
+            return ElementTree.fromstring(body)
+        extractor.feed(body.encode())
+        extractor.close()
+        return extractor
+
+
+def _client(imc):
+    client = CiscoImcApi(None, "10.0.0.1", "admin", "password")
+    client._cookie = "cookie"
+    client._refresh_at = time.monotonic() + 3600
+    client._async_post = imc.async_post
+    return client
+
+
+DNS = ["sys/rack-unit-1", "sys/rack-unit-2"]
+
+
+async def test_batch_method_used_when_supported():
+    """All dns are read with a single configResolveDns."""
+    imc = FakeImc()
+    client = _client(imc)
+    assert set(await client.async_resolve_dns(DNS)) == set(DNS)
+    assert imc.methods == ["configResolveDns"]
+
+
+@pytest.mark.parametrize("error_code", [UNKNOWN_METHOD_ERROR_CODE, "ERR-unknown-method"])
+async def test_first_batch_failure_falls_back_for_good(error_code):
+    """Any errorCode answering the first batch call falls back to single reads."""
+    imc = FakeImc(batch_error=error_code)
+    client = _client(imc)
+    assert set(await client.async_resolve_dns(DNS)) == set(DNS)
+    assert imc.methods == ["configResolveDns", "configResolveDn", "configResolveDn"]
+
+    imc.methods.clear()
+    assert set(await client.async_resolve_dns(DNS)) == set(DNS)
+    assert imc.methods == ["configResolveDn", "configResolveDn"]
+
+
+async def test_later_batch_failure_is_raised():
+    """Once the batch method has worked, only the unknown method error falls back."""
+    imc = FakeImc()
+    client = _client(imc)
+    await client.async_resolve_dns(DNS)
+
+    imc.batch_error = "ERR-internal"
+    with pytest.raises(ImcApiError):
+        await client.async_resolve_dns(DNS)
+
+    imc.batch_error = UNKNOWN_METHOD_ERROR_CODE
+    imc.methods.clear()
+    assert set(await client.async_resolve_dns(DNS)) == set(DNS)
+    assert imc.methods == ["configResolveDns", "configResolveDn", "configResolveDn"]
+
+
+async def test_http_error_keeps_the_batch_method():
+    """An HTTP error is raised without giving up on the batch method."""
+    imc = FakeImc()
+    imc.http_error = "503"
+    client = _client(imc)
+    with pytest.raises(ImcApiError):
+        await client.async_resolve_dns(DNS)
+
+    imc.methods.clear()
+    assert set(await client.async_resolve_dns(DNS)) == set(DNS)
+    assert imc.methods == ["configResolveDns"]
@@ -0,0 +1,95 @@
+"""Tests for the shared poll scheduler."""
+import asyncio
+from unittest.mock import patch
+
+from custom_components.cisco_imc.scheduler import CiscoImcPollScheduler
+
+
+async def _async_noop():
+    pass
+
+
+async def test_phase_is_stable_per_job_name(hass):
+    """A job lands on the same point of its interval in every scheduler."""
+    first = CiscoImcPollScheduler(hass, 4)
+    second = CiscoImcPollScheduler(hass, 4)
+    with patch("custom_components.cisco_imc.scheduler.random.uniform", return_value=0):
+        first.async_add_job("10.0.0.1", 300, _async_noop)
+        first.async_add_job("10.0.0.2", 300, _async_noop)
+        second.async_add_job("10.0.0.1", 300, _async_noop)
+    phases = {
+        (scheduler, name): due % 300
+        for scheduler in (first, second)
+        for due, _, name, _ in scheduler._heap
+    }
+    assert abs(phases[(first, "10.0.0.1")] - phases[(second, "10.0.0.1")]) < 1
+    assert abs(phases[(first, "10.0.0.1")] - phases[(first, "10.0.0.2")]) >= 1
+
+
+async def test_reschedule_supersedes_old_generation(hass):
+    """A new interval drops the run queued under the old one."""
+    scheduler = CiscoImcPollScheduler(hass, 4)
+    calls = []
+
+    async def _async_poll():
+        calls.append(hass.loop.time())
+
+    remove = scheduler.async_add_job("10.0.0.1", 0.05, _async_poll)
+    scheduler.async_set_interval("10.0.0.1", 60)
+    scheduler.async_start()
+    await asyncio.sleep(0.2)
+    assert calls == []
+
+    scheduler.async_set_interval("10.0.0.1", 0.05)
+    await asyncio.sleep(0.3)
+    assert calls
+    remove()
+    scheduler.async_stop()
+
+
+async def test_slots_never_exceed_the_cap(hass):
+    """No more than max_concurrent holders share the slots."""
+    scheduler = CiscoImcPollScheduler(hass, 2)
+    holders = 0
+    peak = 0
+
+    async def _async_hold():
+        nonlocal holders, peak
+        async with scheduler.async_slot():
+            holders += 1
+            peak = max(peak, holders)
+            await asyncio.sleep(0.01)
+            holders -= 1
+
+    await asyncio.gather(*(_async_hold() for _ in range(10)))
+    assert peak == 2
+
+    scheduler.async_set_max_concurrent(3)
+    await asyncio.gather(*(_async_hold() for _ in range(10)))
+    assert peak == 3
+
+
+async def test_uncapped_job_does_not_wait_for_a_slot(hass):
+    """A keep-alive style job runs while every slot is held."""
+    scheduler = CiscoImcPollScheduler(hass, 1)
+    ran = asyncio.Event()
+
+    async def _async_keep_alive():
+        ran.set()
+
+    release = asyncio.Event()
+
+    async def _async_slow_poll():
+        async with scheduler.async_slot():
+            await release.wait()
+
+    slow_poll = hass.async_create_task(_async_slow_poll())
+    await asyncio.sleep(0)
+    remove = scheduler.async_add_job("keepalive", 0.05, _async_keep_alive, capped=False)
+    scheduler.async_start()
+    await asyncio.wait_for(ran.wait(), 1)
+    assert scheduler.stats["polls_in_flight"] == 1
+    release.set()
+    await slow_poll
+    remove()
+    scheduler.async_stop()
@@ -0,0 +1,166 @@
+"""Tests for the incremental System Event Log reader."""
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.cisco_imc.api import ImcApiError
+from custom_components.cisco_imc.const import EVENT_SEL_ENTRY
+from custom_components.cisco_imc.sel import CiscoImcSelReader
+
+IMC = "10.0.0.1"
+PAGE_SIZE = 3
+
+
+class FakeRedfish:
+    """Serve a SEL, listed in the given order, a page at a time."""
+
+    def __init__(self, record_ids):
+        """Initialize the log."""
+        self.record_ids = list(record_ids)
+        self.pages = []
+
+    async def async_collection_page(self, path, skip, top):
+        """Return one page of the log and its size."""
+        self.pages.append(skip)
+        members = [
+            {"Id": str(record_id), "Message": f"entry {record_id}"}
+            for record_id in self.record_ids[skip : skip + top]
+        ]
+        return members, len(self.record_ids)
+
+
+class FakeSelStore:
+    """Keep SEL watermarks in memory and count the saves."""
+
+    def __init__(self):
+        """Initialize the store."""
+        self.watermarks = {}
+        self.saves = 0
+
+    def get(self, host):
+        """Return the watermark of host."""
+        return self.watermarks.get(host)
+
+    def async_update(self, host, last_id, offset, descending):
+        """Record a watermark."""
+        self.saves += 1
+        self.watermarks[host] = {
+            "last_id": last_id,
+            "offset": offset,
+            "descending": descending,
+        }
+
+
+@pytest.fixture(autouse=True)
+def small_pages():
+    """Use pages of three entries so reads cross page boundaries."""
+    with patch("custom_components.cisco_imc.sel.SEL_PAGE_SIZE", PAGE_SIZE):
+        yield
+
+
+def _reader(hass, record_ids):
+    client = FakeRedfish(record_ids)
+    store = FakeSelStore()
+    return CiscoImcSelReader(hass, client, store, IMC), client, store
+
+
+def _fired(events):
+    return [event.data["record_id"] for event in events]
+
+
+@pytest.mark.parametrize(
+    ("record_ids", "descending"),
+    [(range(1, 8), False), (range(7, 0, -1), True)],
+    ids=["oldest_first", "newest_first"],
+)
+async def test_first_read_fires_no_events(hass, record_ids, descending):
+    """The entries already in the log are taken as the starting point."""
+    events = async_capture_events(hass, EVENT_SEL_ENTRY)
+    reader, _, store = _reader(hass, record_ids)
+    assert await reader.async_read() == 0
+    await hass.async_block_till_done()
+    assert events == []
+    assert store.get(IMC) == {"last_id": 7, "offset": 7, "descending": descending}
+    assert [entry["record_id"] for entry in reader.recent][-1] == 7
+
+
+async def test_oldest_first_reads_across_pages(hass):
+    """Only the pages past the watermark are read, saving after each page."""
+    events = async_capture_events(hass, EVENT_SEL_ENTRY)
+    reader, client, store = _reader(hass, range(1, 8))
+    await reader.async_read()
+    client.record_ids.extend(range(8, 14))
+    client.pages.clear()
+    store.saves = 0
+
+    assert await reader.async_read() == 6
+    await hass.async_block_till_done()
+    assert _fired(events) == [8, 9, 10, 11, 12, 13]
+    assert events[0].data["imc"] == IMC
+    # The first page starts at the last entry already read
+    assert client.pages == [6, 9, 12]
+    assert store.saves == 3
+    assert store.get(IMC) == {"last_id": 13, "offset": 13, "descending": False}
+
+    assert await reader.async_read() == 0
+    assert reader.entries_read == 6
+
+
+async def test_newest_first_reads_until_the_watermark(hass):
+    """A newest first log is read from the start until a known entry."""
+    events = async_capture_events(hass, EVENT_SEL_ENTRY)
+    reader, client, store = _reader(hass, range(7, 0, -1))
+    await reader.async_read()
+    client.record_ids[:0] = range(11, 7, -1)
+    client.pages.clear()
+
+    assert await reader.async_read() == 4
+    await hass.async_block_till_done()
+    assert _fired(events) == [8, 9, 10, 11]
+    assert client.pages == [0, 3]
+    assert store.get(IMC) == {"last_id": 11, "offset": 11, "descending": True}
+
+
+@pytest.mark.parametrize(
+    ("record_ids", "cleared"),
+    [(range(1, 8), [1, 2]), (range(7, 0, -1), [2, 1])],
+    ids=["oldest_first", "newest_first"],
+)
+async def test_cleared_log_is_read_from_the_start(hass, record_ids, cleared):
+    """Entries of a log cleared since the last read are all new."""
+    events = async_capture_events(hass, EVENT_SEL_ENTRY)
+    reader, client, store = _reader(hass, record_ids)
+    await reader.async_read()
+    client.record_ids = cleared
+
+    assert await reader.async_read() == 2
+    await hass.async_block_till_done()
+    assert _fired(events) == [1, 2]
+    assert store.get(IMC)["last_id"] == 2
+
+
+async def test_wrapped_log_continues_from_the_end(hass):
+    """A log that dropped its oldest entries is read from its last page."""
+    events = async_capture_events(hass, EVENT_SEL_ENTRY)
+    reader, client, store = _reader(hass, range(1, 8))
+    await reader.async_read()
+    client.record_ids = list(range(5, 13))
+
+    assert await reader.async_read() == 3
+    await hass.async_block_till_done()
+    assert _fired(events) == [10, 11, 12]
+    assert store.get(IMC) == {"last_id": 12, "offset": 8, "descending": False}
+
+
+async def test_missing_sel_is_not_read_again(hass):
+    """An IMC without a Redfish SEL is marked unsupported."""
+    reader, client, _ = _reader(hass, [])
+
+    async def _async_not_found(path, skip, top):
+        raise ImcApiError("Not Found", "404")
+
+    client.async_collection_page = _async_not_found
+    with pytest.raises(ImcApiError):
+        await reader.async_read()
+    assert not reader.supported